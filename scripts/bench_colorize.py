@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Measure throughput of Colorizer over synthetic logs
+#
+# $ python3 scripts/bench_colorize.py [MEGABYTES]
+
+import io
+import re
+import sys
+import time
+
+from os.path import dirname, abspath
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from warawara import Colorizer
+from warawara.bin_colorize import default_rules
+
+
+lines = (
+        b'2024-01-01 12:00:00.123 [worker-3] INFO request handled path=/api/v1/items status=200 took=12ms\n',
+        b'2024-01-01 12:00:00.456 [worker-1] debug cache hit key=items:42\n',
+        b'2024-01-01 12:00:00.789 [worker-2] ERROR upstream timeout path=/api/v1/users retry=3\n',
+        b'2024-01-01 12:00:01.012 [worker-3] trace queue depth=17\n',
+        )
+
+cases = (
+        ('levels', default_rules),
+        ('fields', ((r'\b\w+=', 'cyan'), (r'\d+ms\b', 'yellow'))),
+        ('rare', ((r'\bFATAL\b', 'red'),)),
+        )
+
+
+def naive(rules, data):
+    # One pass per rule, the way it's done by hand
+    for pattern, style in rules:
+        clr = Colorizer.style_of(style)
+        data = re.sub(pattern.encode('utf-8'), lambda m: clr(m.group().decode('utf-8')).encode('utf-8'), data)
+    return data
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    data = b''.join(lines)
+    data = data * int(megabytes * 1000000 // len(data))
+
+    print('{:<10}{:>14}{:>14}{:>14}'.format('rules', 'colorize', 'stream', 'per rule'))
+    for name, rules in cases:
+        colorizer = Colorizer(rules)
+
+        t = time.perf_counter()
+        colorizer.colorize(data)
+        t_colorize = time.perf_counter() - t
+
+        t = time.perf_counter()
+        colorizer.stream(io.BytesIO(data), io.BytesIO())
+        t_stream = time.perf_counter() - t
+
+        t = time.perf_counter()
+        naive(rules, data)
+        t_naive = time.perf_counter() - t
+
+        print('{:<10}{:>9.1f} MB/s{:>9.1f} MB/s{:>9.1f} MB/s'.format(
+            name, *(len(data) / t / 1e6 for t in (t_colorize, t_stream, t_naive))))
+
+
+if __name__ == '__main__':
+    main()
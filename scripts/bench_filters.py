@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Compare fused stream filters against a chain of EventBroadcaster callbacks
+#
+# $ python3 scripts/bench_filters.py [N]
+
+import re
+import sys
+import time
+
+from os.path import dirname, abspath
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from warawara import subproc
+
+
+def make_lines(n):
+    levels = ('INFO', 'WARN', 'ERROR', 'DEBUG')
+    return ['{} host{} message {}'.format(levels[i % 4], i % 7, i) for i in range(n)]
+
+
+def naive(lines):
+    # The way it's done without stages: one hub per step,
+    # each callback re-checks the regex and broadcasts to the next hub
+    out = []
+    hub1 = subproc.EventBroadcaster()
+    hub2 = subproc.EventBroadcaster()
+    hub3 = subproc.EventBroadcaster()
+
+    def step1(line):
+        if re.search(r'ERROR|WARN', line):
+            hub2.broadcast(line)
+
+    def step2(line):
+        hub3.broadcast(line.split()[1])
+
+    seen = set()
+    def step3(field):
+        if field not in seen:
+            seen.add(field)
+            out.append(field)
+
+    hub1 += step1
+    hub2 += step2
+    hub3 += step3
+
+    for line in lines:
+        hub1.broadcast(line)
+
+    return out
+
+
+def fused(lines):
+    s = subproc.stream()
+    s.welcome(subproc.grep(r'ERROR|WARN') | subproc.fields(1) | subproc.dedup())
+    for line in lines:
+        s.write(line)
+    s.close()
+    return s.lines
+
+
+def measure(func, lines, repeat=5):
+    best = None
+    for i in range(repeat):
+        t = time.perf_counter()
+        ret = func(lines)
+        t = time.perf_counter() - t
+        best = t if best is None else min(best, t)
+    return best, ret
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lines = make_lines(n)
+
+    t_naive, r_naive = measure(naive, lines)
+    t_fused, r_fused = measure(fused, lines)
+    assert r_naive == r_fused
+
+    print('lines: {}'.format(n))
+    print('naive: {:.3f}s ({:.0f} lines/s)'.format(t_naive, n / t_naive))
+    print('fused: {:.3f}s ({:.0f} lines/s)'.format(t_fused, n / t_fused))
+    print('ratio: {:.2f}x'.format(t_naive / t_fused))
+
+
+if __name__ == '__main__':
+    main()
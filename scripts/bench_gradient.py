@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# Compare gradient generation against per-step vector/lerp objects
+#
+# $ python3 scripts/bench_gradient.py [MAX_N]
+
+import sys
+import time
+
+from os.path import dirname, abspath
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from warawara import colors
+from warawara import vector
+from warawara import lerp
+
+
+def naive_rgb(A, B, N):
+    # The way it's done step by step: one vector and one lerp per step
+    a = vector(A.rgb)
+    b = vector(B.rgb)
+    ret = [A]
+    for t in (i / (N - 1) for i in range(1, N - 1)):
+        ret.append(colors.ColorRGB(*tuple(lerp(a, b, t))))
+    ret.append(B)
+    return tuple(ret)
+
+
+def naive_hsv(A, B, N):
+    a = vector(A.hsv)
+    b = vector(B.hsv)
+    ret = [A]
+    for t in (i / (N - 1) for i in range(1, N - 1)):
+        ret.append(colors.ColorHSV(*lerp(a, b, t)))
+    ret.append(B)
+    return tuple(ret)
+
+
+def measure(func, *args):
+    repeat = 5 if args[-1] <= 10000 else 1
+    best = None
+    for i in range(repeat):
+        t = time.perf_counter()
+        func(*args)
+        t = time.perf_counter() - t
+        best = t if best is None else min(best, t)
+    return best
+
+
+def main():
+    max_n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000
+
+    rgb_a, rgb_b = colors.ColorRGB(255, 135, 95), colors.ColorRGB(0, 95, 255)
+    hsv_a, hsv_b = rgb_a.to_hsv(), rgb_b.to_hsv()
+
+    cases = (
+            ('rgb naive', naive_rgb, rgb_a, rgb_b),
+            ('rgb', colors.gradient, rgb_a, rgb_b),
+            ('hsv naive', naive_hsv, hsv_a, hsv_b),
+            ('hsv', colors.gradient, hsv_a, hsv_b),
+            ('oklab', lambda A, B, N: colors.gradient(A, B, N, space='oklab'), rgb_a, rgb_b),
+            ('oklab array', lambda A, B, N: colors.gradient_array(A, B, N, space='oklab'), rgb_a, rgb_b),
+            )
+
+    print('{:>12}'.format('N') + ''.join('{:>14}'.format(name) for name, *_ in cases))
+
+    N = 10
+    while N <= max_n:
+        row = '{:>12}'.format(N)
+        for name, func, A, B in cases:
+            row += '{:>13.4f}s'.format(measure(func, A, B, N))
+        print(row)
+        N *= 10
+
+
+if __name__ == '__main__':
+    main()
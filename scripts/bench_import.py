@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# Measure import time of warawara in fresh interpreters
+#
+# $ python3 scripts/bench_import.py [REPEAT]
+
+import subprocess
+import sys
+import time
+
+from os.path import dirname, abspath
+
+
+root = dirname(dirname(abspath(__file__)))
+
+scenarios = (
+        ('python', 'pass'),
+        ('import warawara', 'import warawara'),
+        ('warawara.colors', 'import warawara; warawara.colors'),
+        ('warawara.run', 'import warawara; warawara.run'),
+        ('warawara.bin.rainbow', 'import warawara; warawara.bin.rainbow'),
+        ('import *', 'from warawara import *'),
+        )
+
+
+def measure(code, repeat):
+    best = None
+    for i in range(repeat):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+        t = time.perf_counter() - t
+        best = t if best is None else min(best, t)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    baseline = None
+    for name, code in scenarios:
+        t = measure(code, repeat)
+        if baseline is None:
+            baseline = t
+        print('{:<24}{:>8.1f} ms{:>+10.1f} ms'.format(name, t * 1000, (t - baseline) * 1000))
+
+
+if __name__ == '__main__':
+    main()
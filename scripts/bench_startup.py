@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+# Measure startup time of warawara console scripts, and check them against budgets
+#
+# $ python3 -m scripts.bench_startup [--repeat N] [--importtime] [--budget NAME=MS ...]
+#
+# Times are measured in fresh interpreters, minus the startup time of a bare interpreter:
+#   cold: without cached bytecode (a new PYTHONPYCACHEPREFIX for every run)
+#   warm: with cached bytecode
+#
+# Exits with 1 if any warm time exceeds its budget, or if any target exits with non-zero status.
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from os.path import dirname, abspath
+
+
+root = dirname(dirname(abspath(__file__)))
+
+
+def entry_point(name, *argv):
+    # The exit status of main() is the exit status of the interpreter
+    return ('import sys; sys.argv = {!r}; import warawara\n'
+            'warawara.bin.{}.main()\n').format([name] + list(argv), name)
+
+
+targets = (
+        ('import', 'import warawara'),
+        ('wara', entry_point('wara', 'colorize', '--help')),
+        ('rainbow', entry_point('rainbow', '--help')),
+        ('palette', entry_point('palette', '--help')),
+        ('sponge', entry_point('sponge', '--help')),
+        ('ntfy', entry_point('ntfy', '--help')),
+        ('colorize', entry_point('colorize', '--help')),
+        )
+
+# Warm startup budgets in milliseconds, on top of a bare interpreter
+default_budgets = {
+        'import': 20,
+        'wara': 150,
+        'rainbow': 150,
+        'palette': 150,
+        'sponge': 150,
+        'ntfy': 150,
+        'colorize': 150,
+        }
+
+
+def run(code, pycache, importtime=False):
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+
+    t = time.perf_counter()
+    p = subprocess.run(cmd, cwd=root, env=env,
+                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    t = time.perf_counter() - t
+
+    return t, p.stderr.decode('utf-8', errors='replace'), p.returncode
+
+
+def measure(code, repeat, workdir):
+    # Returns (cold, warm, error), error is (returncode, stderr) of a failed run or None
+    # A target that fails early would look fast, so its times are not meaningful
+    error = None
+
+    def timed(pycache):
+        nonlocal error
+        t, stderr, returncode = run(code, pycache)
+        if returncode != 0:
+            error = (returncode, stderr)
+        return t
+
+    # Cold: every run gets an empty bytecode cache
+    cold = min(timed(tempfile.mkdtemp(dir=workdir)) for i in range(repeat))
+
+    # Warm: bytecode cached by the first run
+    pycache = tempfile.mkdtemp(dir=workdir)
+    timed(pycache)
+    warm = min(timed(pycache) for i in range(repeat))
+
+    return cold, warm, error
+
+
+importtime_regex = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def importtime_breakdown(code, workdir):
+    # Returns [(module, self_us, cumulative_us, depth)] from -X importtime
+    pycache = tempfile.mkdtemp(dir=workdir)
+    run(code, pycache)
+    stderr = run(code, pycache, importtime=True)[1]
+
+    ret = []
+    for line in stderr.splitlines():
+        m = importtime_regex.match(line)
+        if m:
+            ret.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return ret
+
+
+def print_breakdown(name, breakdown, top, baseline):
+    # Modules that a bare interpreter imports are not counted
+    breakdown = [x for x in breakdown if x[0] not in baseline]
+
+    print()
+    print('{} (-X importtime, warm, top {} by self time):'.format(name, top))
+    for module, self_us, cumulative_us, depth in sorted(breakdown, key=lambda x: -x[1])[:top]:
+        print('    {:<40}{:>8.1f} ms{:>8.1f} ms'.format(module, self_us / 1000, cumulative_us / 1000))
+
+    total = sum(x[1] for x in breakdown)
+    own = sum(x[1] for x in breakdown if x[0].startswith('warawara'))
+    print('    {:<40}{:>8.1f} ms'.format('total', total / 1000))
+    print('    {:<40}{:>8.1f} ms'.format('in warawara', own / 1000))
+
+
+def parse_budget(s):
+    name, _, ms = s.partition('=')
+    try:
+        return name, float(ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError('Invalid budget: {}'.format(s))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_startup',
+                                     description='Measure startup time of warawara console scripts')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='Number of runs, the fastest one is taken (default: 5)')
+    parser.add_argument('--importtime', action='store_true',
+                        help='Show -X importtime breakdown of each target')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of modules in the breakdown (default: 10)')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[],
+                        help='Override budget of a target in milliseconds, e.g. rainbow=100')
+    parser.add_argument('--budget-file',
+                        help='JSON file of {target: milliseconds}')
+    parser.add_argument('targets', nargs='*',
+                        help='Targets to measure: ' + ', '.join(name for name, _ in targets))
+    args = parser.parse_args()
+
+    budgets = dict(default_budgets)
+    if args.budget_file:
+        with open(args.budget_file) as f:
+            budgets.update(json.load(f))
+    budgets.update(args.budget)
+
+    selected = [t for t in targets if not args.targets or t[0] in args.targets]
+    unknown = set(args.targets) - set(name for name, _ in targets)
+    if unknown:
+        parser.error('Unknown targets: ' + ', '.join(sorted(unknown)))
+
+    failed = []
+    with tempfile.TemporaryDirectory() as workdir:
+        base_cold, base_warm, _ = measure('pass', args.repeat, workdir)
+        print('{:<10}{:>12}{:>12}{:>12}'.format('target', 'cold', 'warm', 'budget'))
+        print('{:<10}{:>9.1f} ms{:>9.1f} ms'.format('(python)', base_cold * 1000, base_warm * 1000))
+
+        breakdowns = []
+        for name, code in selected:
+            cold, warm, error = measure(code, args.repeat, workdir)
+            cold = (cold - base_cold) * 1000
+            warm = (warm - base_warm) * 1000
+            budget = budgets.get(name)
+
+            verdict = ''
+            if error:
+                verdict = '  FAILED (exit {})'.format(error[0])
+                failed.append(name)
+            elif budget is not None and warm > budget:
+                verdict = '  OVER BUDGET'
+                failed.append(name)
+
+            print('{:<10}{:>9.1f} ms{:>9.1f} ms{:>12}{}'.format(
+                name, cold, warm,
+                '' if budget is None else '{:.0f} ms'.format(budget),
+                verdict))
+
+            if error:
+                for line in error[1].strip().splitlines()[-5:]:
+                    print('    ' + line)
+
+            if args.importtime:
+                breakdowns.append((name, importtime_breakdown(code, workdir)))
+
+        if breakdowns:
+            baseline = set(x[0] for x in importtime_breakdown('pass', workdir))
+        for name, breakdown in breakdowns:
+            print_breakdown(name, breakdown, args.top, baseline)
+
+    if failed:
+        print()
+        print('Failed or over budget: ' + ', '.join(failed))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+# Generate warawara/internal_color_table.py, the precomputed xterm 256 color table
+#
+# $ python3 scripts/gen_color_table.py           # (re)generate the module
+# $ python3 scripts/gen_color_table.py --check   # exit 1 if the module is stale
+#
+# The table is computed here from first principles, so warawara itself
+# loads it at import time without any computation.
+
+import sys
+import colorsys
+
+from os.path import dirname, abspath, join
+
+
+output_path = join(dirname(dirname(abspath(__file__))), 'warawara', 'internal_color_table.py')
+
+
+named_colors = [
+        (0, ('black',)),
+        (1, ('maroon',)),
+        (2, ('green',)),
+        (3, ('olive',)),
+        (4, ('navy',)),
+        (5, ('purple',)),
+        (6, ('teal',)),
+        (7, ('silver',)),
+        (8, ('gray', 'grey',)),
+        (9, ('red',)),
+        (10, ('lime',)),
+        (11, ('yellow',)),
+        (12, ('blue',)),
+        (13, ('fuchsia', 'magenta',)),
+        (14, ('aqua', 'cyan',)),
+        (15, ('aliceblue', 'azure', 'floralwhite', 'ghostwhite', 'ivory',
+              'lavenderblush', 'mintcream', 'snow', 'white',)),
+        (17, ('midnightblue',)),
+        (18, ('darkblue',)),
+        (20, ('mediumblue',)),
+        (22, ('darkgreen',)),
+        (28, ('forestgreen',)),
+        (29, ('seagreen',)),
+        (30, ('darkcyan',)),
+        (33, ('dodgerblue',)),
+        (37, ('lightseagreen',)),
+        (39, ('deepskyblue',)),
+        (44, ('darkturquoise',)),
+        (48, ('mediumspringgreen', 'springgreen',)),
+        (54, ('indigo',)),
+        (60, ('darkslateblue',)),
+        (62, ('royalblue', 'slateblue',)),
+        (64, ('olivedrab',)),
+        (66, ('slategray', 'slategrey',)),
+        (67, ('steelblue',)),
+        (69, ('cornflowerblue',)),
+        (71, ('mediumseagreen',)),
+        (73, ('cadetblue',)),
+        (77, ('limegreen',)),
+        (79, ('mediumaquamarine',)),
+        (80, ('mediumturquoise', 'turquoise',)),
+        (88, ('darkred',)),
+        (90, ('darkmagenta',)),
+        (92, ('blueviolet', 'darkviolet',)),
+        (94, ('saddlebrown',)),
+        (98, ('darkorchid', 'mediumpurple',)),
+        (99, ('mediumslateblue',)),
+        (102, ('lightslategray', 'lightslategrey',)),
+        (108, ('darkseagreen',)),
+        (113, ('yellowgreen',)),
+        (117, ('lightskyblue', 'skyblue',)),
+        (118, ('chartreuse', 'lawngreen',)),
+        (120, ('lightgreen', 'palegreen',)),
+        (122, ('aquamarine',)),
+        (124, ('brown', 'firebrick',)),
+        (130, ('sienna',)),
+        (134, ('mediumorchid',)),
+        (135, ('murasaki',)),
+        (136, ('darkgoldenrod',)),
+        (138, ('rosybrown',)),
+        (143, ('darkkhaki',)),
+        (152, ('lightblue', 'lightsteelblue', 'powderblue',)),
+        (154, ('greenyellow',)),
+        (159, ('paleturquoise',)),
+        (161, ('crimson',)),
+        (162, ('mediumvioletred',)),
+        (166, ('chocolate', 'clementine',)),
+        (167, ('indianred',)),
+        (168, ('palevioletred',)),
+        (170, ('orchid',)),
+        (173, ('peru',)),
+        (174, ('darksalmon',)),
+        (178, ('goldenrod',)),
+        (180, ('burlywood', 'tan',)),
+        (182, ('plum', 'thistle',)),
+        (195, ('lightcyan',)),
+        (198, ('deeppink',)),
+        (202, ('orangered',)),
+        (203, ('tomato',)),
+        (205, ('hotpink',)),
+        (208, ('darkorange',)),
+        (209, ('coral', 'salmon',)),
+        (210, ('lightcoral',)),
+        (213, ('violet',)),
+        (214, ('orange',)),
+        (215, ('sandybrown',)),
+        (216, ('lightsalmon',)),
+        (217, ('lightpink',)),
+        (218, ('pink',)),
+        (220, ('gold',)),
+        (222, ('khaki',)),
+        (223, ('moccasin', 'navajowhite', 'palegoldenrod',
+               'peachpuff', 'wheat',)),
+        (224, ('bisque', 'mistyrose',)),
+        (230, ('antiquewhite', 'beige', 'blanchedalmond',
+               'cornsilk', 'lemonchiffon',
+               'lightgoldenrodyellow', 'lightyellow',
+               'oldlace', 'papayawhip',)),
+        (238, ('darkslategray', 'darkslategrey',)),
+        (239, ('darkolivegreen',)),
+        (242, ('dimgray', 'dimgrey',)),
+        (248, ('darkgray', 'darkgrey',)),
+        (252, ('lightgray', 'lightgrey',)),
+        (253, ('gainsboro',)),
+        (255, ('honeydew', 'lavender', 'linen', 'seashell', 'whitesmoke',)),
+]
+
+
+def color256_rgb(index):
+    if index < 16:
+        base = 0xFF if (index > 7) else 0x80
+        is_7 = (index == 7)
+        is_8 = (index == 8)
+        R = base * ((index & 0x1) != 0) + (0x40 * is_7) + (0x80 * is_8)
+        G = base * ((index & 0x2) != 0) + (0x40 * is_7) + (0x80 * is_8)
+        B = base * ((index & 0x4) != 0) + (0x40 * is_7) + (0x80 * is_8)
+
+    elif index < 232:
+        base = index - 16
+        index_R = (base // 36)
+        index_G = ((base % 36) // 6)
+        index_B = (base % 6)
+        R = (55 + index_R * 40) if index_R > 0 else 0
+        G = (55 + index_G * 40) if index_G > 0 else 0
+        B = (55 + index_B * 40) if index_B > 0 else 0
+
+    else:
+        R = G = B = (index - 232) * 10 + 8
+
+    return (R, G, B)
+
+
+def color256_hsv(index):
+    # Same as ColorRGB.to_hsv()
+    h, s, v = colorsys.rgb_to_hsv(*(x / 255 for x in color256_rgb(index)))
+    return (h * 360, s * 100, v * 100)
+
+
+def high_contrast_fg(index):
+    # Foreground color that is readable on top of the background color index
+    # None stands for the default foreground color
+    if index == 0:
+        return None
+
+    if index < 16:
+        return 0
+
+    elif index < 232:
+        base = index - 16
+        r = (base // 36)
+        g = ((base % 36) // 6)
+
+        if r < 2 and g < 2:
+            return None
+
+        if r < 3 and g < 1:
+            return None
+
+    elif index < 240:
+        return None
+
+    return 0
+
+
+# Only the 6x6x6 cube (16 ~ 231) and the grayscale ramp (232 ~ 255) are searched,
+# because the first 16 colors are usually customized by terminal palettes
+cube_levels = (0, 95, 135, 175, 215, 255)
+
+
+def cube_nearest(v):
+    return tuple(sorted(range(6), key=lambda i: (abs(cube_levels[i] - v), i))[:3])
+
+
+def gray_nearest(v):
+    return tuple(sorted(range(24), key=lambda i: (abs(8 + 10 * i - v), i))[:3])
+
+
+def table(name, items):
+    return '{} = (\n{})\n'.format(name, ''.join('    {},\n'.format(repr(item)) for item in items))
+
+
+def generate():
+    return '\n\n'.join([
+        '# Generated by scripts/gen_color_table.py, do not edit\n'
+        '# Each table is indexed by xterm 256 color index, unless noted otherwise\n',
+        table('rgb', map(color256_rgb, range(256))),
+        table('hsv', map(color256_hsv, range(256))),
+        table('fg_seqs', ('\033[38;5;{}m'.format(i) for i in range(256))),
+        table('bg_seqs', ('\033[48;5;{}m'.format(i) for i in range(256))),
+        table('high_contrast_fg', map(high_contrast_fg, range(256))),
+        '# (index, names) pairs\n' + table('names', named_colors),
+        '# Indexed by channel value, the 3 nearest cube levels and grayscale steps\n' +
+        table('cube_nearest', map(cube_nearest, range(256))),
+        table('gray_nearest', map(gray_nearest, range(256))),
+        ])
+
+
+def main():
+    source = generate()
+
+    if sys.argv[1:] == ['--check']:
+        try:
+            with open(output_path, encoding='utf-8') as f:
+                up_to_date = (f.read() == source)
+        except OSError:
+            up_to_date = False
+
+        if not up_to_date:
+            print('{} is stale, run {}'.format(output_path, sys.argv[0]), file=sys.stderr)
+            sys.exit(1)
+        return
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,50 +9,120 @@ check_python_version()
 del check_python_version
 
 
-def load_internal_modules(prefix, post_load_hook):
+# Sub-modules are imported on first access (PEP 562)
+#   lib_<name> modules are registered as warawara.<name>,
+#   and their exported names are merged into warawara namespace
+#   bin_<name> modules are registered as warawara.bin.<name>, see bin/__init__.py
+
+from . import bin
+
+
+_loaded_libs = set()
+
+
+_libs = ('colors', 'fs', 'itertools', 'math', 'regex', 'sh', 'subproc', 'test_utils', 'tui')
+
+
+# The lib of each exported name, so a flat name only loads its own lib
+# Named colors are looked up from the generated color table instead, see _find_lib()
+_exports = {
+        'colors': (
+            'Color', 'color', 'Color256', 'ColorRGB', 'ColorHSV', 'ColorLab', 'ColorOKLab',
+            'ColorCompound', 'paint', 'nocolor', 'ColorRegistry', 'color_registry', 'load_palette',
+            'names', 'rgb_to_hsv_array', 'hsv_to_rgb_array', 'color256_to_rgb_array',
+            'rgb_to_256_array', 'decolor', 'Colorizer', 'render', 'detect_color_profile',
+            'get_color_profile', 'set_color_profile', 'gradient', 'gradient_array', 'colormap',
+            ),
+        'fs': ('open', 'natsorted'),
+        'itertools': ('is_iterable', 'unwrap_one', 'unwrap', 'flatten', 'lookahead', 'zip_longest'),
+        'math': ('is_uint8', 'sgn', 'lerp', 'clamp', 'vector', 'interval', 'resample'),
+        'regex': ('rere', 'first_chars'),
+        'sh': ('cwd', 'pushd', 'popd', 'dirs', 'home', 'shrinkuser'),
+        'subproc': (
+            'TimeoutExpired', 'AlreadyRunningError', 'grep', 'fields', 'transform', 'head', 'tail',
+            'dedup', 'keep_head', 'keep_tail', 'command', 'RunCache', 'run', 'pipe',
+            ),
+        'test_utils': ('Checkpoint', 'TestCase', 'RunMocker'),
+        'tui': (
+            'strwidth', 'ColoredText', 'ljust', 'rjust', 'TerminalWriter', 'Screen',
+            'ThreadedSpinner', 'ProgressTask', 'CommandTask', 'ProgressManager', 'prompt',
+            ),
+        }
+
+_export_index = {attr: lib for lib, attrs in _exports.items() for attr in attrs}
+
+
+def _find_lib(attr):
+    lib = _export_index.get(attr)
+    if lib is None and 'colors' not in _loaded_libs:
+        from . import internal_color_table
+        if any(attr in names for index, names in internal_color_table.names):
+            lib = 'colors'
+    return lib
+
+
+def _load_lib(name):
     import importlib
-    import pkgutil
-    scope_prefix = __name__ + '.'
-    for mod_info in pkgutil.iter_modules(__path__, scope_prefix):
-        mod_name = mod_info.name[len(scope_prefix):]
-        if not mod_name.startswith(prefix):
-            continue
+    module = importlib.import_module(__name__ + '.lib_' + name)
 
-        module = importlib.import_module(mod_info.name)
-        post_load_hook(module, mod_name)
+    if name not in _loaded_libs:
+        _loaded_libs.add(name)
 
+        if '__all__' in module.__dict__:
+            attrs = module.__dict__['__all__']
+        else:
+            attrs = [x for x in module.__dict__ if not x.startswith('_')]
 
-def post_load_lib(module, mod_name):
-    ext_name = mod_name[4:]
+        # Register module into package namespace with external name
+        globals()[name] = module
+        globals().update({attr: getattr(module, attr) for attr in attrs})
 
-    if '__all__' in module.__dict__:
-        attrs = module.__dict__['__all__']
-    else:
-        attrs = [x for x in module.__dict__ if not x.startswith('_')]
+    # Delete internal names that were set by the import system
+    for attr in [x for x in globals() if x.startswith(('lib_', 'bin_'))]:
+        del globals()[attr]
 
-    # Register module into package namespace with external name
-    globals()[ext_name] = module
-    globals().update({attr: getattr(module, attr) for attr in attrs})
+    return module
 
-    # Delete old name from package namespace
-    del globals()[mod_name]
 
+def _load_all_libs():
+    for name in _libs:
+        _load_lib(name)
 
-def post_load_bin(module, mod_name):
-    ext_name = mod_name[4:]
 
-    # Register module into warawara.bin with external name
-    setattr(bin, ext_name, module)
+def __getattr__(attr):
+    if attr == '__all__':
+        _load_all_libs()
+        globals()['__all__'] = sorted(x for x in globals() if not x.startswith('_'))
+        return globals()['__all__']
 
-    # Delete old name from package namespace
-    del globals()[mod_name]
+    if attr.startswith('__'):
+        raise AttributeError('module {} has no attribute {}'.format(repr(__name__), repr(attr)))
 
+    if attr.startswith(('lib_', 'bin_', 'internal_')):
+        import importlib
+        try:
+            return importlib.import_module(__name__ + '.' + attr)
+        except ModuleNotFoundError as e:
+            if e.name != __name__ + '.' + attr:
+                raise
+        raise AttributeError('module {} has no attribute {}'.format(repr(__name__), repr(attr)))
 
-from . import bin
+    if attr in _libs:
+        return _load_lib(attr)
+
+    lib = _find_lib(attr)
+    if lib:
+        _load_lib(lib)
+
+    if attr not in globals():
+        _load_all_libs()
+
+    if attr not in globals():
+        raise AttributeError('module {} has no attribute {}'.format(repr(__name__), repr(attr)))
+
+    return globals()[attr]
 
-load_internal_modules('lib_', post_load_lib)
-load_internal_modules('bin_', post_load_bin)
 
-del post_load_lib
-del post_load_bin
-del load_internal_modules
+def __dir__():
+    _load_all_libs()
+    return sorted(globals())
@@ -1,2 +1,22 @@
 # This file is a placeholder for warawara.bin module
-# The actual sub-modules will be loaded in warawara.__init__.py
+# The actual sub-modules are loaded on first access, see warawara/__init__.py
+
+
+_names = ('colorize', 'ntfy', 'palette', 'rainbow', 'sponge', 'wara')
+
+
+def __getattr__(attr):
+    if attr not in _names:
+        raise AttributeError('module {} has no attribute {}'.format(repr(__name__), repr(attr)))
+
+    import importlib
+    import sys
+    module = importlib.import_module('warawara.bin_' + attr)
+
+    # Register module into warawara.bin with external name
+    globals()[attr] = module
+
+    # Delete old name from package namespace
+    sys.modules['warawara'].__dict__.pop('bin_' + attr, None)
+
+    return module
@@ -0,0 +1,76 @@
+import re
+import sys
+import argparse
+
+from . import lib_colors
+
+
+# Log levels, used if no rules are given
+default_rules = (
+        (r'\b(?:FATAL|CRITICAL|ERROR|ERR)\b', 'red'),
+        (r'\b(?:WARNING|WARN)\b', 'yellow'),
+        (r'\bINFO\b', 'green'),
+        (r'\b(?:DEBUG|TRACE)\b', 'grey'),
+        )
+
+
+def color_profile_of(when):
+    if when == 'auto':
+        return lib_colors.detect_color_profile()
+    if when == 'always':
+        return 'truecolor'
+    if when == 'never':
+        return 'none'
+    return when
+
+
+def main():
+    parser = argparse.ArgumentParser(
+            prog='colorize',
+            description='Highlight regex matches in a stream, e.g. levels and fields of logs',
+            epilog='''STYLE is a color spec like "red", "208", "#FF8700",
+or "FG/BG" like "white/red", "/red".
+Matches are searched line by line, at the same position the earlier rule wins.''')
+
+    parser.add_argument('-e', '--rule', nargs=2, action='append', default=[],
+                        metavar=('PATTERN', 'STYLE'),
+                        help='Highlight matches of PATTERN with STYLE, could be given multiple times')
+    parser.add_argument('-i', '--ignore-case', action='store_true',
+                        help='Match patterns case-insensitively')
+    parser.add_argument('--color', default='auto',
+                        choices=('auto', 'always', 'never') + lib_colors.color_profiles[:-1],
+                        help='When to color, or the color profile to use (default: auto)')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help='Files to read, "-" or nothing for stdin')
+
+    args = parser.parse_args()
+
+    try:
+        colorizer = lib_colors.Colorizer(args.rule or default_rules,
+                                         flags=re.IGNORECASE if args.ignore_case else 0)
+    except (TypeError, ValueError, re.error) as e:
+        parser.error(str(e))
+
+    lib_colors.set_color_profile(color_profile_of(args.color))
+
+    try:
+        for path in (args.files or ['-']):
+            if path == '-':
+                colorizer.stream(sys.stdin.buffer, sys.stdout.buffer)
+                continue
+
+            try:
+                with open(path, 'rb') as f:
+                    colorizer.stream(f, sys.stdout.buffer)
+            except OSError as e:
+                print('colorize: {}: {}'.format(path, e.strerror), file=sys.stderr)
+                sys.exit(1)
+
+    except BrokenPipeError:
+        # The reader is gone, e.g. piped into head
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        sys.exit(1)
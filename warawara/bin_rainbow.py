@@ -6,13 +6,15 @@ import textwrap
 from os.path import basename
 
 from . import lib_colors
+from . import internal_color_table as color_table
 
 from .lib_colors import paint
 from .lib_colors import color
 from .lib_regex import rere
 from .lib_math import resample
-from .lib_math import is_uint8
 from .lib_itertools import lookahead
+from .lib_tui import ColoredText
+from .lib_tui import TerminalWriter
 
 
 errors = []
@@ -31,91 +33,28 @@ def high_contrast_fg(c):
     if isinstance(c, lib_colors.Color256):
         c = c.index
 
-    if c == 0:
-        return None
-
-    if c < 16:
-        return 0
-
-    elif c < 232:
-        base = c - 16
-        r = (base // 36)
-        g = ((base % 36) // 6)
-        b = (base % 6)
-
-        if r < 2 and g < 2:
-            return None
-
-        if r < 3 and g < 1:
-            return None
-
-    elif c in range(232, 240):
-        return None
-
-    return 0
+    return color_table.high_contrast_fg[c]
 
 
 def parse_target(arg):
     if not isinstance(arg, str):
         return
 
-    ret = None
-
-    to = []
-
-    while True:
-        m = rere(arg)
-
-        if m.fullmatch(r'^(.+)\.(rgb|RGB|hsv|HSV)$'):
-            to.append(m.group(2))
-            arg = m.group(1)
-            continue
-
-        break
-
-    if arg in lib_colors.names:
-        ret = getattr(lib_colors, arg)
-
-    # #RRGGBB format
-    elif m.fullmatch(r'#?([0-9a-fA-Z]{6})'):
-        ret = color('#' + m.group(1))
-
-    # #RRR,GGG,BBB format
-    elif m.fullmatch(r'#([0-9]+),([0-9]+),([0-9]+)'):
-        r, g, b = map(lambda x: int(x, 10), arg[1:].split(','))
-        ret = lib_colors.ColorRGB(r, g, b)
-
-    # @HHH,SSS,VVV format
-    elif m.fullmatch(r'@([0-9]+),([0-9]+),([0-9]+)'):
-        ret = lib_colors.ColorHSV(arg)
-
-    # int
-    elif m.fullmatch(r'[0-9]+'):
-        try:
-            i = int(arg, 10)
-            if is_uint8(i):
-                ret = color(i)
-        except:
-            ret = None
-
-    tr_path = arg
-    for t in to[::-1]:
-        try:
-            if t.lower() == 'rgb':
-                ret = ret.to_rgb()
-                tr_path += '.rgb'
-            elif t.lower() == 'hsv':
-                ret = ret.to_hsv()
-                tr_path += '.hsv'
-        except AttributeError:
-            pend_error('Error: Cannot transform color', tr_path, 'to', t)
+    ret = lib_colors.parse_color_spec(arg)
+    if ret is None:
+        # Report the first suffix that cannot be applied
+        tr_path, to = lib_colors.split_color_spec(arg)
+        for t in to:
+            if lib_colors.parse_color_spec(tr_path + '.' + t) is None:
+                pend_error('Error: Cannot transform color', tr_path, 'to', t)
+                break
+            tr_path += '.' + t
 
     return ret
 
 
 def spell_suggestions(word):
-    import difflib
-    return difflib.get_close_matches(word, lib_colors.names, cutoff=0)
+    return lib_colors.color_registry.suggest(word)
 
 
 def spell_suggestion_err_msg(word):
@@ -134,39 +73,50 @@ def spell_suggestion_err_msg(word):
 
 
 def expand_macro_all():
-    ret = []
-    for i in range(256):
-        ret.append((parse_target(str(i)), []))
-
-    for name in lib_colors.names:
-        c = parse_target(name)
-        ret[c.index][1].append(name)
-
-    return ret
+    registry = lib_colors.color_registry
+    table = lib_colors.color256_table
+    return [(table[i], list(registry.names_of(table[i]))) for i in range(256)]
 
 
 def expand_macro_named():
     ret = []
-    for name in lib_colors.names:
-        ret.append((parse_target(name), [name]))
+    for name in lib_colors.color_registry:
+        ret.append((lib_colors.color_registry[name], [name]))
     return ret
 
 
+def register_palettes(paths):
+    # The parsed result of palettes is cached on disk
+    for path in paths:
+        if not path:
+            continue
+
+        try:
+            lib_colors.color_registry.register_palette(path, lazy=False)
+        except OSError as e:
+            pend_error('Cannot load palette "{}": {}'.format(path, e.strerror))
+        except ValueError as e:
+            pend_error('Cannot load palette "{}": {}'.format(path, e))
+
+    judge_errors()
+
+
 def main_256cube():
-    # Print color cube palette
-    print('Format: ESC[30;48;5;{}m')
+    # Print color cube palette, in one write
+    out = TerminalWriter()
+    out.print('Format: ESC[30;48;5;{}m')
     for c in range(0, 256):
-        color_rgb = color(c).to_rgb()
-        print(paint(fg=high_contrast_fg(c), bg=c)(' ' + str(c).rjust(3)), end='')
+        out.write(paint(fg=high_contrast_fg(c), bg=c)(' ' + str(c).rjust(3)))
 
         if c < 16 and (c + 1) % 8 == 0:
-            print()
+            out.write('\n')
         if c >= 16 and (c - 16 + 1) % 36 == 0:
-            print()
+            out.write('\n')
         if c in (15, 231):
-            print()
+            out.write('\n')
 
-    print()
+    out.write('\n')
+    out.flush()
     sys.exit()
 
 
@@ -177,6 +127,9 @@ def main():
     if not argv:
         main_256cube()
 
+    import os
+    register_palettes(os.environ.get('WARAWARA_PALETTE', '').split(os.pathsep))
+
     colorful = ''.join(
             map(
                 lambda x: lib_colors.color(x[0])(x[1]),
@@ -211,6 +164,12 @@ def main():
                         help='''Filter out colors that does not contain the specified sub-string
 This argument can be specified multiple times for multiple keywords''')
 
+    parser.add_argument('--palette',
+                        action='append', default=[],
+                        help='''Load named colors from a palette file (JSON / CSV / X11 rgb.txt)
+This argument can be specified multiple times for multiple files
+Palette files could also be specified with $WARAWARA_PALETTE''')
+
     parser.add_argument('-a', '--aliases',
                         action='store_true',
                         help='Show aliases of specified colors')
@@ -277,6 +236,8 @@ Ignores "all" and "named" macros''')
 
     args = parser.parse_intermixed_args()
 
+    register_palettes(args.palette)
+
     if args.tile and args.gradient:
         print('--tile and --gradient cannot be used together')
         sys.exit(1)
@@ -444,16 +405,16 @@ def main_list(args):
         print('No colors to query')
         sys.exit(1)
 
-    unmentioned_names = set(lib_colors.names)
-    for _, names in inventory:
-        unmentioned_names -= set(names)
+    mentioned_names = set(name for _, names in inventory for name in names)
 
     aliases = [[] for i in range(256)]
     if args.aliases:
-        for name in unmentioned_names:
-            c = getattr(lib_colors, name).index
-            aliases[c].append(name)
+        for i in range(256):
+            aliases[i] = [name
+                          for name in lib_colors.color_registry.names_of(i)
+                          if name not in mentioned_names]
 
+    out = TerminalWriter()
     for this_color, names in inventory:
         line = []
         rgb = this_color if isinstance(this_color, lib_colors.ColorRGB) else this_color.to_rgb()
@@ -491,7 +452,9 @@ def main_list(args):
                 line[-1] = line[-1] + (' ' if line[-1] else '') + a
                 aliases[this_color.index] = []
 
-        print(' '.join(line))
+        out.print(' '.join(line))
+
+    out.flush()
 
 
 def main_tile(args):
@@ -528,23 +491,22 @@ def main_tile(args):
     if lines < 0:
         lines = len(tiles)
 
+    # The whole screen is written at once
+    out = TerminalWriter()
     for idx, is_last in lookahead(resample(range(len(tiles)), lines)):
         colors = tiles[idx]
         widths = []
         quo, rem = divmod(cols, len(colors))
         widths = [quo + (i < rem) for i, elem in enumerate(colors)]
-        line = ''
         for idx, textcolor in enumerate(colors):
             text, c = textcolor
-            text = text[:widths[idx]]
-            line += paint(fg=c, bg=c)(text) + (~c)(' ' * (widths[idx] - len(text)))
+            text = ColoredText((paint(fg=c, bg=c), text))[:widths[idx]]
+            out.write(str(text), (~c)(' ' * (widths[idx] - text.width)))
 
-        if args.lines:
-            print(line)
-        else:
-            print(line, end='\n' if not is_last else '')
+        if args.lines or not is_last:
+            out.write('\n')
 
-    sys.stdout.flush()
+    out.flush()
 
     if not args.lines:
         import termios, tty
@@ -0,0 +1,1928 @@
+# Generated by scripts/gen_color_table.py, do not edit
+# Each table is indexed by xterm 256 color index, unless noted otherwise
+
+
+rgb = (
+    (0, 0, 0),
+    (128, 0, 0),
+    (0, 128, 0),
+    (128, 128, 0),
+    (0, 0, 128),
+    (128, 0, 128),
+    (0, 128, 128),
+    (192, 192, 192),
+    (128, 128, 128),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (0, 0, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+    (0, 0, 0),
+    (0, 0, 95),
+    (0, 0, 135),
+    (0, 0, 175),
+    (0, 0, 215),
+    (0, 0, 255),
+    (0, 95, 0),
+    (0, 95, 95),
+    (0, 95, 135),
+    (0, 95, 175),
+    (0, 95, 215),
+    (0, 95, 255),
+    (0, 135, 0),
+    (0, 135, 95),
+    (0, 135, 135),
+    (0, 135, 175),
+    (0, 135, 215),
+    (0, 135, 255),
+    (0, 175, 0),
+    (0, 175, 95),
+    (0, 175, 135),
+    (0, 175, 175),
+    (0, 175, 215),
+    (0, 175, 255),
+    (0, 215, 0),
+    (0, 215, 95),
+    (0, 215, 135),
+    (0, 215, 175),
+    (0, 215, 215),
+    (0, 215, 255),
+    (0, 255, 0),
+    (0, 255, 95),
+    (0, 255, 135),
+    (0, 255, 175),
+    (0, 255, 215),
+    (0, 255, 255),
+    (95, 0, 0),
+    (95, 0, 95),
+    (95, 0, 135),
+    (95, 0, 175),
+    (95, 0, 215),
+    (95, 0, 255),
+    (95, 95, 0),
+    (95, 95, 95),
+    (95, 95, 135),
+    (95, 95, 175),
+    (95, 95, 215),
+    (95, 95, 255),
+    (95, 135, 0),
+    (95, 135, 95),
+    (95, 135, 135),
+    (95, 135, 175),
+    (95, 135, 215),
+    (95, 135, 255),
+    (95, 175, 0),
+    (95, 175, 95),
+    (95, 175, 135),
+    (95, 175, 175),
+    (95, 175, 215),
+    (95, 175, 255),
+    (95, 215, 0),
+    (95, 215, 95),
+    (95, 215, 135),
+    (95, 215, 175),
+    (95, 215, 215),
+    (95, 215, 255),
+    (95, 255, 0),
+    (95, 255, 95),
+    (95, 255, 135),
+    (95, 255, 175),
+    (95, 255, 215),
+    (95, 255, 255),
+    (135, 0, 0),
+    (135, 0, 95),
+    (135, 0, 135),
+    (135, 0, 175),
+    (135, 0, 215),
+    (135, 0, 255),
+    (135, 95, 0),
+    (135, 95, 95),
+    (135, 95, 135),
+    (135, 95, 175),
+    (135, 95, 215),
+    (135, 95, 255),
+    (135, 135, 0),
+    (135, 135, 95),
+    (135, 135, 135),
+    (135, 135, 175),
+    (135, 135, 215),
+    (135, 135, 255),
+    (135, 175, 0),
+    (135, 175, 95),
+    (135, 175, 135),
+    (135, 175, 175),
+    (135, 175, 215),
+    (135, 175, 255),
+    (135, 215, 0),
+    (135, 215, 95),
+    (135, 215, 135),
+    (135, 215, 175),
+    (135, 215, 215),
+    (135, 215, 255),
+    (135, 255, 0),
+    (135, 255, 95),
+    (135, 255, 135),
+    (135, 255, 175),
+    (135, 255, 215),
+    (135, 255, 255),
+    (175, 0, 0),
+    (175, 0, 95),
+    (175, 0, 135),
+    (175, 0, 175),
+    (175, 0, 215),
+    (175, 0, 255),
+    (175, 95, 0),
+    (175, 95, 95),
+    (175, 95, 135),
+    (175, 95, 175),
+    (175, 95, 215),
+    (175, 95, 255),
+    (175, 135, 0),
+    (175, 135, 95),
+    (175, 135, 135),
+    (175, 135, 175),
+    (175, 135, 215),
+    (175, 135, 255),
+    (175, 175, 0),
+    (175, 175, 95),
+    (175, 175, 135),
+    (175, 175, 175),
+    (175, 175, 215),
+    (175, 175, 255),
+    (175, 215, 0),
+    (175, 215, 95),
+    (175, 215, 135),
+    (175, 215, 175),
+    (175, 215, 215),
+    (175, 215, 255),
+    (175, 255, 0),
+    (175, 255, 95),
+    (175, 255, 135),
+    (175, 255, 175),
+    (175, 255, 215),
+    (175, 255, 255),
+    (215, 0, 0),
+    (215, 0, 95),
+    (215, 0, 135),
+    (215, 0, 175),
+    (215, 0, 215),
+    (215, 0, 255),
+    (215, 95, 0),
+    (215, 95, 95),
+    (215, 95, 135),
+    (215, 95, 175),
+    (215, 95, 215),
+    (215, 95, 255),
+    (215, 135, 0),
+    (215, 135, 95),
+    (215, 135, 135),
+    (215, 135, 175),
+    (215, 135, 215),
+    (215, 135, 255),
+    (215, 175, 0),
+    (215, 175, 95),
+    (215, 175, 135),
+    (215, 175, 175),
+    (215, 175, 215),
+    (215, 175, 255),
+    (215, 215, 0),
+    (215, 215, 95),
+    (215, 215, 135),
+    (215, 215, 175),
+    (215, 215, 215),
+    (215, 215, 255),
+    (215, 255, 0),
+    (215, 255, 95),
+    (215, 255, 135),
+    (215, 255, 175),
+    (215, 255, 215),
+    (215, 255, 255),
+    (255, 0, 0),
+    (255, 0, 95),
+    (255, 0, 135),
+    (255, 0, 175),
+    (255, 0, 215),
+    (255, 0, 255),
+    (255, 95, 0),
+    (255, 95, 95),
+    (255, 95, 135),
+    (255, 95, 175),
+    (255, 95, 215),
+    (255, 95, 255),
+    (255, 135, 0),
+    (255, 135, 95),
+    (255, 135, 135),
+    (255, 135, 175),
+    (255, 135, 215),
+    (255, 135, 255),
+    (255, 175, 0),
+    (255, 175, 95),
+    (255, 175, 135),
+    (255, 175, 175),
+    (255, 175, 215),
+    (255, 175, 255),
+    (255, 215, 0),
+    (255, 215, 95),
+    (255, 215, 135),
+    (255, 215, 175),
+    (255, 215, 215),
+    (255, 215, 255),
+    (255, 255, 0),
+    (255, 255, 95),
+    (255, 255, 135),
+    (255, 255, 175),
+    (255, 255, 215),
+    (255, 255, 255),
+    (8, 8, 8),
+    (18, 18, 18),
+    (28, 28, 28),
+    (38, 38, 38),
+    (48, 48, 48),
+    (58, 58, 58),
+    (68, 68, 68),
+    (78, 78, 78),
+    (88, 88, 88),
+    (98, 98, 98),
+    (108, 108, 108),
+    (118, 118, 118),
+    (128, 128, 128),
+    (138, 138, 138),
+    (148, 148, 148),
+    (158, 158, 158),
+    (168, 168, 168),
+    (178, 178, 178),
+    (188, 188, 188),
+    (198, 198, 198),
+    (208, 208, 208),
+    (218, 218, 218),
+    (228, 228, 228),
+    (238, 238, 238),
+)
+
+
+hsv = (
+    (0.0, 0.0, 0.0),
+    (0.0, 100.0, 50.19607843137255),
+    (120.0, 100.0, 50.19607843137255),
+    (60.0, 100.0, 50.19607843137255),
+    (240.0, 100.0, 50.19607843137255),
+    (300.0, 100.0, 50.19607843137255),
+    (180.0, 100.0, 50.19607843137255),
+    (0.0, 0.0, 75.29411764705883),
+    (0.0, 0.0, 50.19607843137255),
+    (0.0, 100.0, 100.0),
+    (120.0, 100.0, 100.0),
+    (60.0, 100.0, 100.0),
+    (240.0, 100.0, 100.0),
+    (300.0, 100.0, 100.0),
+    (180.0, 100.0, 100.0),
+    (0.0, 0.0, 100.0),
+    (0.0, 0.0, 0.0),
+    (240.0, 100.0, 37.254901960784316),
+    (240.0, 100.0, 52.94117647058824),
+    (240.0, 100.0, 68.62745098039215),
+    (240.0, 100.0, 84.31372549019608),
+    (240.0, 100.0, 100.0),
+    (120.0, 100.0, 37.254901960784316),
+    (180.0, 100.0, 37.254901960784316),
+    (197.77777777777774, 100.0, 52.94117647058824),
+    (207.42857142857144, 100.0, 68.62745098039215),
+    (213.4883720930233, 100.0, 84.31372549019608),
+    (217.6470588235294, 100.0, 100.0),
+    (120.0, 100.0, 52.94117647058824),
+    (162.22222222222223, 100.0, 52.94117647058824),
+    (180.0, 100.0, 52.94117647058824),
+    (193.7142857142857, 100.0, 68.62745098039215),
+    (202.32558139534885, 100.0, 84.31372549019608),
+    (208.23529411764707, 100.0, 100.0),
+    (120.0, 100.0, 68.62745098039215),
+    (152.57142857142856, 100.0, 68.62745098039215),
+    (166.28571428571428, 100.0, 68.62745098039215),
+    (180.0, 100.0, 68.62745098039215),
+    (191.16279069767444, 100.0, 84.31372549019608),
+    (198.82352941176467, 100.0, 100.0),
+    (120.0, 100.0, 84.31372549019608),
+    (146.51162790697674, 100.0, 84.31372549019608),
+    (157.67441860465118, 100.0, 84.31372549019608),
+    (168.8372093023256, 100.0, 84.31372549019608),
+    (180.0, 100.0, 84.31372549019608),
+    (189.41176470588235, 100.0, 100.0),
+    (120.0, 100.0, 100.0),
+    (142.35294117647058, 100.0, 100.0),
+    (151.76470588235293, 100.0, 100.0),
+    (161.1764705882353, 100.0, 100.0),
+    (170.58823529411765, 100.0, 100.0),
+    (180.0, 100.0, 100.0),
+    (0.0, 100.0, 37.254901960784316),
+    (300.0, 100.0, 37.254901960784316),
+    (282.22222222222223, 100.0, 52.94117647058824),
+    (272.57142857142856, 100.0, 68.62745098039215),
+    (266.51162790697674, 100.0, 84.31372549019608),
+    (262.3529411764706, 100.0, 100.0),
+    (60.0, 100.0, 37.254901960784316),
+    (0.0, 0.0, 37.254901960784316),
+    (240.0, 29.629629629629626, 52.94117647058824),
+    (240.0, 45.714285714285715, 68.62745098039215),
+    (240.0, 55.81395348837209, 84.31372549019608),
+    (240.0, 62.745098039215684, 100.0),
+    (77.77777777777777, 100.0, 52.94117647058824),
+    (120.0, 29.629629629629626, 52.94117647058824),
+    (180.0, 29.629629629629626, 52.94117647058824),
+    (210.0, 45.714285714285715, 68.62745098039215),
+    (220.00000000000003, 55.81395348837209, 84.31372549019608),
+    (225.0, 62.745098039215684, 100.0),
+    (87.42857142857144, 100.0, 68.62745098039215),
+    (120.0, 45.714285714285715, 68.62745098039215),
+    (150.0, 45.714285714285715, 68.62745098039215),
+    (180.0, 45.714285714285715, 68.62745098039215),
+    (199.99999999999997, 55.81395348837209, 84.31372549019608),
+    (210.0, 62.745098039215684, 100.0),
+    (93.48837209302326, 100.0, 84.31372549019608),
+    (120.0, 55.81395348837209, 84.31372549019608),
+    (140.0, 55.81395348837209, 84.31372549019608),
+    (160.0, 55.81395348837209, 84.31372549019608),
+    (180.0, 55.81395348837209, 84.31372549019608),
+    (195.0, 62.745098039215684, 100.0),
+    (97.6470588235294, 100.0, 100.0),
+    (120.0, 62.745098039215684, 100.0),
+    (135.0, 62.745098039215684, 100.0),
+    (150.0, 62.745098039215684, 100.0),
+    (165.0, 62.745098039215684, 100.0),
+    (180.0, 62.745098039215684, 100.0),
+    (0.0, 100.0, 52.94117647058824),
+    (317.77777777777777, 100.0, 52.94117647058824),
+    (300.0, 100.0, 52.94117647058824),
+    (286.2857142857143, 100.0, 68.62745098039215),
+    (277.6744186046512, 100.0, 84.31372549019608),
+    (271.7647058823529, 100.0, 100.0),
+    (42.22222222222222, 100.0, 52.94117647058824),
+    (0.0, 29.629629629629626, 52.94117647058824),
+    (300.0, 29.629629629629626, 52.94117647058824),
+    (270.0, 45.714285714285715, 68.62745098039215),
+    (260.0, 55.81395348837209, 84.31372549019608),
+    (255.0, 62.745098039215684, 100.0),
+    (60.0, 100.0, 52.94117647058824),
+    (60.0, 29.629629629629626, 52.94117647058824),
+    (0.0, 0.0, 52.94117647058824),
+    (240.0, 22.857142857142858, 68.62745098039215),
+    (240.0, 37.2093023255814, 84.31372549019608),
+    (240.0, 47.05882352941176, 100.0),
+    (73.71428571428572, 100.0, 68.62745098039215),
+    (90.0, 45.714285714285715, 68.62745098039215),
+    (120.0, 22.857142857142858, 68.62745098039215),
+    (180.0, 22.857142857142858, 68.62745098039215),
+    (210.0, 37.2093023255814, 84.31372549019608),
+    (220.00000000000003, 47.05882352941176, 100.0),
+    (82.32558139534882, 100.0, 84.31372549019608),
+    (99.99999999999999, 55.81395348837209, 84.31372549019608),
+    (120.0, 37.2093023255814, 84.31372549019608),
+    (150.0, 37.2093023255814, 84.31372549019608),
+    (180.0, 37.2093023255814, 84.31372549019608),
+    (199.99999999999997, 47.05882352941176, 100.0),
+    (88.23529411764707, 100.0, 100.0),
+    (105.0, 62.745098039215684, 100.0),
+    (120.0, 47.05882352941176, 100.0),
+    (140.0, 47.05882352941176, 100.0),
+    (160.0, 47.05882352941176, 100.0),
+    (180.0, 47.05882352941176, 100.0),
+    (0.0, 100.0, 68.62745098039215),
+    (327.42857142857144, 100.0, 68.62745098039215),
+    (313.7142857142857, 100.0, 68.62745098039215),
+    (300.0, 100.0, 68.62745098039215),
+    (288.83720930232556, 100.0, 84.31372549019608),
+    (281.1764705882353, 100.0, 100.0),
+    (32.57142857142858, 100.0, 68.62745098039215),
+    (0.0, 45.714285714285715, 68.62745098039215),
+    (330.0, 45.714285714285715, 68.62745098039215),
+    (300.0, 45.714285714285715, 68.62745098039215),
+    (280.0, 55.81395348837209, 84.31372549019608),
+    (270.0, 62.745098039215684, 100.0),
+    (46.28571428571429, 100.0, 68.62745098039215),
+    (30.0, 45.714285714285715, 68.62745098039215),
+    (0.0, 22.857142857142858, 68.62745098039215),
+    (300.0, 22.857142857142858, 68.62745098039215),
+    (270.0, 37.2093023255814, 84.31372549019608),
+    (260.0, 47.05882352941176, 100.0),
+    (60.0, 100.0, 68.62745098039215),
+    (60.0, 45.714285714285715, 68.62745098039215),
+    (60.0, 22.857142857142858, 68.62745098039215),
+    (0.0, 0.0, 68.62745098039215),
+    (240.0, 18.6046511627907, 84.31372549019608),
+    (240.0, 31.372549019607842, 100.0),
+    (71.16279069767441, 100.0, 84.31372549019608),
+    (80.0, 55.81395348837209, 84.31372549019608),
+    (90.0, 37.2093023255814, 84.31372549019608),
+    (120.0, 18.6046511627907, 84.31372549019608),
+    (180.0, 18.6046511627907, 84.31372549019608),
+    (210.0, 31.372549019607842, 100.0),
+    (78.8235294117647, 100.0, 100.0),
+    (90.0, 62.745098039215684, 100.0),
+    (99.99999999999999, 47.05882352941176, 100.0),
+    (120.0, 31.372549019607842, 100.0),
+    (150.0, 31.372549019607842, 100.0),
+    (180.0, 31.372549019607842, 100.0),
+    (0.0, 100.0, 84.31372549019608),
+    (333.48837209302326, 100.0, 84.31372549019608),
+    (322.3255813953489, 100.0, 84.31372549019608),
+    (311.16279069767444, 100.0, 84.31372549019608),
+    (300.0, 100.0, 84.31372549019608),
+    (290.5882352941176, 100.0, 100.0),
+    (26.511627906976745, 100.0, 84.31372549019608),
+    (0.0, 55.81395348837209, 84.31372549019608),
+    (340.0, 55.81395348837209, 84.31372549019608),
+    (320.0, 55.81395348837209, 84.31372549019608),
+    (300.0, 55.81395348837209, 84.31372549019608),
+    (285.0, 62.745098039215684, 100.0),
+    (37.674418604651166, 100.0, 84.31372549019608),
+    (20.0, 55.81395348837209, 84.31372549019608),
+    (0.0, 37.2093023255814, 84.31372549019608),
+    (330.0, 37.2093023255814, 84.31372549019608),
+    (300.0, 37.2093023255814, 84.31372549019608),
+    (280.0, 47.05882352941176, 100.0),
+    (48.837209302325576, 100.0, 84.31372549019608),
+    (40.0, 55.81395348837209, 84.31372549019608),
+    (30.0, 37.2093023255814, 84.31372549019608),
+    (0.0, 18.6046511627907, 84.31372549019608),
+    (300.0, 18.6046511627907, 84.31372549019608),
+    (270.0, 31.372549019607842, 100.0),
+    (60.0, 100.0, 84.31372549019608),
+    (60.0, 55.81395348837209, 84.31372549019608),
+    (60.0, 37.2093023255814, 84.31372549019608),
+    (60.0, 18.6046511627907, 84.31372549019608),
+    (0.0, 0.0, 84.31372549019608),
+    (240.0, 15.686274509803921, 100.0),
+    (69.41176470588235, 100.0, 100.0),
+    (75.0, 62.745098039215684, 100.0),
+    (80.0, 47.05882352941176, 100.0),
+    (90.0, 31.372549019607842, 100.0),
+    (120.0, 15.686274509803921, 100.0),
+    (180.0, 15.686274509803921, 100.0),
+    (0.0, 100.0, 100.0),
+    (337.6470588235294, 100.0, 100.0),
+    (328.2352941176471, 100.0, 100.0),
+    (318.8235294117647, 100.0, 100.0),
+    (309.4117647058824, 100.0, 100.0),
+    (300.0, 100.0, 100.0),
+    (22.352941176470587, 100.0, 100.0),
+    (0.0, 62.745098039215684, 100.0),
+    (345.0, 62.745098039215684, 100.0),
+    (330.0, 62.745098039215684, 100.0),
+    (315.0, 62.745098039215684, 100.0),
+    (300.0, 62.745098039215684, 100.0),
+    (31.764705882352942, 100.0, 100.0),
+    (15.0, 62.745098039215684, 100.0),
+    (0.0, 47.05882352941176, 100.0),
+    (340.0, 47.05882352941176, 100.0),
+    (320.0, 47.05882352941176, 100.0),
+    (300.0, 47.05882352941176, 100.0),
+    (41.17647058823529, 100.0, 100.0),
+    (30.0, 62.745098039215684, 100.0),
+    (20.0, 47.05882352941176, 100.0),
+    (0.0, 31.372549019607842, 100.0),
+    (330.0, 31.372549019607842, 100.0),
+    (300.0, 31.372549019607842, 100.0),
+    (50.588235294117645, 100.0, 100.0),
+    (45.0, 62.745098039215684, 100.0),
+    (40.0, 47.05882352941176, 100.0),
+    (30.0, 31.372549019607842, 100.0),
+    (0.0, 15.686274509803921, 100.0),
+    (300.0, 15.686274509803921, 100.0),
+    (60.0, 100.0, 100.0),
+    (60.0, 62.745098039215684, 100.0),
+    (60.0, 47.05882352941176, 100.0),
+    (60.0, 31.372549019607842, 100.0),
+    (60.0, 15.686274509803921, 100.0),
+    (0.0, 0.0, 100.0),
+    (0.0, 0.0, 3.1372549019607843),
+    (0.0, 0.0, 7.0588235294117645),
+    (0.0, 0.0, 10.980392156862745),
+    (0.0, 0.0, 14.901960784313726),
+    (0.0, 0.0, 18.823529411764707),
+    (0.0, 0.0, 22.745098039215687),
+    (0.0, 0.0, 26.666666666666668),
+    (0.0, 0.0, 30.58823529411765),
+    (0.0, 0.0, 34.509803921568626),
+    (0.0, 0.0, 38.43137254901961),
+    (0.0, 0.0, 42.35294117647059),
+    (0.0, 0.0, 46.27450980392157),
+    (0.0, 0.0, 50.19607843137255),
+    (0.0, 0.0, 54.11764705882353),
+    (0.0, 0.0, 58.03921568627452),
+    (0.0, 0.0, 61.96078431372549),
+    (0.0, 0.0, 65.88235294117646),
+    (0.0, 0.0, 69.80392156862744),
+    (0.0, 0.0, 73.72549019607844),
+    (0.0, 0.0, 77.64705882352942),
+    (0.0, 0.0, 81.56862745098039),
+    (0.0, 0.0, 85.49019607843137),
+    (0.0, 0.0, 89.41176470588236),
+    (0.0, 0.0, 93.33333333333333),
+)
+
+
+fg_seqs = (
+    '\x1b[38;5;0m',
+    '\x1b[38;5;1m',
+    '\x1b[38;5;2m',
+    '\x1b[38;5;3m',
+    '\x1b[38;5;4m',
+    '\x1b[38;5;5m',
+    '\x1b[38;5;6m',
+    '\x1b[38;5;7m',
+    '\x1b[38;5;8m',
+    '\x1b[38;5;9m',
+    '\x1b[38;5;10m',
+    '\x1b[38;5;11m',
+    '\x1b[38;5;12m',
+    '\x1b[38;5;13m',
+    '\x1b[38;5;14m',
+    '\x1b[38;5;15m',
+    '\x1b[38;5;16m',
+    '\x1b[38;5;17m',
+    '\x1b[38;5;18m',
+    '\x1b[38;5;19m',
+    '\x1b[38;5;20m',
+    '\x1b[38;5;21m',
+    '\x1b[38;5;22m',
+    '\x1b[38;5;23m',
+    '\x1b[38;5;24m',
+    '\x1b[38;5;25m',
+    '\x1b[38;5;26m',
+    '\x1b[38;5;27m',
+    '\x1b[38;5;28m',
+    '\x1b[38;5;29m',
+    '\x1b[38;5;30m',
+    '\x1b[38;5;31m',
+    '\x1b[38;5;32m',
+    '\x1b[38;5;33m',
+    '\x1b[38;5;34m',
+    '\x1b[38;5;35m',
+    '\x1b[38;5;36m',
+    '\x1b[38;5;37m',
+    '\x1b[38;5;38m',
+    '\x1b[38;5;39m',
+    '\x1b[38;5;40m',
+    '\x1b[38;5;41m',
+    '\x1b[38;5;42m',
+    '\x1b[38;5;43m',
+    '\x1b[38;5;44m',
+    '\x1b[38;5;45m',
+    '\x1b[38;5;46m',
+    '\x1b[38;5;47m',
+    '\x1b[38;5;48m',
+    '\x1b[38;5;49m',
+    '\x1b[38;5;50m',
+    '\x1b[38;5;51m',
+    '\x1b[38;5;52m',
+    '\x1b[38;5;53m',
+    '\x1b[38;5;54m',
+    '\x1b[38;5;55m',
+    '\x1b[38;5;56m',
+    '\x1b[38;5;57m',
+    '\x1b[38;5;58m',
+    '\x1b[38;5;59m',
+    '\x1b[38;5;60m',
+    '\x1b[38;5;61m',
+    '\x1b[38;5;62m',
+    '\x1b[38;5;63m',
+    '\x1b[38;5;64m',
+    '\x1b[38;5;65m',
+    '\x1b[38;5;66m',
+    '\x1b[38;5;67m',
+    '\x1b[38;5;68m',
+    '\x1b[38;5;69m',
+    '\x1b[38;5;70m',
+    '\x1b[38;5;71m',
+    '\x1b[38;5;72m',
+    '\x1b[38;5;73m',
+    '\x1b[38;5;74m',
+    '\x1b[38;5;75m',
+    '\x1b[38;5;76m',
+    '\x1b[38;5;77m',
+    '\x1b[38;5;78m',
+    '\x1b[38;5;79m',
+    '\x1b[38;5;80m',
+    '\x1b[38;5;81m',
+    '\x1b[38;5;82m',
+    '\x1b[38;5;83m',
+    '\x1b[38;5;84m',
+    '\x1b[38;5;85m',
+    '\x1b[38;5;86m',
+    '\x1b[38;5;87m',
+    '\x1b[38;5;88m',
+    '\x1b[38;5;89m',
+    '\x1b[38;5;90m',
+    '\x1b[38;5;91m',
+    '\x1b[38;5;92m',
+    '\x1b[38;5;93m',
+    '\x1b[38;5;94m',
+    '\x1b[38;5;95m',
+    '\x1b[38;5;96m',
+    '\x1b[38;5;97m',
+    '\x1b[38;5;98m',
+    '\x1b[38;5;99m',
+    '\x1b[38;5;100m',
+    '\x1b[38;5;101m',
+    '\x1b[38;5;102m',
+    '\x1b[38;5;103m',
+    '\x1b[38;5;104m',
+    '\x1b[38;5;105m',
+    '\x1b[38;5;106m',
+    '\x1b[38;5;107m',
+    '\x1b[38;5;108m',
+    '\x1b[38;5;109m',
+    '\x1b[38;5;110m',
+    '\x1b[38;5;111m',
+    '\x1b[38;5;112m',
+    '\x1b[38;5;113m',
+    '\x1b[38;5;114m',
+    '\x1b[38;5;115m',
+    '\x1b[38;5;116m',
+    '\x1b[38;5;117m',
+    '\x1b[38;5;118m',
+    '\x1b[38;5;119m',
+    '\x1b[38;5;120m',
+    '\x1b[38;5;121m',
+    '\x1b[38;5;122m',
+    '\x1b[38;5;123m',
+    '\x1b[38;5;124m',
+    '\x1b[38;5;125m',
+    '\x1b[38;5;126m',
+    '\x1b[38;5;127m',
+    '\x1b[38;5;128m',
+    '\x1b[38;5;129m',
+    '\x1b[38;5;130m',
+    '\x1b[38;5;131m',
+    '\x1b[38;5;132m',
+    '\x1b[38;5;133m',
+    '\x1b[38;5;134m',
+    '\x1b[38;5;135m',
+    '\x1b[38;5;136m',
+    '\x1b[38;5;137m',
+    '\x1b[38;5;138m',
+    '\x1b[38;5;139m',
+    '\x1b[38;5;140m',
+    '\x1b[38;5;141m',
+    '\x1b[38;5;142m',
+    '\x1b[38;5;143m',
+    '\x1b[38;5;144m',
+    '\x1b[38;5;145m',
+    '\x1b[38;5;146m',
+    '\x1b[38;5;147m',
+    '\x1b[38;5;148m',
+    '\x1b[38;5;149m',
+    '\x1b[38;5;150m',
+    '\x1b[38;5;151m',
+    '\x1b[38;5;152m',
+    '\x1b[38;5;153m',
+    '\x1b[38;5;154m',
+    '\x1b[38;5;155m',
+    '\x1b[38;5;156m',
+    '\x1b[38;5;157m',
+    '\x1b[38;5;158m',
+    '\x1b[38;5;159m',
+    '\x1b[38;5;160m',
+    '\x1b[38;5;161m',
+    '\x1b[38;5;162m',
+    '\x1b[38;5;163m',
+    '\x1b[38;5;164m',
+    '\x1b[38;5;165m',
+    '\x1b[38;5;166m',
+    '\x1b[38;5;167m',
+    '\x1b[38;5;168m',
+    '\x1b[38;5;169m',
+    '\x1b[38;5;170m',
+    '\x1b[38;5;171m',
+    '\x1b[38;5;172m',
+    '\x1b[38;5;173m',
+    '\x1b[38;5;174m',
+    '\x1b[38;5;175m',
+    '\x1b[38;5;176m',
+    '\x1b[38;5;177m',
+    '\x1b[38;5;178m',
+    '\x1b[38;5;179m',
+    '\x1b[38;5;180m',
+    '\x1b[38;5;181m',
+    '\x1b[38;5;182m',
+    '\x1b[38;5;183m',
+    '\x1b[38;5;184m',
+    '\x1b[38;5;185m',
+    '\x1b[38;5;186m',
+    '\x1b[38;5;187m',
+    '\x1b[38;5;188m',
+    '\x1b[38;5;189m',
+    '\x1b[38;5;190m',
+    '\x1b[38;5;191m',
+    '\x1b[38;5;192m',
+    '\x1b[38;5;193m',
+    '\x1b[38;5;194m',
+    '\x1b[38;5;195m',
+    '\x1b[38;5;196m',
+    '\x1b[38;5;197m',
+    '\x1b[38;5;198m',
+    '\x1b[38;5;199m',
+    '\x1b[38;5;200m',
+    '\x1b[38;5;201m',
+    '\x1b[38;5;202m',
+    '\x1b[38;5;203m',
+    '\x1b[38;5;204m',
+    '\x1b[38;5;205m',
+    '\x1b[38;5;206m',
+    '\x1b[38;5;207m',
+    '\x1b[38;5;208m',
+    '\x1b[38;5;209m',
+    '\x1b[38;5;210m',
+    '\x1b[38;5;211m',
+    '\x1b[38;5;212m',
+    '\x1b[38;5;213m',
+    '\x1b[38;5;214m',
+    '\x1b[38;5;215m',
+    '\x1b[38;5;216m',
+    '\x1b[38;5;217m',
+    '\x1b[38;5;218m',
+    '\x1b[38;5;219m',
+    '\x1b[38;5;220m',
+    '\x1b[38;5;221m',
+    '\x1b[38;5;222m',
+    '\x1b[38;5;223m',
+    '\x1b[38;5;224m',
+    '\x1b[38;5;225m',
+    '\x1b[38;5;226m',
+    '\x1b[38;5;227m',
+    '\x1b[38;5;228m',
+    '\x1b[38;5;229m',
+    '\x1b[38;5;230m',
+    '\x1b[38;5;231m',
+    '\x1b[38;5;232m',
+    '\x1b[38;5;233m',
+    '\x1b[38;5;234m',
+    '\x1b[38;5;235m',
+    '\x1b[38;5;236m',
+    '\x1b[38;5;237m',
+    '\x1b[38;5;238m',
+    '\x1b[38;5;239m',
+    '\x1b[38;5;240m',
+    '\x1b[38;5;241m',
+    '\x1b[38;5;242m',
+    '\x1b[38;5;243m',
+    '\x1b[38;5;244m',
+    '\x1b[38;5;245m',
+    '\x1b[38;5;246m',
+    '\x1b[38;5;247m',
+    '\x1b[38;5;248m',
+    '\x1b[38;5;249m',
+    '\x1b[38;5;250m',
+    '\x1b[38;5;251m',
+    '\x1b[38;5;252m',
+    '\x1b[38;5;253m',
+    '\x1b[38;5;254m',
+    '\x1b[38;5;255m',
+)
+
+
+bg_seqs = (
+    '\x1b[48;5;0m',
+    '\x1b[48;5;1m',
+    '\x1b[48;5;2m',
+    '\x1b[48;5;3m',
+    '\x1b[48;5;4m',
+    '\x1b[48;5;5m',
+    '\x1b[48;5;6m',
+    '\x1b[48;5;7m',
+    '\x1b[48;5;8m',
+    '\x1b[48;5;9m',
+    '\x1b[48;5;10m',
+    '\x1b[48;5;11m',
+    '\x1b[48;5;12m',
+    '\x1b[48;5;13m',
+    '\x1b[48;5;14m',
+    '\x1b[48;5;15m',
+    '\x1b[48;5;16m',
+    '\x1b[48;5;17m',
+    '\x1b[48;5;18m',
+    '\x1b[48;5;19m',
+    '\x1b[48;5;20m',
+    '\x1b[48;5;21m',
+    '\x1b[48;5;22m',
+    '\x1b[48;5;23m',
+    '\x1b[48;5;24m',
+    '\x1b[48;5;25m',
+    '\x1b[48;5;26m',
+    '\x1b[48;5;27m',
+    '\x1b[48;5;28m',
+    '\x1b[48;5;29m',
+    '\x1b[48;5;30m',
+    '\x1b[48;5;31m',
+    '\x1b[48;5;32m',
+    '\x1b[48;5;33m',
+    '\x1b[48;5;34m',
+    '\x1b[48;5;35m',
+    '\x1b[48;5;36m',
+    '\x1b[48;5;37m',
+    '\x1b[48;5;38m',
+    '\x1b[48;5;39m',
+    '\x1b[48;5;40m',
+    '\x1b[48;5;41m',
+    '\x1b[48;5;42m',
+    '\x1b[48;5;43m',
+    '\x1b[48;5;44m',
+    '\x1b[48;5;45m',
+    '\x1b[48;5;46m',
+    '\x1b[48;5;47m',
+    '\x1b[48;5;48m',
+    '\x1b[48;5;49m',
+    '\x1b[48;5;50m',
+    '\x1b[48;5;51m',
+    '\x1b[48;5;52m',
+    '\x1b[48;5;53m',
+    '\x1b[48;5;54m',
+    '\x1b[48;5;55m',
+    '\x1b[48;5;56m',
+    '\x1b[48;5;57m',
+    '\x1b[48;5;58m',
+    '\x1b[48;5;59m',
+    '\x1b[48;5;60m',
+    '\x1b[48;5;61m',
+    '\x1b[48;5;62m',
+    '\x1b[48;5;63m',
+    '\x1b[48;5;64m',
+    '\x1b[48;5;65m',
+    '\x1b[48;5;66m',
+    '\x1b[48;5;67m',
+    '\x1b[48;5;68m',
+    '\x1b[48;5;69m',
+    '\x1b[48;5;70m',
+    '\x1b[48;5;71m',
+    '\x1b[48;5;72m',
+    '\x1b[48;5;73m',
+    '\x1b[48;5;74m',
+    '\x1b[48;5;75m',
+    '\x1b[48;5;76m',
+    '\x1b[48;5;77m',
+    '\x1b[48;5;78m',
+    '\x1b[48;5;79m',
+    '\x1b[48;5;80m',
+    '\x1b[48;5;81m',
+    '\x1b[48;5;82m',
+    '\x1b[48;5;83m',
+    '\x1b[48;5;84m',
+    '\x1b[48;5;85m',
+    '\x1b[48;5;86m',
+    '\x1b[48;5;87m',
+    '\x1b[48;5;88m',
+    '\x1b[48;5;89m',
+    '\x1b[48;5;90m',
+    '\x1b[48;5;91m',
+    '\x1b[48;5;92m',
+    '\x1b[48;5;93m',
+    '\x1b[48;5;94m',
+    '\x1b[48;5;95m',
+    '\x1b[48;5;96m',
+    '\x1b[48;5;97m',
+    '\x1b[48;5;98m',
+    '\x1b[48;5;99m',
+    '\x1b[48;5;100m',
+    '\x1b[48;5;101m',
+    '\x1b[48;5;102m',
+    '\x1b[48;5;103m',
+    '\x1b[48;5;104m',
+    '\x1b[48;5;105m',
+    '\x1b[48;5;106m',
+    '\x1b[48;5;107m',
+    '\x1b[48;5;108m',
+    '\x1b[48;5;109m',
+    '\x1b[48;5;110m',
+    '\x1b[48;5;111m',
+    '\x1b[48;5;112m',
+    '\x1b[48;5;113m',
+    '\x1b[48;5;114m',
+    '\x1b[48;5;115m',
+    '\x1b[48;5;116m',
+    '\x1b[48;5;117m',
+    '\x1b[48;5;118m',
+    '\x1b[48;5;119m',
+    '\x1b[48;5;120m',
+    '\x1b[48;5;121m',
+    '\x1b[48;5;122m',
+    '\x1b[48;5;123m',
+    '\x1b[48;5;124m',
+    '\x1b[48;5;125m',
+    '\x1b[48;5;126m',
+    '\x1b[48;5;127m',
+    '\x1b[48;5;128m',
+    '\x1b[48;5;129m',
+    '\x1b[48;5;130m',
+    '\x1b[48;5;131m',
+    '\x1b[48;5;132m',
+    '\x1b[48;5;133m',
+    '\x1b[48;5;134m',
+    '\x1b[48;5;135m',
+    '\x1b[48;5;136m',
+    '\x1b[48;5;137m',
+    '\x1b[48;5;138m',
+    '\x1b[48;5;139m',
+    '\x1b[48;5;140m',
+    '\x1b[48;5;141m',
+    '\x1b[48;5;142m',
+    '\x1b[48;5;143m',
+    '\x1b[48;5;144m',
+    '\x1b[48;5;145m',
+    '\x1b[48;5;146m',
+    '\x1b[48;5;147m',
+    '\x1b[48;5;148m',
+    '\x1b[48;5;149m',
+    '\x1b[48;5;150m',
+    '\x1b[48;5;151m',
+    '\x1b[48;5;152m',
+    '\x1b[48;5;153m',
+    '\x1b[48;5;154m',
+    '\x1b[48;5;155m',
+    '\x1b[48;5;156m',
+    '\x1b[48;5;157m',
+    '\x1b[48;5;158m',
+    '\x1b[48;5;159m',
+    '\x1b[48;5;160m',
+    '\x1b[48;5;161m',
+    '\x1b[48;5;162m',
+    '\x1b[48;5;163m',
+    '\x1b[48;5;164m',
+    '\x1b[48;5;165m',
+    '\x1b[48;5;166m',
+    '\x1b[48;5;167m',
+    '\x1b[48;5;168m',
+    '\x1b[48;5;169m',
+    '\x1b[48;5;170m',
+    '\x1b[48;5;171m',
+    '\x1b[48;5;172m',
+    '\x1b[48;5;173m',
+    '\x1b[48;5;174m',
+    '\x1b[48;5;175m',
+    '\x1b[48;5;176m',
+    '\x1b[48;5;177m',
+    '\x1b[48;5;178m',
+    '\x1b[48;5;179m',
+    '\x1b[48;5;180m',
+    '\x1b[48;5;181m',
+    '\x1b[48;5;182m',
+    '\x1b[48;5;183m',
+    '\x1b[48;5;184m',
+    '\x1b[48;5;185m',
+    '\x1b[48;5;186m',
+    '\x1b[48;5;187m',
+    '\x1b[48;5;188m',
+    '\x1b[48;5;189m',
+    '\x1b[48;5;190m',
+    '\x1b[48;5;191m',
+    '\x1b[48;5;192m',
+    '\x1b[48;5;193m',
+    '\x1b[48;5;194m',
+    '\x1b[48;5;195m',
+    '\x1b[48;5;196m',
+    '\x1b[48;5;197m',
+    '\x1b[48;5;198m',
+    '\x1b[48;5;199m',
+    '\x1b[48;5;200m',
+    '\x1b[48;5;201m',
+    '\x1b[48;5;202m',
+    '\x1b[48;5;203m',
+    '\x1b[48;5;204m',
+    '\x1b[48;5;205m',
+    '\x1b[48;5;206m',
+    '\x1b[48;5;207m',
+    '\x1b[48;5;208m',
+    '\x1b[48;5;209m',
+    '\x1b[48;5;210m',
+    '\x1b[48;5;211m',
+    '\x1b[48;5;212m',
+    '\x1b[48;5;213m',
+    '\x1b[48;5;214m',
+    '\x1b[48;5;215m',
+    '\x1b[48;5;216m',
+    '\x1b[48;5;217m',
+    '\x1b[48;5;218m',
+    '\x1b[48;5;219m',
+    '\x1b[48;5;220m',
+    '\x1b[48;5;221m',
+    '\x1b[48;5;222m',
+    '\x1b[48;5;223m',
+    '\x1b[48;5;224m',
+    '\x1b[48;5;225m',
+    '\x1b[48;5;226m',
+    '\x1b[48;5;227m',
+    '\x1b[48;5;228m',
+    '\x1b[48;5;229m',
+    '\x1b[48;5;230m',
+    '\x1b[48;5;231m',
+    '\x1b[48;5;232m',
+    '\x1b[48;5;233m',
+    '\x1b[48;5;234m',
+    '\x1b[48;5;235m',
+    '\x1b[48;5;236m',
+    '\x1b[48;5;237m',
+    '\x1b[48;5;238m',
+    '\x1b[48;5;239m',
+    '\x1b[48;5;240m',
+    '\x1b[48;5;241m',
+    '\x1b[48;5;242m',
+    '\x1b[48;5;243m',
+    '\x1b[48;5;244m',
+    '\x1b[48;5;245m',
+    '\x1b[48;5;246m',
+    '\x1b[48;5;247m',
+    '\x1b[48;5;248m',
+    '\x1b[48;5;249m',
+    '\x1b[48;5;250m',
+    '\x1b[48;5;251m',
+    '\x1b[48;5;252m',
+    '\x1b[48;5;253m',
+    '\x1b[48;5;254m',
+    '\x1b[48;5;255m',
+)
+
+
+high_contrast_fg = (
+    None,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+)
+
+
+# (index, names) pairs
+names = (
+    (0, ('black',)),
+    (1, ('maroon',)),
+    (2, ('green',)),
+    (3, ('olive',)),
+    (4, ('navy',)),
+    (5, ('purple',)),
+    (6, ('teal',)),
+    (7, ('silver',)),
+    (8, ('gray', 'grey')),
+    (9, ('red',)),
+    (10, ('lime',)),
+    (11, ('yellow',)),
+    (12, ('blue',)),
+    (13, ('fuchsia', 'magenta')),
+    (14, ('aqua', 'cyan')),
+    (15, ('aliceblue', 'azure', 'floralwhite', 'ghostwhite', 'ivory', 'lavenderblush', 'mintcream', 'snow', 'white')),
+    (17, ('midnightblue',)),
+    (18, ('darkblue',)),
+    (20, ('mediumblue',)),
+    (22, ('darkgreen',)),
+    (28, ('forestgreen',)),
+    (29, ('seagreen',)),
+    (30, ('darkcyan',)),
+    (33, ('dodgerblue',)),
+    (37, ('lightseagreen',)),
+    (39, ('deepskyblue',)),
+    (44, ('darkturquoise',)),
+    (48, ('mediumspringgreen', 'springgreen')),
+    (54, ('indigo',)),
+    (60, ('darkslateblue',)),
+    (62, ('royalblue', 'slateblue')),
+    (64, ('olivedrab',)),
+    (66, ('slategray', 'slategrey')),
+    (67, ('steelblue',)),
+    (69, ('cornflowerblue',)),
+    (71, ('mediumseagreen',)),
+    (73, ('cadetblue',)),
+    (77, ('limegreen',)),
+    (79, ('mediumaquamarine',)),
+    (80, ('mediumturquoise', 'turquoise')),
+    (88, ('darkred',)),
+    (90, ('darkmagenta',)),
+    (92, ('blueviolet', 'darkviolet')),
+    (94, ('saddlebrown',)),
+    (98, ('darkorchid', 'mediumpurple')),
+    (99, ('mediumslateblue',)),
+    (102, ('lightslategray', 'lightslategrey')),
+    (108, ('darkseagreen',)),
+    (113, ('yellowgreen',)),
+    (117, ('lightskyblue', 'skyblue')),
+    (118, ('chartreuse', 'lawngreen')),
+    (120, ('lightgreen', 'palegreen')),
+    (122, ('aquamarine',)),
+    (124, ('brown', 'firebrick')),
+    (130, ('sienna',)),
+    (134, ('mediumorchid',)),
+    (135, ('murasaki',)),
+    (136, ('darkgoldenrod',)),
+    (138, ('rosybrown',)),
+    (143, ('darkkhaki',)),
+    (152, ('lightblue', 'lightsteelblue', 'powderblue')),
+    (154, ('greenyellow',)),
+    (159, ('paleturquoise',)),
+    (161, ('crimson',)),
+    (162, ('mediumvioletred',)),
+    (166, ('chocolate', 'clementine')),
+    (167, ('indianred',)),
+    (168, ('palevioletred',)),
+    (170, ('orchid',)),
+    (173, ('peru',)),
+    (174, ('darksalmon',)),
+    (178, ('goldenrod',)),
+    (180, ('burlywood', 'tan')),
+    (182, ('plum', 'thistle')),
+    (195, ('lightcyan',)),
+    (198, ('deeppink',)),
+    (202, ('orangered',)),
+    (203, ('tomato',)),
+    (205, ('hotpink',)),
+    (208, ('darkorange',)),
+    (209, ('coral', 'salmon')),
+    (210, ('lightcoral',)),
+    (213, ('violet',)),
+    (214, ('orange',)),
+    (215, ('sandybrown',)),
+    (216, ('lightsalmon',)),
+    (217, ('lightpink',)),
+    (218, ('pink',)),
+    (220, ('gold',)),
+    (222, ('khaki',)),
+    (223, ('moccasin', 'navajowhite', 'palegoldenrod', 'peachpuff', 'wheat')),
+    (224, ('bisque', 'mistyrose')),
+    (230, ('antiquewhite', 'beige', 'blanchedalmond', 'cornsilk', 'lemonchiffon', 'lightgoldenrodyellow', 'lightyellow', 'oldlace', 'papayawhip')),
+    (238, ('darkslategray', 'darkslategrey')),
+    (239, ('darkolivegreen',)),
+    (242, ('dimgray', 'dimgrey')),
+    (248, ('darkgray', 'darkgrey')),
+    (252, ('lightgray', 'lightgrey')),
+    (253, ('gainsboro',)),
+    (255, ('honeydew', 'lavender', 'linen', 'seashell', 'whitesmoke')),
+)
+
+
+# Indexed by channel value, the 3 nearest cube levels and grayscale steps
+cube_nearest = (
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (1, 2, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+    (5, 4, 3),
+)
+
+
+gray_nearest = (
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (0, 1, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 0, 2),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (1, 2, 0),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 1, 3),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (2, 3, 1),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 2, 4),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (3, 4, 2),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 3, 5),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (4, 5, 3),
+    (5, 4, 6),
+    (5, 4, 6),
+    (5, 4, 6),
+    (5, 4, 6),
+    (5, 4, 6),
+    (5, 6, 4),
+    (5, 6, 4),
+    (5, 6, 4),
+    (5, 6, 4),
+    (5, 6, 4),
+    (6, 5, 7),
+    (6, 5, 7),
+    (6, 5, 7),
+    (6, 5, 7),
+    (6, 5, 7),
+    (6, 7, 5),
+    (6, 7, 5),
+    (6, 7, 5),
+    (6, 7, 5),
+    (6, 7, 5),
+    (7, 6, 8),
+    (7, 6, 8),
+    (7, 6, 8),
+    (7, 6, 8),
+    (7, 6, 8),
+    (7, 8, 6),
+    (7, 8, 6),
+    (7, 8, 6),
+    (7, 8, 6),
+    (7, 8, 6),
+    (8, 7, 9),
+    (8, 7, 9),
+    (8, 7, 9),
+    (8, 7, 9),
+    (8, 7, 9),
+    (8, 9, 7),
+    (8, 9, 7),
+    (8, 9, 7),
+    (8, 9, 7),
+    (8, 9, 7),
+    (9, 8, 10),
+    (9, 8, 10),
+    (9, 8, 10),
+    (9, 8, 10),
+    (9, 8, 10),
+    (9, 10, 8),
+    (9, 10, 8),
+    (9, 10, 8),
+    (9, 10, 8),
+    (9, 10, 8),
+    (10, 9, 11),
+    (10, 9, 11),
+    (10, 9, 11),
+    (10, 9, 11),
+    (10, 9, 11),
+    (10, 11, 9),
+    (10, 11, 9),
+    (10, 11, 9),
+    (10, 11, 9),
+    (10, 11, 9),
+    (11, 10, 12),
+    (11, 10, 12),
+    (11, 10, 12),
+    (11, 10, 12),
+    (11, 10, 12),
+    (11, 12, 10),
+    (11, 12, 10),
+    (11, 12, 10),
+    (11, 12, 10),
+    (11, 12, 10),
+    (12, 11, 13),
+    (12, 11, 13),
+    (12, 11, 13),
+    (12, 11, 13),
+    (12, 11, 13),
+    (12, 13, 11),
+    (12, 13, 11),
+    (12, 13, 11),
+    (12, 13, 11),
+    (12, 13, 11),
+    (13, 12, 14),
+    (13, 12, 14),
+    (13, 12, 14),
+    (13, 12, 14),
+    (13, 12, 14),
+    (13, 14, 12),
+    (13, 14, 12),
+    (13, 14, 12),
+    (13, 14, 12),
+    (13, 14, 12),
+    (14, 13, 15),
+    (14, 13, 15),
+    (14, 13, 15),
+    (14, 13, 15),
+    (14, 13, 15),
+    (14, 15, 13),
+    (14, 15, 13),
+    (14, 15, 13),
+    (14, 15, 13),
+    (14, 15, 13),
+    (15, 14, 16),
+    (15, 14, 16),
+    (15, 14, 16),
+    (15, 14, 16),
+    (15, 14, 16),
+    (15, 16, 14),
+    (15, 16, 14),
+    (15, 16, 14),
+    (15, 16, 14),
+    (15, 16, 14),
+    (16, 15, 17),
+    (16, 15, 17),
+    (16, 15, 17),
+    (16, 15, 17),
+    (16, 15, 17),
+    (16, 17, 15),
+    (16, 17, 15),
+    (16, 17, 15),
+    (16, 17, 15),
+    (16, 17, 15),
+    (17, 16, 18),
+    (17, 16, 18),
+    (17, 16, 18),
+    (17, 16, 18),
+    (17, 16, 18),
+    (17, 18, 16),
+    (17, 18, 16),
+    (17, 18, 16),
+    (17, 18, 16),
+    (17, 18, 16),
+    (18, 17, 19),
+    (18, 17, 19),
+    (18, 17, 19),
+    (18, 17, 19),
+    (18, 17, 19),
+    (18, 19, 17),
+    (18, 19, 17),
+    (18, 19, 17),
+    (18, 19, 17),
+    (18, 19, 17),
+    (19, 18, 20),
+    (19, 18, 20),
+    (19, 18, 20),
+    (19, 18, 20),
+    (19, 18, 20),
+    (19, 20, 18),
+    (19, 20, 18),
+    (19, 20, 18),
+    (19, 20, 18),
+    (19, 20, 18),
+    (20, 19, 21),
+    (20, 19, 21),
+    (20, 19, 21),
+    (20, 19, 21),
+    (20, 19, 21),
+    (20, 21, 19),
+    (20, 21, 19),
+    (20, 21, 19),
+    (20, 21, 19),
+    (20, 21, 19),
+    (21, 20, 22),
+    (21, 20, 22),
+    (21, 20, 22),
+    (21, 20, 22),
+    (21, 20, 22),
+    (21, 22, 20),
+    (21, 22, 20),
+    (21, 22, 20),
+    (21, 22, 20),
+    (21, 22, 20),
+    (22, 21, 23),
+    (22, 21, 23),
+    (22, 21, 23),
+    (22, 21, 23),
+    (22, 21, 23),
+    (22, 23, 21),
+    (22, 23, 21),
+    (22, 23, 21),
+    (22, 23, 21),
+    (22, 23, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+    (23, 22, 21),
+)
@@ -1,24 +1,32 @@
 import re
 import abc
+import colorsys
+import functools
 import itertools
+import string
 
 from .lib_math import sgn
 from .lib_math import vector
-from .lib_math import lerp
 from .lib_math import interval
 from .lib_math import resample
 from .lib_math import is_uint8
 from .lib_math import clamp
+from .lib_regex import first_chars
 
 from .internal_utils import exporter
+
+from . import internal_color_table as color_table
 export, __all__ = exporter()
 
 
 @export
 class Color(abc.ABC):
-    @abc.abstractmethod
-    def __init__(self, *args, **kwargs): # pragma: no cover
-        raise NotImplementedError
+    # Color objects are immutable and interned,
+    # they are constructed in __new__() and __init__() does nothing
+    __slots__ = ('seq', '_fg_seq', '_bg_seq', '_hash')
+
+    def __init__(self, *args, **kwargs):
+        pass
 
     @abc.abstractmethod
     def __repr__(self): # pragma: no cover
@@ -28,25 +36,73 @@ class Color(abc.ABC):
     def __int__(self): # pragma: no cover
         raise NotImplementedError
 
+    @classmethod
+    def create(cls, **attrs):
+        self = object.__new__(cls)
+        for attr, value in attrs.items():
+            object.__setattr__(self, attr, value)
+        return self
+
+    def setup_seq(self, seq, fg_seq=None, bg_seq=None):
+        # Escape sequences are built once here, so coloring a string
+        # is a single concatenation
+        object.__setattr__(self, 'seq', seq)
+        object.__setattr__(self, '_fg_seq', fg_seq or ('\033[38;' + seq + 'm' if seq else ''))
+        object.__setattr__(self, '_bg_seq', bg_seq or ('\033[48;' + seq + 'm' if seq else ''))
+        object.__setattr__(self, '_hash', hash((self.__class__.__name__, seq)))
+        return self
+
+    def __getattr__(self, name):
+        # Lazy colors, e.g. steps of a long gradient, build their escape sequences on first use
+        if name in Color.__slots__:
+            self.setup_seq(self.build_seq())
+            return object.__getattribute__(self, name)
+        raise AttributeError('{!r} object has no attribute {!r}'.format(self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} object is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} object is immutable'.format(self.__class__.__name__))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.seq == other.seq
+        return self is other or (isinstance(other, self.__class__) and self.seq == other.seq)
+
+    def __hash__(self):
+        return self._hash
 
     def __call__(self, *args):
         return self.fg(*args)
 
     def fg(self, *args):
-        return self.apply('38', ' '.join(str(arg) for arg in args))
+        s = args[0] if len(args) == 1 and type(args[0]) is str else ' '.join(str(arg) for arg in args)
+        seq = self._fg_seq if color_profile == 'truecolor' else profile_seqs(self)[0]
+        return seq + s + '\033[m' if seq else s
 
     def bg(self, *args, **kwargs):
-        return self.apply('48', ' '.join(str(arg) for arg in args))
+        s = args[0] if len(args) == 1 and type(args[0]) is str else ' '.join(str(arg) for arg in args)
+        seq = self._bg_seq if color_profile == 'truecolor' else profile_seqs(self)[1]
+        return seq + s + '\033[m' if seq else s
 
     def apply(self, ground, s):
-        if not self.seq:
+        if not self.seq or color_profile == 'none':
             return s
+        if ground == '38':
+            return self.fg(str(s))
+        if ground == '48':
+            return self.bg(str(s))
         return '\033[{};{}m{}\033[m'.format(ground, self.seq, str(s))
 
     def __str__(self):
-        return '\033[38;{}m'.format(self.seq) if self.seq else '\033[m'
+        if color_profile == 'none':
+            return ''
+        return profile_seqs(self)[0] or '\033[m'
 
     def __invert__(self):
         return ColorCompound(bg=self)
@@ -84,28 +140,113 @@ def color(*args, **kwargs):
     elif arg1 is None or is_uint8(arg1):
         return Color256(*args, **kwargs)
 
-    # ColorRGB ctor #RRGGBB
-    elif isinstance(arg1, str) and re.fullmatch(r'#[0-9A-Fa-f]{6}', arg1):
-        return ColorRGB(*args, **kwargs)
-
-    # ColorHSV @H,S,V format
-    elif isinstance(arg1, str) and re.fullmatch(r'@[0-9]+,[0-9]+,[0-9]+', arg1):
-        return ColorHSV(*args, **kwargs)
+    # Color spec: name, index, #RRGGBB, #R,G,B, @H,S,V, with .rgb / .hsv suffixes
+    elif isinstance(arg1, str):
+        ret = parse_color_spec(arg1)
+        if ret is not None:
+            return ret
 
     raise TypeError('Invalid arguments: {}'.format(args))
 
 
+def parse_hex6(s):
+    # 'RRGGBB' -> (R, G, B), or None
+    if len(s) != 6 or s.lstrip(string.hexdigits):
+        return None
+    i = int(s, 16)
+    return (i >> 16, (i >> 8) & 0xFF, i & 0xFF)
+
+
+def parse_int3(s):
+    # 'A,B,C' -> (A, B, C), or None
+    ret = s.split(',')
+    if len(ret) != 3 or not all(x.isascii() and x.isdigit() for x in ret):
+        return None
+    return tuple(int(x, 10) for x in ret)
+
+
+def split_color_spec(spec):
+    # 'orange.rgb.hsv' -> ('orange', ('rgb', 'hsv'))
+    to = []
+    while True:
+        base, dot, suffix = spec.rpartition('.')
+        if not base or suffix not in ('rgb', 'RGB', 'hsv', 'HSV'):
+            break
+        to.append(suffix.lower())
+        spec = base
+    return spec, tuple(to[::-1])
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_color_spec(spec):
+    base, to = split_color_spec(spec)
+    if not base:
+        return None
+
+    ret = None
+    head = base[0]
+
+    if color_registry.get(base) is not None:
+        ret = color_registry.get(base)
+
+    elif head == '#':
+        rgb = parse_hex6(base[1:]) or parse_int3(base[1:])
+        if rgb and all(x < 256 for x in rgb):
+            ret = ColorRGB(*rgb)
+
+    elif head == '@':
+        hsv = parse_int3(base[1:])
+        if hsv and hsv[1] <= 100 and hsv[2] <= 100:
+            ret = ColorHSV(*hsv)
+
+    else:
+        # RRGGBB comes first, it could be all digits too
+        rgb = parse_hex6(base)
+        if rgb:
+            ret = ColorRGB(*rgb)
+
+        elif base.isascii() and base.isdigit():
+            index = int(base, 10)
+            if index < 256:
+                ret = Color256(index)
+
+    if ret is None:
+        return None
+
+    for t in to:
+        if ret.seq == '':
+            return None
+        ret = ret.to_rgb() if t == 'rgb' else ret.to_hsv()
+
+    return ret
+
+
 @export
 class Color256(Color):
-    def __init__(self, index=None):
-        if isinstance(index, self.__class__):
-            index = index.index
+    __slots__ = ('index',)
 
-        self.index = index
+    def __new__(cls, index=None):
+        if isinstance(index, Color256):
+            index = index.index
 
-        if not self.index is None and not is_uint8(index):
+        if not index is None and not is_uint8(index):
             raise TypeError('Invalid color index: {}'.format(index))
 
+        if cls is Color256:
+            return color256_table[index]
+
+        return cls.intern(index)
+
+    @classmethod
+    def intern(cls, index):
+        self = cls.create(index=index)
+        if index is None:
+            return self.setup_seq('')
+        return self.setup_seq('5;{}'.format(index), color_table.fg_seqs[index], color_table.bg_seqs[index])
+
+    def __reduce__(self):
+        return (Color256, (self.index,))
+
     def __repr__(self):
         return '{}({})'.format(self.__class__.__name__, self.index)
 
@@ -113,37 +254,20 @@ class Color256(Color):
     def code(self):
         return self.index
 
-    @property
-    def seq(self):
-        if self.index is None:
-            return ''
-        return '5;{}'.format(self.index)
-
     def to_rgb(self):
-        if self.index < 16:
-            base = 0xFF if (self.index > 7) else 0x80
-            is_7 = (self.index == 7)
-            is_8 = (self.index == 8)
-            R = base * ((self.index & 0x1) != 0) + (0x40 * is_7) + (0x80 * is_8)
-            G = base * ((self.index & 0x2) != 0) + (0x40 * is_7) + (0x80 * is_8)
-            B = base * ((self.index & 0x4) != 0) + (0x40 * is_7) + (0x80 * is_8)
-
-        elif self.index < 232:
-            base = self.index - 16
-            index_R = (base // 36)
-            index_G = ((base % 36) // 6)
-            index_B = (base % 6)
-            R = (55 + index_R * 40) if index_R > 0 else 0
-            G = (55 + index_G * 40) if index_G > 0 else 0
-            B = (55 + index_B * 40) if index_B > 0 else 0
+        return ColorRGB(*color_table.rgb[self.index])
 
-        else:
-            R = G = B = (self.index - 232) * 10 + 8
+    def to_hsv(self):
+        return ColorHSV(*color_table.hsv[self.index])
 
-        return ColorRGB(R, G, B)
+    def to_256(self, perceptual=False):
+        return self
 
-    def to_hsv(self):
-        return self.to_rgb().to_hsv()
+    def to_lab(self):
+        return self.to_rgb().to_lab()
+
+    def to_oklab(self):
+        return self.to_rgb().to_oklab()
 
     def __int__(self):
         return self.index
@@ -151,40 +275,64 @@ class Color256(Color):
 
 @export
 class ColorRGB(Color):
-    def __init__(self, *args, overflow=False):
+    __slots__ = ('r', 'g', 'b')
+
+    def __new__(cls, *args, overflow=False):
         nargs = len(args)
         arg1 = args[0] if len(args) else None
 
-        type_check = (lambda x: 0 <= x < 256
-                      if not overflow
-                      else lambda x: isinstance(x, (int, float)))
+        if overflow:
+            type_check = lambda x: isinstance(x, (int, float))
+        else:
+            type_check = lambda x: 0 <= x < 256
 
-        self.r = None
-        self.g = None
-        self.b = None
+        rgb = (None, None, None)
 
         if not args:
-            return
+            return cls.intern(*rgb)
 
         elif nargs != 1:
             # (num, num, num) format
             if len(args) == 3 and all(type_check(i) for i in args):
-                (self.r, self.g, self.b) = args
+                rgb = args
 
         # Copy ctor
-        elif isinstance(arg1, self.__class__):
-            (self.r, self.g, self.b) = arg1.rgb
+        elif isinstance(arg1, cls):
+            return arg1
 
         # #RRGGBB format
-        elif isinstance(arg1, str) and re.fullmatch(r'#[0-9A-Fa-f]{6}', arg1):
-            rgb_str = arg1[1:]
-            self.r = int(rgb_str[0:2], 16)
-            self.g = int(rgb_str[2:4], 16)
-            self.b = int(rgb_str[4:6], 16)
+        elif isinstance(arg1, str) and arg1.startswith('#'):
+            rgb = parse_hex6(arg1[1:]) or rgb
 
-        if None in self.rgb:
+        if None in rgb:
             raise TypeError('Invalid RGB value: {}'.format(args))
 
+        return cls.intern(*rgb)
+
+    @classmethod
+    def intern(cls, r, g, b):
+        if cls is ColorRGB:
+            return intern_rgb(r, g, b)
+        return cls.build(r, g, b)
+
+    @classmethod
+    def build(cls, r, g, b):
+        self = cls.lazy(r, g, b)
+        return self.setup_seq(self.build_seq())
+
+    @classmethod
+    def lazy(cls, r, g, b):
+        # Not interned, and without escape sequences until they are used
+        return cls.create(r=r, g=g, b=b)
+
+    def build_seq(self):
+        if self.r is None:
+            return ''
+        return '2;{};{};{}'.format(self.R, self.G, self.B)
+
+    def __reduce__(self):
+        return (self.__class__.intern, self.rgb)
+
     def __repr__(self):
         return 'ColorRGB({}, {}, {})'.format(self.r, self.g, self.b)
 
@@ -208,12 +356,6 @@ class ColorRGB(Color):
     def rgb(self):
         return (self.r, self.g, self.b)
 
-    @property
-    def seq(self):
-        if None in self.rgb:
-            return ''
-        return '2;{};{};{}'.format(self.R, self.G, self.B)
-
     def __add__(self, other):
         rgb = vector(self.rgb) + vector(other.rgb)
         return ColorRGB(*rgb, overflow=True)
@@ -241,35 +383,40 @@ class ColorRGB(Color):
         return self
 
     def to_hsv(self, overflow=False):
-        import colorsys
         hsv = colorsys.rgb_to_hsv(self.R / 255, self.G / 255, self.B / 255)
         return ColorHSV(hsv[0] * 360, hsv[1] * 100, hsv[2] * 100, overflow=overflow)
 
+    def to_256(self, perceptual=False):
+        return Color256(nearest_color256(self.R, self.G, self.B, perceptual))
+
+    def to_lab(self):
+        return ColorLab(*rgb_to_lab(self.R, self.G, self.B), overflow=True)
+
+    def to_oklab(self):
+        return ColorOKLab(*rgb_to_oklab(self.R, self.G, self.B), overflow=True)
+
 
 @export
 class ColorHSV(Color):
-    def __init__(self, *args, overflow=False):
-        arg1 = args[0] if len(args) else None
+    __slots__ = ('h', 's', 'v', '_rgb')
 
-        self.h = None
-        self.s = None
-        self.v = None
+    def __new__(cls, *args, overflow=False):
+        arg1 = args[0] if len(args) else None
 
         h = None
         s = None
         v = None
 
         if not args:
-            return
+            return cls.intern(h, s, v)
 
         # Copy ctor
-        elif len(args) == 1 and isinstance(arg1, self.__class__):
-            other = arg1
-            (h, s, v) = (other.h, other.s, other.v)
+        elif len(args) == 1 and isinstance(arg1, cls):
+            return arg1
 
         # @H,S,V format
-        elif len(args) == 1 and isinstance(arg1, str) and re.fullmatch(r'@[0-9]+,[0-9]+,[0-9]+', arg1):
-            (h, s, v) = list(map(lambda x: int(x, 10), arg1[1:].split(',')))
+        elif len(args) == 1 and isinstance(arg1, str) and arg1.startswith('@') and parse_int3(arg1[1:]):
+            (h, s, v) = parse_int3(arg1[1:])
 
         # (num, num, num) format
         elif len(args) == 3:
@@ -280,12 +427,36 @@ class ColorHSV(Color):
             overflow or
             ((s is not None and 0 <= s <= 100) and
              (v is not None and 0 <= v <= 100))):
-            (self.h, self.s, self.v) = (h % 360, s, v)
-            self._rgb = self.to_rgb(overflow)
+            return cls.intern(h % 360, s, v)
 
         else:
             raise TypeError('Invalid HSV value: {}'.format(args))
 
+    @classmethod
+    def intern(cls, h, s, v):
+        if cls is ColorHSV:
+            return intern_hsv(h, s, v)
+        return cls.build(h, s, v)
+
+    @classmethod
+    def build(cls, h, s, v):
+        self = cls.lazy(h, s, v)
+        return self.setup_seq(self.build_seq())
+
+    @classmethod
+    def lazy(cls, h, s, v):
+        # Not interned, and without escape sequences until they are used
+        # The ColorRGB counterpart is created lazily in to_rgb()
+        return cls.create(h=h, s=s, v=v, _rgb=None)
+
+    def build_seq(self):
+        if self.h is None:
+            return ''
+        return hsv_seq(self.H, self.S, self.V)
+
+    def __reduce__(self):
+        return (self.__class__.intern, self.hsv)
+
     def __repr__(self):
         return 'ColorHSV({:}deg, {:}%, {:}%)'.format(*self.HSV)
 
@@ -309,12 +480,6 @@ class ColorHSV(Color):
     def hsv(self):
         return (self.h, self.s, self.v)
 
-    @property
-    def seq(self):
-        if None in self.hsv:
-            return ''
-        return self._rgb.seq
-
     def __add__(self, other):
         hsv = vector(self.hsv) + vector(other.hsv)
         return ColorHSV(*hsv, overflow=True)
@@ -336,15 +501,229 @@ class ColorHSV(Color):
         return format(self.hsv, spec)
 
     def to_rgb(self, overflow=False):
-        import colorsys
-        return ColorRGB(*vector(colorsys.hsv_to_rgb(
-            self.H / 360,
-            self.S / 100,
-            self.V / 100)) * 255, overflow=overflow)
+        if self._rgb is not None and not overflow:
+            return self._rgb
+
+        r, g, b = colorsys.hsv_to_rgb(self.H / 360, self.S / 100, self.V / 100)
+        ret = ColorRGB(r * 255, g * 255, b * 255, overflow=overflow)
+        if self.h is not None and not overflow:
+            object.__setattr__(self, '_rgb', ret)
+        return ret
 
     def to_hsv(self):
         return self
 
+    def to_256(self, perceptual=False):
+        return self.to_rgb().to_256(perceptual)
+
+    def to_lab(self):
+        return self.to_rgb().to_lab()
+
+    def to_oklab(self):
+        return self.to_rgb().to_oklab()
+
+
+class ColorLabBase(Color):
+    # Common parts of ColorLab and ColorOKLab
+    # The sRGB counterpart is calculated once when the object is interned
+    __slots__ = ('l', 'a', 'b', '_rgb')
+
+    L_max = None
+
+    def __new__(cls, *args, overflow=False):
+        arg1 = args[0] if len(args) else None
+
+        if not args:
+            return cls.intern(None, None, None)
+
+        # Copy ctor
+        elif len(args) == 1 and isinstance(arg1, cls):
+            return arg1
+
+        # (num, num, num) format
+        elif (len(args) == 3 and all(isinstance(x, (int, float)) for x in args) and
+                (overflow or 0 <= args[0] <= cls.L_max)):
+            return cls.intern(*args)
+
+        raise TypeError('Invalid {} value: {}'.format(cls.__name__[5:], args))
+
+    @classmethod
+    def build(cls, l, a, b):
+        self = cls.create(l=l, a=a, b=b)
+        if l is None:
+            object.__setattr__(self, '_rgb', None)
+            return self.setup_seq('')
+
+        # The ColorRGB counterpart is created lazily in to_rgb()
+        object.__setattr__(self, '_rgb', None)
+        return self.setup_seq('2;{};{};{}'.format(*cls.to_srgb(l, a, b)))
+
+    def __reduce__(self):
+        return (self.__class__.intern, self.lab)
+
+    def __repr__(self):
+        return '{}({}, {}, {})'.format(self.__class__.__name__, self.l, self.a, self.b)
+
+    @property
+    def lab(self):
+        return (self.l, self.a, self.b)
+
+    def __int__(self):
+        return int(self.to_rgb())
+
+    def to_rgb(self):
+        if self.l is None:
+            return ColorRGB()
+
+        if self._rgb is None:
+            object.__setattr__(self, '_rgb', ColorRGB(*self.to_srgb(*self.lab)))
+        return self._rgb
+
+    def to_hsv(self):
+        return self.to_rgb().to_hsv()
+
+    def to_256(self, perceptual=False):
+        return self.to_rgb().to_256(perceptual)
+
+    def to_lab(self):
+        return self.to_rgb().to_lab()
+
+    def to_oklab(self):
+        return self.to_rgb().to_oklab()
+
+
+@export
+class ColorLab(ColorLabBase):
+    # CIE L*a*b*, D65 white point
+    # L: 0 ~ 100, a and b are roughly -128 ~ 127
+    __slots__ = ()
+
+    L_max = 100
+
+    @staticmethod
+    def to_srgb(l, a, b):
+        return lab_to_srgb(l, a, b)
+
+    @classmethod
+    def intern(cls, l, a, b):
+        if cls is ColorLab:
+            return intern_lab(l, a, b)
+        return cls.build(l, a, b)
+
+    def to_lab(self):
+        return self
+
+
+@export
+class ColorOKLab(ColorLabBase):
+    # OKLab, L: 0 ~ 1, a and b are roughly -0.4 ~ 0.4
+    __slots__ = ()
+
+    L_max = 1
+
+    @staticmethod
+    def to_srgb(l, a, b):
+        return oklab_to_srgb(l, a, b)
+
+    @classmethod
+    def intern(cls, l, a, b):
+        if cls is ColorOKLab:
+            return intern_oklab(l, a, b)
+        return cls.build(l, a, b)
+
+    def to_oklab(self):
+        return self
+
+
+def hsv_seq(H, S, V):
+    r, g, b = colorsys.hsv_to_rgb(H / 360, S / 100, V / 100)
+    return '2;{};{};{}'.format(
+            clamp(0, round(r * 255), 255),
+            clamp(0, round(g * 255), 255),
+            clamp(0, round(b * 255), 255))
+
+
+def srgb_to_linear(c):
+    c = c / 255
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def linear_to_srgb(c):
+    c = 12.92 * c if c <= 0.0031308 else 1.055 * (c ** (1 / 2.4)) - 0.055
+    return clamp(0, round(c * 255), 255)
+
+
+def cbrt(x):
+    return x ** (1 / 3) if x >= 0 else -((-x) ** (1 / 3))
+
+
+def lab_f(t):
+    return cbrt(t) if t > 216 / 24389 else (t * 24389 / 27 + 16) / 116
+
+
+def lab_f_inv(t):
+    return t ** 3 if t > 6 / 29 else (116 * t - 16) * 27 / 24389
+
+
+def rgb_to_lab_uncached(R, G, B):
+    r, g, b = srgb_to_linear(R), srgb_to_linear(G), srgb_to_linear(B)
+    fx = lab_f((0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047)
+    fy = lab_f( 0.2126729 * r + 0.7151522 * g + 0.0721750 * b)
+    fz = lab_f((0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def lab_to_srgb_uncached(l, a, b):
+    fy = (l + 16) / 116
+    x = lab_f_inv(fy + a / 500) * 0.95047
+    y = lab_f_inv(fy)
+    z = lab_f_inv(fy - b / 200) * 1.08883
+    return (
+            linear_to_srgb( 3.2404542 * x - 1.5371385 * y - 0.4985314 * z),
+            linear_to_srgb(-0.9692660 * x + 1.8760108 * y + 0.0415560 * z),
+            linear_to_srgb( 0.0556434 * x - 0.2040259 * y + 1.0572252 * z),
+            )
+
+
+def rgb_to_oklab_uncached(R, G, B):
+    r, g, b = srgb_to_linear(R), srgb_to_linear(G), srgb_to_linear(B)
+    l = cbrt(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    m = cbrt(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    s = cbrt(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+    return (
+            0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+            )
+
+
+def oklab_to_srgb_uncached(L, a, b):
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return (
+            linear_to_srgb( 4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s),
+            linear_to_srgb(-1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s),
+            linear_to_srgb(-0.0041960696 * l - 0.7034186147 * m + 1.7076147010 * s),
+            )
+
+
+# Conversions of single colors are cached, batch conversions use the uncached ones
+rgb_to_lab = functools.lru_cache(maxsize=4096)(rgb_to_lab_uncached)
+lab_to_srgb = functools.lru_cache(maxsize=4096)(lab_to_srgb_uncached)
+rgb_to_oklab = functools.lru_cache(maxsize=4096)(rgb_to_oklab_uncached)
+oklab_to_srgb = functools.lru_cache(maxsize=4096)(oklab_to_srgb_uncached)
+
+
+# All Color256 objects are pre-built, and RGB/HSV objects are interned through bounded caches
+color256_table = {index: Color256.intern(index) for index in [None] + list(range(256))}
+
+intern_cache_size = 4096
+intern_rgb = functools.lru_cache(maxsize=intern_cache_size, typed=True)(ColorRGB.build)
+intern_hsv = functools.lru_cache(maxsize=intern_cache_size, typed=True)(ColorHSV.build)
+intern_lab = functools.lru_cache(maxsize=intern_cache_size, typed=True)(ColorLab.build)
+intern_oklab = functools.lru_cache(maxsize=intern_cache_size, typed=True)(ColorOKLab.build)
+
 
 @export
 class ColorCompound:
@@ -362,10 +741,13 @@ class ColorCompound:
         return 'ColorCompound(fg={fg}, bg={bg})'.format(fg=self.fg, bg=self.bg)
 
     def __call__(self, s=''):
-        return s if not self.seq else f'{self.seq}{s}\033[m'
+        seq = self.seq if color_profile == 'truecolor' else profile_compound_seq(self.seq)
+        return s if not seq else seq + str(s) + '\033[m'
 
     def __str__(self):
-        return self.seq or '\033[m'
+        if color_profile == 'none':
+            return ''
+        return profile_compound_seq(self.seq) or '\033[m'
 
     def __or__(self, other):
         fg = other.fg if other.fg.seq else self.fg
@@ -390,134 +772,902 @@ def paint(fg=None, bg=None):
 export('nocolor')
 nocolor = color()
 
-named_colors = [
-        (0, ('black',)),
-        (1, ('maroon',)),
-        (2, ('green',)),
-        (3, ('olive',)),
-        (4, ('navy',)),
-        (5, ('purple',)),
-        (6, ('teal',)),
-        (7, ('silver',)),
-        (8, ('gray', 'grey',)),
-        (9, ('red',)),
-        (10, ('lime',)),
-        (11, ('yellow',)),
-        (12, ('blue',)),
-        (13, ('fuchsia', 'magenta',)),
-        (14, ('aqua', 'cyan',)),
-        (15, ('aliceblue', 'azure', 'floralwhite', 'ghostwhite', 'ivory',
-              'lavenderblush', 'mintcream', 'snow', 'white',)),
-        (17, ('midnightblue',)),
-        (18, ('darkblue',)),
-        (20, ('mediumblue',)),
-        (22, ('darkgreen',)),
-        (28, ('forestgreen',)),
-        (29, ('seagreen',)),
-        (30, ('darkcyan',)),
-        (33, ('dodgerblue',)),
-        (37, ('lightseagreen',)),
-        (39, ('deepskyblue',)),
-        (44, ('darkturquoise',)),
-        (48, ('mediumspringgreen', 'springgreen',)),
-        (54, ('indigo',)),
-        (60, ('darkslateblue',)),
-        (62, ('royalblue', 'slateblue',)),
-        (64, ('olivedrab',)),
-        (66, ('slategray', 'slategrey',)),
-        (67, ('steelblue',)),
-        (69, ('cornflowerblue',)),
-        (71, ('mediumseagreen',)),
-        (73, ('cadetblue',)),
-        (77, ('limegreen',)),
-        (79, ('mediumaquamarine',)),
-        (80, ('mediumturquoise', 'turquoise',)),
-        (88, ('darkred',)),
-        (90, ('darkmagenta',)),
-        (92, ('blueviolet', 'darkviolet',)),
-        (94, ('saddlebrown',)),
-        (98, ('darkorchid', 'mediumpurple',)),
-        (99, ('mediumslateblue',)),
-        (102, ('lightslategray', 'lightslategrey',)),
-        (108, ('darkseagreen',)),
-        (113, ('yellowgreen',)),
-        (117, ('lightskyblue', 'skyblue',)),
-        (118, ('chartreuse', 'lawngreen',)),
-        (120, ('lightgreen', 'palegreen',)),
-        (122, ('aquamarine',)),
-        (124, ('brown', 'firebrick',)),
-        (130, ('sienna',)),
-        (134, ('mediumorchid',)),
-        (135, ('murasaki',)),
-        (136, ('darkgoldenrod',)),
-        (138, ('rosybrown',)),
-        (143, ('darkkhaki',)),
-        (152, ('lightblue', 'lightsteelblue', 'powderblue',)),
-        (154, ('greenyellow',)),
-        (159, ('paleturquoise',)),
-        (161, ('crimson',)),
-        (162, ('mediumvioletred',)),
-        (166, ('chocolate', 'clementine',)),
-        (167, ('indianred',)),
-        (168, ('palevioletred',)),
-        (170, ('orchid',)),
-        (173, ('peru',)),
-        (174, ('darksalmon',)),
-        (178, ('goldenrod',)),
-        (180, ('burlywood', 'tan',)),
-        (182, ('plum', 'thistle',)),
-        (195, ('lightcyan',)),
-        (198, ('deeppink',)),
-        (202, ('orangered',)),
-        (203, ('tomato',)),
-        (205, ('hotpink',)),
-        (208, ('darkorange',)),
-        (209, ('coral', 'salmon',)),
-        (210, ('lightcoral',)),
-        (213, ('violet',)),
-        (214, ('orange',)),
-        (215, ('sandybrown',)),
-        (216, ('lightsalmon',)),
-        (217, ('lightpink',)),
-        (218, ('pink',)),
-        (220, ('gold',)),
-        (222, ('khaki',)),
-        (223, ('moccasin', 'navajowhite', 'palegoldenrod',
-               'peachpuff', 'wheat',)),
-        (224, ('bisque', 'mistyrose',)),
-        (230, ('antiquewhite', 'beige', 'blanchedalmond',
-               'cornsilk', 'lemonchiffon',
-               'lightgoldenrodyellow', 'lightyellow',
-               'oldlace', 'papayawhip',)),
-        (238, ('darkslategray', 'darkslategrey',)),
-        (239, ('darkolivegreen',)),
-        (242, ('dimgray', 'dimgrey',)),
-        (248, ('darkgray', 'darkgrey',)),
-        (252, ('lightgray', 'lightgrey',)),
-        (253, ('gainsboro',)),
-        (255, ('honeydew', 'lavender', 'linen', 'seashell', 'whitesmoke',)),
-]
+# (index, names) pairs, see scripts/gen_color_table.py
+named_colors = color_table.names
+
+
+@export
+class ColorRegistry:
+    # Named colors, indexed for name lookup, reverse lookup, and spelling suggestions
+    def __init__(self):
+        self.table = {}
+        self.reverse = {}
+        self.trigram_index = None
+        self.pending = []
+
+    @staticmethod
+    def trigrams(word):
+        word = '  ' + word + ' '
+        return set(word[i:i+3] for i in range(len(word) - 2))
+
+    @staticmethod
+    def is_valid_name(name):
+        # Names must not be confused with other color specs
+        return (isinstance(name, str) and name and
+                not name.isdigit() and
+                not parse_hex6(name) and
+                name[0] not in '#@' and
+                '.' not in name and
+                not any(c.isspace() for c in name))
+
+    def register(self, name, clr):
+        clr = self.insert(name, clr)
+        parse_color_spec.cache_clear()
+        return clr
+
+    def insert(self, name, clr):
+        # register() without clearing the color spec cache, for callers that add names in bulk
+        if not self.is_valid_name(name):
+            raise ValueError('Invalid color name: {}'.format(repr(name)))
+
+        clr = color(clr)
+
+        if name in self.table:
+            self.remove(name)
+
+        self.table[name] = clr
+        self.reverse.setdefault(clr, []).append(name)
+        if self.trigram_index is not None:
+            self.index_trigrams(name)
+
+        return clr
+
+    def index_trigrams(self, name):
+        for gram in self.trigrams(name):
+            self.trigram_index.setdefault(gram, set()).add(name)
+
+    def merge(self, other, override=True):
+        # Merge names from another registry or a {name: color} mapping
+        if isinstance(other, ColorRegistry):
+            other.load_pending()
+            other = other.table
+
+        try:
+            for name, clr in other.items():
+                if override or name not in self.table:
+                    self.insert(name, clr)
+        finally:
+            parse_color_spec.cache_clear()
+
+    def register_palette(self, path, format=None, lazy=True):
+        # Lazy palettes are loaded on the first lookup
+        self.pending.append((path, format))
+        parse_color_spec.cache_clear()
+        if not lazy:
+            self.load_pending()
+
+    def load_pending(self):
+        while self.pending:
+            path, format = self.pending.pop(0)
+            self.merge(load_palette(path, format=format))
+
+    def unregister(self, name):
+        self.load_pending()
+        self.remove(name)
+        parse_color_spec.cache_clear()
+
+    def remove(self, name):
+        clr = self.table.pop(name)
+        self.reverse[clr].remove(name)
+        if not self.reverse[clr]:
+            del self.reverse[clr]
+        if self.trigram_index is not None:
+            for gram in self.trigrams(name):
+                self.trigram_index[gram].discard(name)
+
+    def __contains__(self, name):
+        self.load_pending()
+        return name in self.table
+
+    def __getitem__(self, name):
+        self.load_pending()
+        return self.table[name]
+
+    def __iter__(self):
+        self.load_pending()
+        return iter(self.table)
+
+    def __len__(self):
+        self.load_pending()
+        return len(self.table)
+
+    def get(self, name, default=None):
+        self.load_pending()
+        return self.table.get(name, default)
+
+    def names_of(self, clr):
+        self.load_pending()
+        return tuple(self.reverse.get(color(clr), ()))
+
+    def suggest(self, word, n=3):
+        # Candidates share the most trigrams with word, then ranked by difflib
+        import difflib
+        import collections
+
+        self.load_pending()
+        if self.trigram_index is None:
+            # Built on first use, so registering names stays cheap
+            self.trigram_index = {}
+            for name in self.table:
+                self.index_trigrams(name)
+
+        counter = collections.Counter()
+        for gram in self.trigrams(word):
+            counter.update(self.trigram_index.get(gram, ()))
+
+        candidates = [name for name, count in counter.most_common(max(n * 10, 30))]
+        return difflib.get_close_matches(word, candidates or list(self.table), n=n, cutoff=0)
+
+
+export('color_registry')
+color_registry = ColorRegistry()
+
+
+def palette_value(value):
+    # A palette entry value in cacheable form: int for Color256, (R, G, B) for others
+    if isinstance(value, list) and len(value) == 3:
+        value = tuple(value)
+
+    if isinstance(value, str):
+        clr = parse_color_spec(value)
+    elif isinstance(value, (int, tuple)):
+        try:
+            clr = color(*value) if isinstance(value, tuple) else color(value)
+        except TypeError:
+            clr = None
+    else:
+        clr = None
+
+    if clr is None or not clr.seq:
+        raise ValueError('Invalid color: {}'.format(repr(value)))
+
+    if isinstance(clr, Color256):
+        return clr.index
+    return clr.to_rgb().RGB
+
+
+def parse_palette_json(f):
+    import json
+    data = json.load(f)
+
+    # {"name": color, ...} or [{"name": name, "color": color}, ...]
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        try:
+            items = [(entry['name'], entry['color']) for entry in data]
+        except (KeyError, TypeError):
+            raise ValueError('Invalid palette: entries should be {"name": ..., "color": ...}')
+    else:
+        raise ValueError('Invalid palette: {}'.format(type(data).__name__))
+
+    return tuple((name, palette_value(value)) for name, value in items)
+
+
+def parse_palette_csv(f):
+    import csv
+    ret = []
+    for lineno, row in enumerate(csv.reader(f), 1):
+        row = [cell.strip() for cell in row]
+        if not row or not row[0]:
+            continue
+
+        # name,#RRGGBB / name,index / name,R,G,B
+        value = row[1] if len(row) == 2 else tuple(row[1:4])
+        try:
+            if isinstance(value, tuple):
+                value = tuple(int(x) for x in value)
+            elif value.isdigit():
+                value = int(value)
+            ret.append((row[0], palette_value(value)))
+        except ValueError:
+            if lineno == 1:
+                # Header
+                continue
+            raise ValueError('Invalid palette entry at line {}: {}'.format(lineno, row))
+
+    return tuple(ret)
+
+
+def parse_palette_rgb_txt(f):
+    # X11 rgb.txt: "R G B name with spaces", comments start with "!"
+    ret = []
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line.startswith('!'):
+            continue
+
+        tokens = line.split()
+        try:
+            rgb = tuple(int(x) for x in tokens[:3])
+            name = ''.join(tokens[3:]).lower()
+            if not name or len(rgb) != 3:
+                raise ValueError
+            ret.append((name, palette_value(rgb)))
+        except ValueError:
+            raise ValueError('Invalid palette entry at line {}: {}'.format(lineno, line))
+
+    return tuple(ret)
+
+
+palette_parsers = {
+        'json': parse_palette_json,
+        'csv': parse_palette_csv,
+        'rgb.txt': parse_palette_rgb_txt,
+        }
+
+
+def palette_format(path, format):
+    if format is None:
+        lower = path.lower()
+        format = ('json' if lower.endswith('.json') else
+                  'csv' if lower.endswith('.csv') else
+                  'rgb.txt')
+
+    if format not in palette_parsers:
+        raise ValueError('Unknown palette format: {}'.format(format))
+
+    return format
+
+
+def palette_cache_path(path):
+    import os
+    import hashlib
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(cache_home, 'warawara', 'palettes', digest + '.marshal')
+
+
+# Parsed palettes in this process, {abspath: (key, entries)}
+palette_memo = {}
+
+
+def load_palette_entries(path, format=None, cache=True):
+    # Parsed entries are cached in memory and in a marshal file,
+    # both are keyed by the mtime and the size of the palette file
+    import os
+    import marshal
+
+    format = palette_format(path, format)
+    st = os.stat(path)
+    key = (marshal.version, st.st_mtime_ns, st.st_size, format)
+    abspath = os.path.abspath(path)
+
+    memo = palette_memo.get(abspath)
+    if memo and memo[0] == key:
+        return memo[1]
+
+    cache_path = palette_cache_path(path) if cache else None
+    entries = None
+    if cache_path:
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, cached_entries = marshal.load(f)
+            if cached_key == key:
+                entries = cached_entries
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    if entries is None:
+        with open(path, encoding='utf-8', newline='' if format == 'csv' else None) as f:
+            entries = palette_parsers[format](f)
+
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = cache_path + '.{}.tmp'.format(os.getpid())
+                with open(tmp_path, 'wb') as f:
+                    marshal.dump((key, entries), f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+
+    palette_memo[abspath] = (key, entries)
+    return entries
+
+
+@export
+def load_palette(path, format=None, cache=True):
+    registry = ColorRegistry()
+    for name, value in load_palette_entries(path, format=format, cache=cache):
+        registry.insert(name, value if isinstance(value, int) else ColorRGB(*value))
+    return registry
+
 export('names')
 names = tuple(name for index, names in named_colors for name in names)
+name_table = color_registry.table
 def _setup_named_colors():
     for index, names in named_colors:
-        clr = color(index)
+        clr = color256_table[index]
         for name in names:
+            color_registry.insert(name, clr)
             globals()[name] = clr
             export(name)
 _setup_named_colors()
 del _setup_named_colors
 
 
-decolor_regex = re.compile('\033' + r'\[[\d;]*m')
+def flat_components(data):
+    # Flatten data into a flat list of components
+    # Accepts buffer-protocol objects (array, bytes, numpy array, ...),
+    # flat sequences, and sequences of triples
+    try:
+        data = memoryview(data).tolist()
+    except TypeError:
+        pass
+
+    if not isinstance(data, list):
+        data = list(data)
+
+    if data and not isinstance(data[0], (int, float)):
+        data = list(itertools.chain.from_iterable(data))
+
+    if len(data) % 3:
+        raise ValueError('Length of data is not a multiple of 3: {}'.format(len(data)))
+
+    return data
+
+
+@export
+def rgb_to_hsv_array(data):
+    import array
+
+    rgb_to_hsv = colorsys.rgb_to_hsv
+    cache = {}
+    ret = []
+    append = ret.extend
+
+    it = iter(flat_components(data))
+    for rgb in zip(it, it, it):
+        hsv = cache.get(rgb)
+        if hsv is None:
+            h, s, v = rgb_to_hsv(rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+            hsv = cache[rgb] = (h * 360, s * 100, v * 100)
+        append(hsv)
+
+    return array.array('d', ret)
+
+
+@export
+def hsv_to_rgb_array(data):
+    import array
+
+    hsv_to_rgb = colorsys.hsv_to_rgb
+    cache = {}
+    ret = []
+    append = ret.extend
+
+    it = iter(flat_components(data))
+    for hsv in zip(it, it, it):
+        rgb = cache.get(hsv)
+        if rgb is None:
+            r, g, b = hsv_to_rgb((hsv[0] % 360) / 360, hsv[1] / 100, hsv[2] / 100)
+            rgb = cache[hsv] = (
+                    min(max(round(r * 255), 0), 255),
+                    min(max(round(g * 255), 0), 255),
+                    min(max(round(b * 255), 0), 255))
+        append(rgb)
+
+    return array.array('B', ret)
+
+
+@export
+def color256_to_rgb_array(data):
+    import array
+
+    table = color256_rgb_table()
+    try:
+        indices = memoryview(data).tolist()
+    except TypeError:
+        indices = data
+
+    return array.array('B', b''.join([table[i] for i in indices]))
+
+
+@functools.lru_cache(maxsize=1)
+def color256_rgb_table():
+    return tuple(bytes(rgb) for rgb in color_table.rgb)
+
+
+# Precomputed index for nearest xterm 256 color lookup
+# Only the 6x6x6 cube (16 ~ 231) and the grayscale ramp (232 ~ 255) are searched,
+# because the first 16 colors are usually customized by terminal palettes
+cube_levels = (0, 95, 135, 175, 215, 255)
+cube_nearest = color_table.cube_nearest
+gray_nearest = color_table.gray_nearest
+
+
+def color_distance(rgb1, rgb2, perceptual=False):
+    dr = rgb1[0] - rgb2[0]
+    dg = rgb1[1] - rgb2[1]
+    db = rgb1[2] - rgb2[2]
+    if not perceptual:
+        return dr * dr + dg * dg + db * db
+
+    # "redmean" weighted distance
+    rmean = (rgb1[0] + rgb2[0]) / 2
+    return (2 + rmean / 256) * dr * dr + 4 * dg * dg + (2 + (255 - rmean) / 256) * db * db
+
+
+@functools.lru_cache(maxsize=4096)
+def nearest_color256(r, g, b, perceptual=False):
+    rgb = (r, g, b)
+    gray = gray_nearest[(r + g + b + 1) // 3]
+
+    if not perceptual:
+        # Euclidean distance is separable in each channel,
+        # so the nearest levels in each channel form the nearest cube color
+        candidates = [(cube_nearest[r][0], cube_nearest[g][0], cube_nearest[b][0])]
+    else:
+        candidates = itertools.product(cube_nearest[r], cube_nearest[g], cube_nearest[b])
+
+    best = None
+    for ri, gi, bi in candidates:
+        d = color_distance(rgb, (cube_levels[ri], cube_levels[gi], cube_levels[bi]), perceptual)
+        if best is None or d < best[0]:
+            best = (d, 16 + ri * 36 + gi * 6 + bi)
+
+    for i in gray:
+        level = 8 + 10 * i
+        d = color_distance(rgb, (level, level, level), perceptual)
+        if d < best[0]:
+            best = (d, 232 + i)
+
+    return best[1]
+
+
+@export
+def rgb_to_256_array(data, perceptual=False):
+    import array
+
+    cache = {}
+    ret = array.array('B')
+    append = ret.append
+
+    it = iter(flat_components(data))
+    for rgb in zip(it, it, it):
+        index = cache.get(rgb)
+        if index is None:
+            index = cache[rgb] = nearest_color256(
+                    min(max(round(rgb[0]), 0), 255),
+                    min(max(round(rgb[1]), 0), 255),
+                    min(max(round(rgb[2]), 0), 255),
+                    perceptual)
+        append(index)
+
+    return ret
+
+
+# CSI sequences (SGR, cursor movement, erasing, ...) and
+# OSC sequences (window title, hyperlinks, ...) terminated by BEL or ST
+decolor_regex = re.compile('\033' + r'(?:\[[0-?]*[ -/]*[@-~]|\][^\007\033]*(?:\007|\033\\))')
 
 @export
 def decolor(s):
+    if '\033' not in s:
+        return s
     return decolor_regex.sub('', s)
 
 
 @export
-def gradient(A, B, N=None, reverse=False, clockwise=None):
+class Colorizer:
+    # Highlights regex matches with styles, all rules are matched in one combined regex pass
+    # At the same position, the earlier rule wins
+    def __init__(self, rules=(), flags=0):
+        self.rules = []
+        self.flags = flags
+        self.compiled = {}
+
+        for pattern, style in (rules.items() if isinstance(rules, dict) else rules):
+            self.add(pattern, style)
+
+    @staticmethod
+    def style_of(style):
+        # 'fg', 'fg/bg', or '/bg' for string specs
+        if isinstance(style, (Color, ColorCompound)):
+            return style
+
+        if isinstance(style, str) and '/' in style:
+            fg, bg = style.split('/', 1)
+            return paint(fg=fg or None, bg=bg or None)
+
+        return color(style)
+
+    # Escapes are skipped in pairs, so an escaped backslash is not taken as the start of \1
+    backref_regex = re.compile(r'\\(?:[1-9]|.)|\(\?\(\d', re.S)
+
+    def add(self, pattern, style):
+        # Rules are combined into one regex, so global inline flags like (?i) are not allowed,
+        # and numbered backreferences would refer to other groups
+        pattern = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+        if not isinstance(pattern, str):
+            raise TypeError('Pattern should be str: {}'.format(repr(pattern)))
+
+        for m in self.backref_regex.finditer(pattern):
+            if m.group()[1:2].isdigit() or m.group().startswith('(?('):
+                raise ValueError('Numbered backreferences are not supported, '
+                                 'use (?P<name>...) and (?P=name) instead: {}'.format(repr(pattern)))
+
+        re.compile('x|({})'.format(pattern), self.flags)
+        self.rules.append((pattern, self.style_of(style)))
+        self.compiled.clear()
+
+    def compile(self):
+        # A function that colorizes a str, or None if nothing would be colored
+        # Escape sequences follow the color profile at the time of compilation
+        key = color_profile
+        if key in self.compiled:
+            return self.compiled[key]
+
+        if not self.rules or color_profile == 'none':
+            self.compiled[key] = None
+            return None
+
+        seqs = [None]
+        for pattern, style in self.rules:
+            # The outer group of each rule is the last matched group, which is m.lastindex
+            seqs += [style('\0').partition('\0')[::2]] + [None] * re.compile(pattern, self.flags).groups
+
+        regex = re.compile('|'.join('({})'.format(pattern) for pattern, style in self.rules), self.flags)
+
+        def replace(m):
+            pre, post = seqs[m.lastindex]
+            text = m.group()
+            return pre + text + post if text else text
+
+        def colorize(data):
+            return regex.sub(replace, data)
+
+        self.compiled[key] = colorize
+
+        chars = first_chars(regex)
+        if not chars:
+            return colorize
+
+        # Re-trying the combined regex at every position is slow,
+        # so only positions that could start a match are tried
+        scanner = re.compile('[{}]'.format(''.join(map(re.escape, chars))))
+        match = regex.match
+
+        def colorize_sparse(data):
+            if len(scanner.findall(data, 0, 4096)) > 256:
+                return colorize(data)
+
+            ret = []
+            last = 0
+            for m in scanner.finditer(data):
+                start = m.start()
+                if start < last:
+                    continue
+
+                m = match(data, start)
+                if m is None or m.end() == start:
+                    continue
+
+                pre, post = seqs[m.lastindex]
+                ret += (data[last:start], pre, m.group(), post)
+                last = m.end()
+
+            if not ret:
+                return data
+
+            ret.append(data[last:])
+            return ''.join(ret)
+
+        self.compiled[key] = colorize_sparse
+        return colorize_sparse
+
+    def colorize(self, data):
+        # str or bytes in, the same type out
+        # Bytes are matched as UTF-8 text, undecodable bytes are passed through unchanged
+        colorize = self.compile()
+        if not colorize or not data:
+            return data
+
+        if isinstance(data, (bytes, bytearray)):
+            return colorize(data.decode('utf-8', 'surrogateescape')).encode('utf-8', 'surrogateescape')
+
+        return colorize(data)
+
+    __call__ = colorize
+
+    def stream(self, infile, outfile, chunk_size=1 << 20):
+        # Colorize infile to outfile in chunks, cut at line boundaries, so matches can't span lines
+        # Text files are accessed through their underlying binary buffers
+        infile = getattr(infile, 'buffer', infile)
+        if hasattr(outfile, 'buffer'):
+            outfile.flush()
+            outfile = outfile.buffer
+
+        # read1() returns what's available, so a slowly growing log is not held back
+        read = getattr(infile, 'read1', infile.read)
+        colorize = self.colorize
+
+        rest = b''
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                break
+
+            if rest:
+                chunk = rest + chunk
+
+            cut = chunk.rfind(b'\n') + 1
+            if not cut:
+                if len(chunk) < chunk_size:
+                    rest = chunk
+                    continue
+
+                # A long line, cut it before a UTF-8 continuation byte
+                cut = len(chunk)
+                while cut > len(chunk) - 4 and chunk[cut - 1] & 0xC0 == 0x80:
+                    cut -= 1
+                if chunk[cut - 1] & 0xC0 == 0xC0:
+                    cut -= 1
+                else:
+                    cut = len(chunk)
+
+            outfile.write(colorize(chunk[:cut]))
+            outfile.flush()
+            rest = chunk[cut:]
+
+        if rest:
+            outfile.write(colorize(rest))
+        outfile.flush()
+
+
+sgr_regex = re.compile('\033' + r'\[([\d;]*)m')
+
+# Terminal state: (foreground, background, other attributes)
+sgr_empty = ('', '', frozenset())
+
+
+@functools.lru_cache(maxsize=1024)
+def sgr_state(seq):
+    # Parse SGR sequence(s) into the terminal state they lead to
+    fg, bg, attrs = '', '', set()
+    for params in sgr_regex.findall(seq):
+        tokens = params.split(';') if params else ['0']
+        i = 0
+        while i < len(tokens):
+            t = tokens[i]
+            if t in ('', '0'):
+                fg, bg = '', ''
+                attrs.clear()
+            elif t in ('38', '48'):
+                n = 3 if tokens[i + 1:i + 2] == ['5'] else 5
+                value = ';'.join(tokens[i:i + n])
+                i += n - 1
+                if t == '38':
+                    fg = value
+                else:
+                    bg = value
+            elif t == '39':
+                fg = ''
+            elif t == '49':
+                bg = ''
+            elif t.isdigit() and (30 <= int(t) <= 37 or 90 <= int(t) <= 97):
+                fg = t
+            elif t.isdigit() and (40 <= int(t) <= 47 or 100 <= int(t) <= 107):
+                bg = t
+            else:
+                attrs.add(t)
+            i += 1
+
+    return (fg, bg, frozenset(attrs))
+
+
+def sgr_seq(state):
+    # The canonical escape sequence of a terminal state
+    if state == sgr_empty:
+        return ''
+    fg, bg, attrs = state
+    return '\033[' + ';'.join(sorted(attrs) + [p for p in (fg, bg) if p]) + 'm'
+
+
+def style_state(style):
+    if not style:
+        return sgr_empty
+    if isinstance(style, Color):
+        return ('38;' + style.seq, '', frozenset()) if style.seq else sgr_empty
+    if isinstance(style, ColorCompound):
+        return sgr_state(style.seq)
+    return sgr_state(style)
+
+
+def sgr_transition(cur, new):
+    # The shortest escape sequence that moves the terminal from state cur to new
+    if new == sgr_empty:
+        return '\033[m'
+
+    reset = '\033[0;' + sgr_seq(new)[2:]
+    fg, bg, attrs = new
+
+    # Attributes could only be turned off by a reset
+    if cur[2] - attrs:
+        return reset
+
+    params = sorted(attrs - cur[2])
+    if fg != cur[0]:
+        params.append(fg or '39')
+    if bg != cur[1]:
+        params.append(bg or '49')
+
+    return min('\033[' + ';'.join(params) + 'm', reset, key=len)
+
+
+@export
+def render(runs):
+    # Render (style, text) runs, only emits escapes when the style changes
+    profile = color_profile
+    if profile == 'none':
+        return ''.join(text for style, text in runs)
+
+    ret = []
+    cur = sgr_empty
+    for style, text in runs:
+        if not text:
+            continue
+
+        new = style_state(style)
+        if profile != 'truecolor':
+            new = downgrade_state(new, profile)
+        if new != cur:
+            ret.append(sgr_transition(cur, new))
+            cur = new
+        ret.append(text)
+
+    if cur != sgr_empty:
+        ret.append('\033[m')
+
+    return ''.join(ret)
+
+
+# Color profiles: what the terminal supports
+color_profiles = ('truecolor', '256', '16', 'none')
+color_profile = 'truecolor'
+
+
+@export
+@functools.lru_cache(maxsize=1)
+def detect_color_profile():
+    # Detect the color profile of stdout from the environment, only once
+    import os
+    import sys
+
+    env = os.environ
+    if env.get('NO_COLOR'):
+        return 'none'
+
+    force = env.get('FORCE_COLOR')
+    if force is not None:
+        return {'0': 'none', 'false': 'none', '1': '16', '2': '256'}.get(force.lower(), 'truecolor')
+
+    try:
+        if not sys.stdout.isatty():
+            return 'none'
+    except (AttributeError, ValueError):
+        return 'none'
+
+    term = env.get('TERM', '')
+    if term == 'dumb':
+        return 'none'
+
+    if env.get('COLORTERM', '').lower() in ('truecolor', '24bit') or 'direct' in term:
+        return 'truecolor'
+
+    if '256' in term:
+        return '256'
+
+    # Including an unset TERM
+    return '16'
+
+
+@export
+def get_color_profile():
+    return color_profile
+
+
+@export
+def set_color_profile(profile):
+    # Colors render with their precomputed truecolor escapes,
+    # other profiles look up downgraded escapes when rendering
+    global color_profile
+
+    if profile == 'auto':
+        profile = detect_color_profile()
+
+    if profile not in color_profiles:
+        raise ValueError('Invalid color profile: {}'.format(profile))
+
+    color_profile = profile
+    return profile
+
+
+def profile_seqs(clr):
+    # (fg, bg) escapes of clr in the current color profile
+    if color_profile == 'truecolor':
+        return clr._fg_seq, clr._bg_seq
+    if color_profile == 'none':
+        return '', ''
+    return downgrade_seqs(clr, color_profile)
+
+
+def profile_compound_seq(seq):
+    if color_profile == 'truecolor' or not seq:
+        return seq
+    if color_profile == 'none':
+        return ''
+    return sgr_seq(downgrade_state(sgr_state(seq), color_profile))
+
+
+@functools.lru_cache(maxsize=1)
+def color16_rgb_table():
+    return tuple(Color256(i).to_rgb().RGB for i in range(16))
+
+
+@functools.lru_cache(maxsize=4096)
+def nearest_color16(r, g, b):
+    rgb = (r, g, b)
+    table = color16_rgb_table()
+    return min(range(16), key=lambda i: color_distance(rgb, table[i]))
+
+
+@functools.lru_cache(maxsize=4096)
+def downgrade_params(c, profile):
+    # SGR parameters of a color under the profile, as (fg, bg)
+    if not c.seq:
+        return ('', '')
+
+    if profile == '256':
+        c = c if isinstance(c, Color256) else c.to_256()
+        return ('38;' + c.seq, '48;' + c.seq)
+
+    index = c.index if isinstance(c, Color256) and c.index < 16 else nearest_color16(*c.to_rgb().RGB)
+    if index < 8:
+        return (str(30 + index), str(40 + index))
+    return (str(90 + index - 8), str(100 + index - 8))
+
+
+@functools.lru_cache(maxsize=4096)
+def downgrade_seqs(c, profile):
+    return tuple('\033[' + p + 'm' if p else '' for p in downgrade_params(c, profile))
+
+
+def params_color(params):
+    # '38;5;N' or '38;2;R;G;B' into a Color, None for others
+    tokens = params.split(';')
+    if len(tokens) == 3 and tokens[1] == '5':
+        return Color256(int(tokens[2]))
+    if len(tokens) == 5 and tokens[1] == '2':
+        return ColorRGB(*(int(t) for t in tokens[2:]))
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def downgrade_state(state, profile):
+    fg, bg, attrs = state
+    c = fg and params_color(fg)
+    if c:
+        fg = downgrade_params(c, profile)[0]
+    c = bg and params_color(bg)
+    if c:
+        bg = downgrade_params(c, profile)[1]
+    return (fg, bg, attrs)
+
+
+@export
+def gradient(A, B, N=None, reverse=False, clockwise=None, space=None):
     if not isinstance(A, Color) or not isinstance(B, Color):
         raise TypeError('Can only calculate gradient() on Color objects')
 
@@ -528,7 +1678,10 @@ def gradient(A, B, N=None, reverse=False, clockwise=None):
         raise ValueError('N={} is too small'.format(N))
 
     ret = None
-    if N == 2:
+    if space is not None:
+        ret = gradient_space(A, B, N, space=space, clockwise=clockwise)
+
+    elif N == 2:
         ret = (A, B)
 
     elif isinstance(A, Color256) and isinstance(B, Color256):
@@ -569,29 +1722,23 @@ def gradient_color256_grayscale_range(A, B, N=None):
 def gradient_color256_rgb_range(A, B, N=None):
     def color_to_rgb6(p):
         c = int(p) - 16
-        r = c // 36
-        g = (c % 36) // 6
-        b = c % 6
-        return vector(r, g, b)
-
-    def rgb6_to_color(rgb6):
-        return Color256(rgb6[0] * 36 + rgb6[1] * 6 + rgb6[2] + 16)
+        return (c // 36, (c % 36) // 6, c % 6)
 
     rgb_a = color_to_rgb6(A)
     rgb_b = color_to_rgb6(B)
 
-    delta = rgb_b - rgb_a
+    delta = tuple(b - a for a, b in zip(rgb_a, rgb_b))
     cont_step_count = max(abs(d) for d in delta)
 
     if N is None or N > cont_step_count:
         # N >= minimum contiguous path
-        steps = []
-        for n in range(cont_step_count):
-            step = delta.map(sgn)
-            steps.append(step)
-            delta = delta.map(lambda x: x - sgn(x))
-
-        ret = resample(list(itertools.accumulate([rgb_a] + steps)), N)
+        # Each channel walks one level per step until it arrives
+        (ra, ga, ba), (dr, dg, db) = rgb_a, delta
+        sr, sg, sb = sgn(dr), sgn(dg), sgn(db)
+        dr, dg, db = abs(dr), abs(dg), abs(db)
+        path = [(ra + sr * min(k, dr), ga + sg * min(k, dg), ba + sb * min(k, db))
+                for k in range(cont_step_count + 1)]
+        ret = resample(path, N)
 
     else:
         # N is shorter than minimum contiguous path
@@ -601,13 +1748,13 @@ def gradient_color256_rgb_range(A, B, N=None):
                 resample(interval(rgb_a[2], rgb_b[2]), N),
                 )
 
-    return tuple(rgb6_to_color(i) for i in ret)
+    return tuple(Color256(r * 36 + g * 6 + b + 16) for r, g, b in ret)
 
 
 def gradient_rgb(A, B, N):
     # Calculate gradient in RGB
-    a = vector(A.rgb)
-    b = vector(B.rgb)
+    a = A.rgb
+    b = B.rgb
     if N is None:
         import math
         dist_r = math.ceil(abs(a[0] - b[0]) // 40)
@@ -615,17 +1762,22 @@ def gradient_rgb(A, B, N):
         dist_b = math.ceil(abs(a[2] - b[2]) // 40)
         N = max(dist_r, dist_g, dist_b)
 
-    ret = [A]
-    for t in (i / (N - 1) for i in range(1, N - 1)):
-        ret.append(ColorRGB(*tuple(lerp(a, b, t))))
-    ret.append(B)
+    if N < 3:
+        return (A, B)
+
+    # Steps between valid colors are valid, skip the argument checks in ColorRGB()
+    # Steps of a gradient longer than the intern cache would only churn it, they are lazy instead
+    make = ColorRGB.intern if N <= intern_cache_size else ColorRGB.lazy
+    ret = [make(*c) for c in gradient_steps(a, b, N)]
+    ret[0] = A
+    ret[-1] = B
     return tuple(ret)
 
 
 def gradient_hsv(A, B, N, clockwise):
     # Calculate gradient in HSV
-    a = vector(A.hsv)
-    b = vector(B.hsv)
+    a = list(A.hsv)
+    b = list(B.hsv)
 
     if clockwise == True:
         b[0] += 360 if (a[0] > b[0]) else 0
@@ -639,11 +1791,236 @@ def gradient_hsv(A, B, N, clockwise):
         dist_val = math.floor(abs(a[2] - b[2]) / 10)
         N = max(dist_hue, dist_sat, dist_val)
 
-    ret = [A]
-    for t in (i / (N - 1) for i in range(1, N - 1)):
-        c = lerp(a, b, t)
-        ret.append(ColorHSV(*c))
-
-    ret.append(B)
+    if N < 3:
+        return (A, B)
 
+    make = ColorHSV.intern if N <= intern_cache_size else ColorHSV.lazy
+    ret = [make(h % 360, s, v) for h, s, v in gradient_steps(a, b, N)]
+    ret[0] = A
+    ret[-1] = B
     return tuple(ret)
+
+
+# Gradient in a specific color space:
+# coordinates of both ends are interpolated component-wise,
+# hue components (index) are unwrapped according to "clockwise" first
+gradient_spaces = {
+        # space: (hue index, default step distance)
+        'rgb': (None, 40),
+        'hsv': (0, 30),
+        'lab': (None, 10),
+        'oklab': (None, 0.1),
+        'lch': (2, 10),
+        'oklch': (2, 0.1),
+        }
+
+
+def lab_to_lch(lab):
+    import math
+    l, a, b = lab
+    return (l, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360)
+
+
+def lch_to_lab(lch):
+    import math
+    l, c, h = lch
+    h = math.radians(h)
+    return (l, c * math.cos(h), c * math.sin(h))
+
+
+def gradient_coords(A, B, space, clockwise):
+    if space not in gradient_spaces:
+        raise ValueError('Unknown color space: {}'.format(space))
+
+    if space == 'rgb':
+        a, b = list(A.to_rgb().RGB), list(B.to_rgb().RGB)
+    elif space == 'hsv':
+        a, b = list(A.to_hsv().HSV), list(B.to_hsv().HSV)
+    elif space in ('lab', 'lch'):
+        a, b = list(A.to_lab().lab), list(B.to_lab().lab)
+    else:
+        a, b = list(A.to_oklab().lab), list(B.to_oklab().lab)
+
+    if space in ('lch', 'oklch'):
+        a, b = list(lab_to_lch(a)), list(lab_to_lch(b))
+
+        # Hue of a grayscale color is meaningless, follow the other end
+        epsilon = 1e-4 if space == 'oklch' else 1e-2
+        if a[1] < epsilon:
+            a[2] = b[2]
+        if b[1] < epsilon:
+            b[2] = a[2]
+
+    h = gradient_spaces[space][0]
+    if h is not None:
+        if clockwise == True:
+            b[h] += 360 if (a[h] > b[h]) else 0
+        elif clockwise == False:
+            a[h] += 360 if (a[h] < b[h]) else 0
+        elif abs(b[h] - a[h]) > 180:
+            # Prefer the shorter arc
+            if a[h] < b[h]:
+                a[h] += 360
+            else:
+                b[h] += 360
+
+    return a, b
+
+
+def gradient_steps(a, b, N):
+    (a0, a1, a2), (b0, b1, b2) = a, b
+    d0, d1, d2 = b0 - a0, b1 - a1, b2 - a2
+    n = N - 1
+    for i in range(N):
+        t = i / n
+        yield (a0 + d0 * t, a1 + d1 * t, a2 + d2 * t)
+
+
+def gradient_size(a, b, space):
+    import math
+    dist = math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+    return max(2, math.ceil(dist / gradient_spaces[space][1]))
+
+
+def space_builder(space):
+    # Returns a function that creates a Color object from coordinates in the space
+    if space == 'rgb':
+        return lambda c: ColorRGB(*c)
+    if space == 'hsv':
+        return lambda c: ColorHSV(*c)
+    if space == 'lab':
+        return lambda c: ColorLab(*c, overflow=True)
+    if space == 'oklab':
+        return lambda c: ColorOKLab(*c, overflow=True)
+    if space == 'lch':
+        return lambda c: ColorLab(*lch_to_lab(c), overflow=True)
+    return lambda c: ColorOKLab(*lch_to_lab(c), overflow=True)
+
+
+def gradient_space(A, B, N, space, clockwise=None):
+    a, b = gradient_coords(A, B, space, clockwise)
+    N = N or gradient_size(a, b, space)
+    build = space_builder(space)
+    return tuple(build(c) for c in gradient_steps(a, b, N))
+
+
+@export
+def gradient_array(A, B, N=None, space='rgb', clockwise=None):
+    # Same as gradient(A, B, N, space=space) but returns
+    # a flat array('B') of R, G, B components without creating Color objects
+    import array
+
+    if not isinstance(A, Color) or not isinstance(B, Color):
+        raise TypeError('Can only calculate gradient_array() on Color objects')
+
+    if N is not None and (not isinstance(N, int) or N < 2):
+        raise ValueError('N={} is too small'.format(N))
+
+    a, b = gradient_coords(A, B, space, clockwise)
+    N = N or gradient_size(a, b, space)
+    steps = gradient_steps(a, b, N)
+
+    if space == 'rgb':
+        to_srgb = lambda c: (round(c[0]), round(c[1]), round(c[2]))
+    elif space == 'hsv':
+        # Same rounding as ColorHSV.to_rgb()
+        to_srgb = lambda c: tuple(round(x * 255) for x in colorsys.hsv_to_rgb(
+            (round(c[0]) % 360) / 360, round(c[1]) / 100, round(c[2]) / 100))
+    elif space == 'lab':
+        to_srgb = lambda c: lab_to_srgb_uncached(*c)
+    elif space == 'oklab':
+        to_srgb = lambda c: oklab_to_srgb_uncached(*c)
+    elif space == 'lch':
+        to_srgb = lambda c: lab_to_srgb_uncached(*lch_to_lab(c))
+    else:
+        to_srgb = lambda c: oklab_to_srgb_uncached(*lch_to_lab(c))
+
+    ret = array.array('B')
+    extend = ret.extend
+    for c in steps:
+        extend(to_srgb(c))
+    return ret
+
+
+@export
+class colormap:
+    # Maps scalars to colors through a pre-built lookup table
+    def __init__(self, *stops, N=256, space='rgb', domain=(0, 1)):
+        if len(stops) == 1 and not isinstance(stops[0], Color):
+            stops = tuple(stops[0])
+
+        if len(stops) < 2:
+            raise ValueError('colormap() needs at least 2 stops')
+
+        if not isinstance(N, int) or N < 2:
+            raise ValueError('N={} is too small'.format(N))
+
+        # Stops are either colors (evenly distributed) or (position, color) pairs
+        if all(isinstance(stop, Color) for stop in stops):
+            stops = [(i / (len(stops) - 1), stop) for i, stop in enumerate(stops)]
+        else:
+            stops = sorted(((pos, color(c)) for pos, c in stops), key=lambda x: x[0])
+
+        self.stops = tuple(stops)
+        self.space = space
+        self.domain = tuple(domain)
+
+        build = space_builder(space)
+        segments = []
+        for (pa, A), (pb, B) in zip(stops, stops[1:]):
+            segments.append((pa, pb, *gradient_coords(A, B, space, None)))
+
+        lut = []
+        k = 0
+        for i in range(N):
+            x = stops[0][0] + (stops[-1][0] - stops[0][0]) * i / (N - 1)
+            while k < len(segments) - 1 and x > segments[k][1]:
+                k += 1
+
+            pa, pb, a, b = segments[k]
+            t = 0 if pb == pa else clamp(0, (x - pa) / (pb - pa), 1)
+            lut.append(build(tuple(a[c] + (b[c] - a[c]) * t for c in range(3))))
+
+        self.lut = tuple(lut)
+        self.fg_seqs = tuple(c._fg_seq for c in lut)
+        self.bg_seqs = tuple(c._bg_seq for c in lut)
+
+    def __repr__(self):
+        return 'colormap({}, N={}, space={!r})'.format(
+                ', '.join(repr(c) for _, c in self.stops), len(self.lut), self.space)
+
+    def __len__(self):
+        return len(self.lut)
+
+    def index(self, x):
+        lo, hi = self.domain
+        n = len(self.lut) - 1
+        i = int((x - lo) / (hi - lo) * n + 0.5)
+        return 0 if i < 0 else n if i > n else i
+
+    def __call__(self, x):
+        return self.lut[self.index(x)]
+
+    def map(self, values):
+        lo, hi = self.domain
+        n = len(self.lut) - 1
+        scale = n / (hi - lo)
+        lut = self.lut
+        ret = []
+        append = ret.append
+        for x in values:
+            i = int((x - lo) * scale + 0.5)
+            append(lut[0 if i < 0 else n if i > n else i])
+        return ret
+
+    def fg(self, x, s=None):
+        i = self.index(x)
+        seq = self.fg_seqs[i] if color_profile == 'truecolor' else profile_seqs(self.lut[i])[0]
+        s = str(x) if s is None else str(s)
+        return seq + s + '\033[m' if seq else s
+
+    def bg(self, x, s=None):
+        i = self.index(x)
+        seq = self.bg_seqs[i] if color_profile == 'truecolor' else profile_seqs(self.lut[i])[1]
+        s = str(x) if s is None else str(s)
+        return seq + s + '\033[m' if seq else s
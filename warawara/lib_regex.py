@@ -31,3 +31,134 @@ class rere:
             return lambda *args, **kwargs: re_attr(*args, self.text, **kwargs)
 
         return getattr(self.cache, attr)
+
+
+def sre_modules():
+    # The regex parser is private, so the result is only used as an optimization
+    try:
+        from re import _parser, _constants
+        return _parser, _constants
+    except ImportError: # pragma: no cover
+        pass
+
+    try: # pragma: no cover
+        import sre_parse, sre_constants
+        return sre_parse, sre_constants
+    except ImportError: # pragma: no cover
+        return None
+
+
+@export
+def first_chars(pattern, flags=0):
+    # Characters that a match of pattern could start with,
+    # or None if it's unknown, or if the pattern could match an empty string
+    regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+
+    try:
+        return first_chars_of(regex)
+    except Exception: # pragma: no cover
+        # The private parser changed in an unexpected way
+        return None
+
+
+def first_chars_of(regex):
+    binary = isinstance(regex.pattern, bytes)
+    flags = regex.flags
+
+    modules = sre_modules()
+    if modules is None: # pragma: no cover
+        return None
+
+    if flags & re.LOCALE or (flags & re.IGNORECASE and not binary):
+        return None
+
+    sre_parse, c = modules
+    categories = {
+            c.CATEGORY_DIGIT: rb'\d', c.CATEGORY_NOT_DIGIT: rb'\D',
+            c.CATEGORY_SPACE: rb'\s', c.CATEGORY_NOT_SPACE: rb'\S',
+            c.CATEGORY_WORD: rb'\w', c.CATEGORY_NOT_WORD: rb'\W',
+            }
+
+    def charset(items):
+        ret = set()
+        for op, av in items:
+            if op is c.LITERAL:
+                ret.add(av)
+            elif op is c.RANGE and av[1] - av[0] < 256:
+                ret.update(range(av[0], av[1] + 1))
+            elif op is c.CATEGORY and binary and av in categories:
+                # Categories are expanded over all bytes
+                cat = re.compile(categories[av])
+                ret.update(i for i in range(256) if cat.match(bytes([i])))
+            else:
+                return None
+        return ret
+
+    ignorecase = False
+
+    def walk(items):
+        # (chars, nullable), or None if unknown
+        nonlocal ignorecase
+        ret = set()
+        for op, av in items:
+            if op is c.LITERAL:
+                ret.add(av)
+                return ret, False
+
+            elif op is c.IN:
+                chars = charset(av)
+                if chars is None:
+                    return None
+                ret |= chars
+                return ret, False
+
+            elif op in (c.AT, c.ASSERT, c.ASSERT_NOT):
+                # Zero-width
+                continue
+
+            elif op is c.SUBPATTERN:
+                if av[1] & (re.IGNORECASE | re.LOCALE):
+                    if not binary or av[1] & re.LOCALE:
+                        return None
+                    ignorecase = True
+                sub = walk(av[-1])
+
+            elif op is getattr(c, 'ATOMIC_GROUP', None):
+                sub = walk(av)
+
+            elif op is c.BRANCH:
+                sub = (set(), False)
+                for branch in av[1]:
+                    b = walk(branch)
+                    if b is None:
+                        return None
+                    sub = (sub[0] | b[0], sub[1] or b[1])
+
+            elif op in (c.MAX_REPEAT, c.MIN_REPEAT, getattr(c, 'POSSESSIVE_REPEAT', None)):
+                sub = walk(av[2])
+                if sub is not None and av[0] == 0:
+                    sub = (sub[0], True)
+
+            else:
+                return None
+
+            if sub is None:
+                return None
+
+            ret |= sub[0]
+            if not sub[1]:
+                return ret, False
+
+        return ret, True
+
+    result = walk(sre_parse.parse(regex.pattern, flags))
+    if result is None or result[1]:
+        return None
+
+    chars = result[0]
+    if binary and (ignorecase or flags & re.IGNORECASE):
+        chars |= {ord(chr(i).swapcase()) for i in chars if chr(i).isascii() and chr(i).isalpha()}
+
+    if binary:
+        return frozenset(bytes([i]) for i in chars)
+    return frozenset(chr(i) for i in chars)
@@ -1,6 +1,12 @@
+import collections
+import hashlib
+import os
 import queue
+import re
 import subprocess as sub
+import sys
 import threading
+import time
 
 from signal import SIGKILL
 
@@ -51,6 +57,194 @@ class QueueEventAdapter:
         self.Q.put(line)
 
 
+class Stage:
+    # A line filter stage.
+    # step() returns the transformed line, or None to drop it.
+    # flush() returns lines that are held back until EOF.
+    def step(self, line): # pragma: no cover
+        return line
+
+    def flush(self):
+        return ()
+
+    def __call__(self, line):
+        return self.step(line)
+
+    def __or__(self, other):
+        if not isinstance(other, Stage):
+            raise TypeError('Only Stage | Stage is allowed')
+        return Filter(self, other)
+
+
+class Filter(Stage):
+    # Fuses stages into a single loop, so each line is handled by one call
+    # instead of a chain of EventBroadcaster callbacks
+    def __init__(self, *stages):
+        self.stages = []
+        for stage in stages:
+            if isinstance(stage, Filter):
+                self.stages += stage.stages
+            else:
+                self.stages.append(stage)
+
+        self.steps = tuple(stage.step for stage in self.stages)
+
+    def step(self, line):
+        for step in self.steps:
+            line = step(line)
+            if line is None:
+                return None
+        return line
+
+    def flush(self):
+        ret = []
+        for idx, stage in enumerate(self.stages):
+            steps = self.steps[idx + 1:]
+            for line in stage.flush():
+                for step in steps:
+                    line = step(line)
+                    if line is None:
+                        break
+                else:
+                    ret.append(line)
+        return ret
+
+
+@export
+class grep(Stage):
+    def __init__(self, pattern, invert=False, flags=0):
+        self.search = re.compile(pattern, flags).search
+        self.invert = bool(invert)
+
+    def step(self, line):
+        if (self.search(line) is None) == self.invert:
+            return line
+        return None
+
+
+@export
+class fields(Stage):
+    def __init__(self, *index, sep=None):
+        self.index = index
+        self.sep = sep
+
+    def step(self, line):
+        tokens = line.split(self.sep)
+        if not self.index:
+            return tokens
+
+        try:
+            if len(self.index) == 1:
+                return tokens[self.index[0]]
+            return tuple(tokens[i] for i in self.index)
+        except IndexError:
+            return None
+
+
+@export
+class transform(Stage):
+    def __init__(self, func):
+        self.step = func
+
+
+@export
+class head(Stage):
+    def __init__(self, n):
+        self.n = n
+        self.count = 0
+
+    def step(self, line):
+        if self.count >= self.n:
+            return None
+        self.count += 1
+        return line
+
+
+@export
+class tail(Stage):
+    def __init__(self, n):
+        self.n = n
+        self.buffer = collections.deque(maxlen=n)
+
+    def step(self, line):
+        self.buffer.append(line)
+        return None
+
+    def flush(self):
+        ret = list(self.buffer)
+        self.buffer.clear()
+        return ret
+
+
+@export
+class dedup(Stage):
+    def __init__(self, key=None, adjacent=False):
+        self.key = key
+        self.adjacent = adjacent
+        self.seen = set()
+        self.last = None
+
+    def step(self, line):
+        k = line if self.key is None else self.key(line)
+        if self.adjacent:
+            if self.last is not None and self.last[0] == k:
+                return None
+            self.last = (k,)
+        else:
+            if k in self.seen:
+                return None
+            self.seen.add(k)
+        return line
+
+
+class CapturePolicy:
+    # Decides which lines a stream retains, subscribers still receive every line
+    # capture() sets up the stream, retain() is called for each line,
+    # and release() is called when the stream closes
+    def capture(self, s): # pragma: no cover
+        pass
+
+    def retain(self, s, data): # pragma: no cover
+        pass
+
+    def release(self, s):
+        pass
+
+
+@export
+class keep_head(CapturePolicy):
+    # Retain the first n lines, the remaining are drained
+    def __init__(self, n):
+        self.n = n
+
+    def capture(self, s):
+        s.lines = []
+
+    def retain(self, s, data):
+        if len(s.lines) < self.n:
+            s.lines.append(data)
+            s.queue.put(data)
+
+
+@export
+class keep_tail(CapturePolicy):
+    # Retain the last n lines in a ring buffer,
+    # they are released into the queue when the stream closes
+    def __init__(self, n):
+        self.n = n
+
+    def capture(self, s):
+        s.lines = collections.deque(maxlen=self.n)
+
+    def retain(self, s, data):
+        s.lines.append(data)
+
+    def release(self, s):
+        s.lines = list(s.lines)
+        for data in s.lines:
+            s.queue.put(data)
+
+
 class stream:
     def __init__(self):
         self.queue = queue.Queue()
@@ -58,6 +252,8 @@ class stream:
         self.lines = []
         self.eof = threading.Event()
         self.hub = EventBroadcaster()
+        self.stage = None
+        self.policy = None
 
         self.pipe_count_lock = threading.Lock()
         self.pipe_count = 0
@@ -73,6 +269,13 @@ class stream:
         if subscriber is True:
             self.keep = True
 
+        elif isinstance(subscriber, CapturePolicy):
+            self.capture(subscriber)
+
+        elif isinstance(subscriber, Stage):
+            self.filter(subscriber)
+            self.keep = True
+
         else:
             handler = None
             if hasattr(subscriber, 'put'):
@@ -85,6 +288,17 @@ class stream:
             else:
                 raise TypeError('Invalid subscriber value: {}'.format(repr(subscriber)))
 
+    def filter(self, stage):
+        if self.stage is None:
+            self.stage = stage
+        else:
+            self.stage = self.stage | stage
+
+    def capture(self, policy):
+        self.keep = True
+        self.policy = policy
+        policy.capture(self)
+
     def pipe_attached(self):
         self.pipe_count_lock.acquire()
         try:
@@ -114,10 +328,21 @@ class stream:
                 return
             raise BrokenPipeError('stream already closed')
 
-        if self.keep:
-            self.lines.append(data)
+        if self.stage is not None:
+            data = self.stage.step(data)
+            if data is None:
+                return
+
+        self.emit(data)
+
+    def emit(self, data):
+        if self.policy is not None:
+            self.policy.retain(self, data)
+        else:
+            if self.keep:
+                self.lines.append(data)
+            self.queue.put(data)
 
-        self.queue.put(data)
         self.hub.broadcast(data)
 
     def writeline(self, line, *, suppress=True):
@@ -128,6 +353,14 @@ class stream:
             self.writeline(line)
 
     def close(self):
+        if self.stage is not None and not self.closed:
+            stage, self.stage = self.stage, None
+            for data in stage.flush():
+                self.emit(data)
+
+        if self.policy is not None and not self.closed:
+            self.policy.release(self)
+
         self.eof.set()
         self.queue.put(None)
 
@@ -280,7 +513,8 @@ class command:
         if wait is not None and not isinstance(wait, (int, bool, float)):
             raise TypeError('The type of "wait" should be NoneType, int, bool, or float')
 
-        if self.proc or self.thread:
+        # A result replayed from RunCache has a returncode without running
+        if self.proc or self.thread or self.returncode is not None:
             raise AlreadyRunningError(self)
 
         if callable(self.cmd[0]):
@@ -393,6 +627,9 @@ class command:
             return self.proc.poll()
         if self.thread:
             return self.returncode
+        if self.returncode is not None:
+            # Replayed from RunCache
+            return self.returncode
         return False
 
     def wait(self, timeout=None):
@@ -450,18 +687,179 @@ class command:
             self.thread.join()
 
 
+@export
+class RunCache:
+    def __init__(self, maxsize=128, ttl=None, env=('PATH',), watch=tuple()):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError('Invalid maxsize: {}'.format(maxsize))
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.env = tuple(env)
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.mtimes = {}
+        self.watch(*watch)
+
+    @staticmethod
+    def mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def watch(self, *paths):
+        with self.lock:
+            for path in paths:
+                self.mtimes[os.fspath(path)] = self.mtime(path)
+
+    def key(self, cmd):
+        if callable(cmd.cmd[0]):
+            return None
+
+        # stdin that is still open is not replayable
+        if cmd.stdin_queue is not None:
+            return None
+        if cmd.proc_stdin is not None and not cmd.stdin_autoclose:
+            return None
+
+        # Only the filtered lines are seen by subscribers, they are not the output of the command
+        if cmd.stdout.stage is not None or cmd.stderr.stage is not None:
+            return None
+
+        h = hashlib.sha1()
+        for line in cmd.stdin.lines:
+            if isinstance(line, str):
+                data = b's' + line.encode('utf8')
+            else:
+                data = b'b' + bytes(line)
+            h.update(str(len(data)).encode('ascii') + b':' + data)
+
+        env = os.environ if cmd.env is None else cmd.env
+
+        return (
+                tuple(cmd.cmd),
+                os.getcwd(),
+                tuple(env.get(name) for name in self.env),
+                h.hexdigest(),
+                cmd.encoding, cmd.rstrip, cmd.bufsize,
+                cmd.proc_stdout, cmd.proc_stderr,
+                )
+
+    def expired(self):
+        # Caller holds self.lock
+        changed = False
+        for path, mtime in self.mtimes.items():
+            new_mtime = self.mtime(path)
+            if new_mtime != mtime:
+                self.mtimes[path] = new_mtime
+                changed = True
+
+        if changed:
+            self.entries.clear()
+
+    def get(self, key):
+        with self.lock:
+            self.expired()
+
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return entry[1:]
+
+    def put(self, key, returncode, stdout, stderr):
+        deadline = None if self.ttl is None else (time.monotonic() + self.ttl)
+        with self.lock:
+            self.entries[key] = (deadline, returncode, tuple(stdout), tuple(stderr))
+            self.entries.move_to_end(key)
+            while self.maxsize is not None and len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        self.invalidate()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+default_run_cache = RunCache()
+
+
 @export
 def run(cmd=None, *,
         stdin=None, stdout=True, stderr=True,
         encoding='utf8', rstrip='\r\n',
         bufsize=-1,
         env=None,
-        wait=True):
+        wait=True,
+        cache=None,
+        status=None):
+    if status is True:
+        if wait is False:
+            raise ValueError('status=True needs wait, attach to a ProgressManager instead')
+
+        from .lib_tui import ProgressManager
+        with ProgressManager(sys.stderr) as pm:
+            return run(cmd,
+                       stdin=stdin, stdout=stdout, stderr=stderr,
+                       encoding=encoding, rstrip=rstrip,
+                       bufsize=bufsize, env=env,
+                       wait=wait, cache=cache, status=pm)
+
     ret = command(cmd,
                   stdin=stdin, stdout=stdout, stderr=stderr,
                   encoding=encoding,
-                  rstrip=rstrip, env=env)
+                  rstrip=rstrip, bufsize=bufsize, env=env)
+
+    if status:
+        status.attach(ret)
+
+    if cache is True:
+        cache = default_run_cache
+
+    key = None
+    if cache is not None and cache is not False:
+        key = cache.key(ret)
+
+    if key is None:
+        ret.run(wait=wait)
+        return ret
+
+    entry = cache.get(key)
+    if entry is not None:
+        # Replay the cached result without running the command
+        returncode, stdout_lines, stderr_lines = entry
+        ret.stdin.close()
+        ret.stdout.writelines(stdout_lines)
+        ret.stderr.writelines(stderr_lines)
+        ret.stdout.close()
+        ret.stderr.close()
+        ret.returncode = returncode
+        return ret
+
+    stdout_lines = []
+    stderr_lines = []
+    ret.stdout.welcome(stdout_lines.append)
+    ret.stderr.welcome(stderr_lines.append)
+
     ret.run(wait=wait)
+
+    if ret.returncode is not None and ret.stdout.closed and ret.stderr.closed:
+        cache.put(key, ret.returncode, stdout_lines, stderr_lines)
+
     return ret
 
 
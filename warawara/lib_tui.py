@@ -10,10 +10,207 @@ from .internal_utils import exporter
 export, __all__ = exporter()
 
 
+class WidthTable(dict):
+    # Display width of each code point, calculated on first sight
+    def __missing__(self, c):
+        import unicodedata
+        if unicodedata.category(c) in ('Mn', 'Me', 'Cf') or c == '\u200b':
+            # Combining marks and zero-width characters
+            w = 0
+        elif unicodedata.east_asian_width(c) in 'WF':
+            w = 2
+        else:
+            w = 1
+        self[c] = w
+        return w
+
+
+width_table = WidthTable()
+
+
 @export
 def strwidth(s):
-    import unicodedata
-    return sum((1 + (unicodedata.east_asian_width(c) in 'WF')) for c in decolor(s))
+    if isinstance(s, ColoredText):
+        return s.width
+
+    if '\033' in s:
+        s = decolor(s)
+
+    if s.isascii():
+        return len(s)
+
+    return sum(map(width_table.__getitem__, s))
+
+
+def style_seq(style):
+    # Normalize a style into its escape sequence, '' for no style
+    if not style:
+        return ''
+    if isinstance(style, str):
+        return style
+    if isinstance(style, paints.Color):
+        return style._fg_seq
+    if isinstance(style, paints.ColorCompound):
+        return style.seq
+    raise TypeError('Invalid style: {}'.format(repr(style)))
+
+
+def cut_columns(text, lo, hi):
+    # Cut text by display columns, wide characters across the border are dropped
+    if text.isascii():
+        return text[max(lo, 0):max(hi, 0)]
+
+    ret = []
+    col = 0
+    for c in text:
+        w = width_table[c]
+        if col >= hi and w:
+            break
+        if col >= lo and col + w <= hi:
+            ret.append(c)
+        col += w
+    return ''.join(ret)
+
+
+@export
+class ColoredText:
+    # A string with styles, stored as runs of (style, text)
+    # Escapes are parsed once on construction and rendered lazily,
+    # display widths are accumulated for slicing by columns
+    def __init__(self, *parts):
+        self.styles = []
+        self.texts = []
+        self.ends = []
+        self._str = None
+
+        for part in parts:
+            if isinstance(part, ColoredText):
+                for style, text in zip(part.styles, part.texts):
+                    self.append_run(style, text)
+
+            elif isinstance(part, tuple) and len(part) == 2:
+                self.append_run(style_seq(part[0]), str(part[1]))
+
+            elif isinstance(part, str):
+                self.parse(part)
+
+            else:
+                raise TypeError('Invalid text: {}'.format(repr(part)))
+
+    def parse(self, s):
+        if '\033' not in s:
+            self.append_run('', s)
+            return
+
+        style = ''
+        pos = 0
+        for m in paints.decolor_regex.finditer(s):
+            self.append_run(style, s[pos:m.start()])
+            pos = m.end()
+
+            seq = m.group(0)
+            if not (seq.startswith('\033[') and seq.endswith('m')):
+                # Non-SGR sequences are dropped
+                continue
+
+            # Styles are kept in canonical form, so equal styles could be merged
+            style = paints.sgr_seq(paints.sgr_state(style + seq))
+
+        self.append_run(style, s[pos:])
+
+    def append_run(self, style, text):
+        if not text:
+            return
+
+        end = (self.ends[-1] if self.ends else 0) + strwidth(text)
+        if self.styles and self.styles[-1] == style:
+            self.texts[-1] += text
+            self.ends[-1] = end
+        else:
+            self.styles.append(style)
+            self.texts.append(text)
+            self.ends.append(end)
+
+    @property
+    def width(self):
+        return self.ends[-1] if self.ends else 0
+
+    @property
+    def plain(self):
+        return ''.join(self.texts)
+
+    @property
+    def runs(self):
+        return list(zip(self.styles, self.texts))
+
+    def __str__(self):
+        if self._str is None:
+            self._str = paints.render(zip(self.styles, self.texts))
+        return self._str
+
+    def __repr__(self):
+        return 'ColoredText({})'.format(repr(str(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, ColoredText):
+            return self.styles == other.styles and self.texts == other.texts
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __bool__(self):
+        return bool(self.texts)
+
+    def __add__(self, other):
+        return ColoredText(self, other)
+
+    def __radd__(self, other):
+        return ColoredText(other, self)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            if key < 0:
+                key += self.width
+            return self[key:key + 1]
+
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError('ColoredText only supports contiguous slices')
+
+        start, stop, _ = key.indices(self.width)
+
+        ret = ColoredText()
+        if start >= stop:
+            return ret
+
+        import bisect
+        idx = bisect.bisect_right(self.ends, start)
+        while idx < len(self.ends):
+            begin = self.ends[idx - 1] if idx else 0
+            if begin >= stop:
+                break
+
+            text = self.texts[idx]
+            if begin < start or self.ends[idx] > stop:
+                text = cut_columns(text, start - begin, stop - begin)
+
+            ret.append_run(self.styles[idx], text)
+            idx += 1
+
+        return ret
+
+    def truncate(self, width, ellipsis=''):
+        if self.width <= width:
+            return self
+        return self[:max(width - strwidth(ellipsis), 0)] + ellipsis
+
+    def ljust(self, width, fillchar=' '):
+        return self + fillchar * (width - self.width)
+
+    def rjust(self, width, fillchar=' '):
+        return fillchar * (width - self.width) + self
 
 
 def lpad(text, padding):
@@ -83,6 +280,211 @@ def rjust(data, width=None, fillchar=' '):
     return just(just_elem(rpad), data, width, fillchar)
 
 
+@export
+class TerminalWriter:
+    # Collects the output of a frame, and writes it in one call on flush()
+    # A frame that leaves a style active is ended with a reset, so styles don't leak
+    def __init__(self, file=None):
+        self.file = file
+        self.parts = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def write(self, *parts):
+        self.parts += parts
+
+    def print(self, *args, sep=' ', end='\n'):
+        if len(args) == 1 and type(args[0]) is str:
+            self.parts += (args[0], end)
+        else:
+            self.parts += (sep.join(str(arg) for arg in args), end)
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+
+    def clear(self):
+        self.parts.clear()
+
+    def flush(self):
+        data = self.getvalue()
+        self.parts.clear()
+
+        # Find the last SGR sequence backward, it should be a reset
+        end = len(data)
+        while True:
+            end = data.rfind('\033[', 0, end)
+            if end < 0:
+                break
+            m = paints.sgr_regex.match(data, end)
+            if m:
+                if m.group(1) not in ('', '0'):
+                    data += '\033[m'
+                break
+
+        file = self.file or sys.stdout
+        if data:
+            file.write(data)
+        file.flush()
+
+
+def frame_row(line):
+    # A line into cells of (style, char), wide characters are followed by a (style, '') cell
+    if not isinstance(line, ColoredText):
+        line = ColoredText(str(line))
+
+    row = []
+    for style, text in zip(line.styles, line.texts):
+        if text.isascii():
+            row += [(style, c) for c in text]
+            continue
+
+        for c in text:
+            w = width_table[c]
+            if not w:
+                if row:
+                    row[-1] = (row[-1][0], row[-1][1] + c)
+            elif w == 2:
+                row += [(style, c), (style, '')]
+            else:
+                row.append((style, c))
+    return row
+
+
+@export
+class Screen:
+    # Keeps the previous frame as cells, and only redraws the changed ones
+    # The frame is drawn from the line of the cursor, and cursor moves are relative to it
+    def __init__(self, file=None, fps=None):
+        self.writer = TerminalWriter(file)
+        self.interval = 1 / fps if fps else 0
+        self.last_time = None
+        self.pending = None
+        self.reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def reset(self):
+        self.rows = []
+        self.cursor = (0, 0)
+        self.height = 1
+
+    def invalidate(self):
+        # Redraw every cell on the next frame, e.g. after the terminal was messed up
+        self.rows = [[(None, None)] * len(row) for row in self.rows]
+
+    def move(self, row, col):
+        out = self.writer
+        cur_row, cur_col = self.cursor
+
+        if row >= self.height:
+            # New lines are created by newlines, cursor moves don't scroll
+            if cur_row < self.height - 1:
+                out.write('\033[{}B'.format(self.height - 1 - cur_row))
+            out.write('\r\n' * (row - self.height + 1))
+            self.height = row + 1
+            cur_row, cur_col = row, 0
+
+        elif row > cur_row:
+            out.write('\033[{}B'.format(row - cur_row))
+        elif row < cur_row:
+            out.write('\033[{}A'.format(cur_row - row))
+
+        # Vertical moves keep the column
+        if col != cur_col:
+            out.write('\033[{}G'.format(col + 1) if col else '\r')
+
+        self.cursor = (row, col)
+
+    def spans(self, new, old, gap=4):
+        # Changed columns of a row, as [lo, hi) spans, short unchanged gaps are merged
+        ret = []
+        for col in range(len(new)):
+            if col < len(old) and new[col] == old[col]:
+                continue
+            if ret and col - ret[-1][1] <= gap:
+                ret[-1][1] = col + 1
+            else:
+                ret.append([col, col + 1])
+
+        # Don't cut wide characters
+        for span in ret:
+            if new[span[0]][1] == '' and span[0] > 0:
+                span[0] -= 1
+            if span[1] < len(new) and new[span[1]][1] == '':
+                span[1] += 1
+        return ret
+
+    def draw(self, frame):
+        out = self.writer
+        rows = [frame_row(line) for line in frame]
+
+        for r, new in enumerate(rows):
+            old = self.rows[r] if r < len(self.rows) else []
+            if new == old:
+                continue
+
+            for lo, hi in self.spans(new, old):
+                self.move(r, lo)
+                out.write(paints.render(new[lo:hi]))
+                self.cursor = (r, hi)
+
+            if len(new) < len(old):
+                self.move(r, len(new))
+                out.write('\033[K')
+
+        for r in range(len(rows), len(self.rows)):
+            if self.rows[r]:
+                self.move(r, 0)
+                out.write('\033[K')
+
+        self.rows = rows
+        out.flush()
+
+    def render(self, frame):
+        # frame: str or an iterable of lines, each line is a str or a ColoredText
+        # Returns False if the frame is held back by the fps cap, it's drawn by a later call
+        import time
+
+        if isinstance(frame, str):
+            frame = frame.split('\n')
+        frame = list(frame)
+
+        now = time.monotonic()
+        if self.interval and self.last_time is not None and now - self.last_time < self.interval:
+            self.pending = frame
+            return False
+
+        self.pending = None
+        self.last_time = now
+        self.draw(frame)
+        return True
+
+    def flush(self):
+        if self.pending is not None:
+            frame, self.pending = self.pending, None
+            self.draw(frame)
+
+    def close(self):
+        # Draw the pending frame, and leave the cursor on the line after the frame
+        self.flush()
+        if self.cursor != (0, 0) or self.height > 1:
+            self.move(self.height - 1, self.cursor[1])
+            self.writer.write('\r\n')
+            self.writer.flush()
+        self.reset()
+
+
 @export
 class ThreadedSpinner:
     def __init__(self, *icon, delay=0.1):
@@ -196,6 +598,355 @@ class ThreadedSpinner:
         self.thread.join()
 
 
+def format_count(n, unit=''):
+    # 1234567 -> '1.2M'
+    suffix = ''
+    for suffix in ('', 'k', 'M', 'G', 'T'):
+        if abs(n) < 1000 or suffix == 'T':
+            break
+        n /= 1000
+
+    if not suffix and float(n).is_integer():
+        return '{}{}'.format(int(n), unit)
+    return '{:.1f}{}{}'.format(n, suffix, unit)
+
+
+def format_duration(secs):
+    secs = int(secs)
+    if secs >= 3600:
+        return '{}:{:02}:{:02}'.format(secs // 3600, secs // 60 % 60, secs % 60)
+    return '{:02}:{:02}'.format(secs // 60, secs % 60)
+
+
+class ThreadCounter:
+    # Each thread only increments its own counter, so add() takes no lock
+    def __init__(self):
+        self.counts = {}
+        self.offset = 0
+
+    def add(self, n=1):
+        import threading
+        counts = self.counts
+        tid = threading.get_ident()
+        counts[tid] = counts.get(tid, 0) + n
+
+    @property
+    def value(self):
+        # list() takes a snapshot, other threads could add their counters meanwhile
+        return self.offset + sum(list(self.counts.values()))
+
+    def set(self, value):
+        self.offset = value - sum(list(self.counts.values()))
+
+
+@export
+class ProgressTask:
+    # A task in ProgressManager, could be updated from any thread
+    rate_min_time = 0.1
+
+    def __init__(self, text='', total=None, unit=''):
+        import time
+        self.text = text
+        self.total = total
+        self.unit = unit
+        self.counter = ThreadCounter()
+        self.status = None
+        self.start_time = time.monotonic()
+        self.end_time = None
+
+        # (time, done) samples for throughput, only touched by the render thread
+        self.samples = []
+
+    def advance(self, n=1):
+        self.counter.add(n)
+
+    @property
+    def done(self):
+        return self.counter.value
+
+    def update(self, text=None, done=None, total=None):
+        if text is not None:
+            self.text = text
+        if total is not None:
+            self.total = total
+        if done is not None:
+            self.counter.set(done)
+
+    def finish(self, status='done'):
+        import time
+        self.end_time = time.monotonic()
+        self.status = status
+
+    def fail(self):
+        self.finish('failed')
+
+    @property
+    def finished(self):
+        return self.status is not None
+
+    def elapsed(self, now):
+        return (self.end_time or now) - self.start_time
+
+    def sample(self, now, window=5):
+        # Keep samples of the last window seconds, returns (done, rate)
+        done = self.done
+        self.samples.append((now, done))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= window:
+            self.samples.pop(0)
+
+        # Rates over a too short time are noise, e.g. a task that finished instantly
+        if self.finished:
+            elapsed = self.elapsed(now)
+            return done, (done / elapsed if elapsed >= self.rate_min_time else None)
+
+        t0, d0 = self.samples[0]
+        return done, ((done - d0) / (now - t0) if now - t0 >= self.rate_min_time else None)
+
+    def poll(self):
+        # Called by the render thread before each frame
+        pass
+
+    def columns(self, now):
+        done, rate = self.sample(now)
+        ret = []
+
+        if self.total:
+            ratio = min(max(done / self.total, 0), 1)
+            bar = '#' * int(ratio * 20)
+            ret.append('[' + bar.ljust(20, '.') + ']')
+            ret.append('{}/{}'.format(format_count(done), format_count(self.total, self.unit)).rjust(13))
+            ret.append('{:>3}%'.format(int(ratio * 100)))
+        else:
+            ret.append(format_count(done, self.unit).rjust(8))
+
+        ret.append((format_count(round(rate, 1), self.unit) + '/s' if rate is not None else '').rjust(10))
+
+        if self.finished or not self.total:
+            ret.append(format_duration(self.elapsed(now)))
+        elif rate:
+            ret.append('ETA ' + format_duration(max(self.total - done, 0) / rate))
+
+        return ret
+
+
+def command_text(cmd):
+    if callable(cmd.cmd[0]):
+        return cmd.cmd[0].__name__ + '()'
+    return ' '.join(cmd.cmd)
+
+
+@export
+class CommandTask(ProgressTask):
+    # A task that follows the output and the exit status of a subproc command
+    # Stream subscribers only count and keep the last line, the render thread does the rest
+    def __init__(self, cmd, text=None):
+        super().__init__(command_text(cmd) if text is None else text)
+        self.cmd = cmd
+        self.nbytes = ThreadCounter()
+        self.last_line = ''
+        self.returncode = None
+        cmd.stdout.welcome(self.feed)
+        cmd.stderr.welcome(self.feed)
+
+    def feed(self, line):
+        if isinstance(line, str):
+            # Line endings are stripped by the reader, count them as one byte
+            self.counter.add(1)
+            self.nbytes.add(len(line) + 1 if line.isascii() else len(line.encode('utf8', 'replace')) + 1)
+        else:
+            self.counter.add(line.count(b'\n'))
+            self.nbytes.add(len(line))
+
+        if line:
+            self.last_line = line
+
+    @property
+    def lines(self):
+        return self.counter.value
+
+    def poll(self):
+        cmd = self.cmd
+        if self.finished or not (cmd.stdout.closed and cmd.stderr.closed):
+            return
+
+        if cmd.proc:
+            returncode = cmd.proc.poll()
+            if returncode is None:
+                return
+        elif cmd.thread:
+            if cmd.thread.is_alive():
+                return
+            returncode = cmd.returncode
+        elif cmd.returncode is not None:
+            # Replayed from RunCache
+            returncode = cmd.returncode
+        else:
+            return
+
+        self.returncode = returncode
+        self.finish('failed' if returncode or cmd.exception else 'done')
+
+    def format_last_line(self):
+        line = self.last_line
+        if not isinstance(line, str):
+            line = line.rstrip(b'\n').rsplit(b'\n', 1)[-1].decode('utf8', 'replace')
+
+        # Only the last \r-separated part is visible on a terminal, e.g. progress bars
+        line = decolor(line.rsplit('\r', 1)[-1])
+        if not line.isprintable():
+            line = ''.join(c if c.isprintable() else ' ' for c in line)
+        return line.strip()
+
+    def columns(self, now):
+        ret = [
+                '{} lines'.format(format_count(self.lines)).rjust(11),
+                format_count(self.nbytes.value, 'B').rjust(8),
+                format_duration(self.elapsed(now)),
+                ]
+
+        if self.cmd.exception:
+            ret.append(paints.red(type(self.cmd.exception).__name__))
+        elif self.status == 'done':
+            ret.append(paints.green('exit 0'))
+        elif self.finished:
+            ret.append(paints.red('exit {}'.format(self.returncode)))
+        else:
+            ret.append('')
+
+        ret[-1] = ColoredText(ret[-1]).ljust(8)
+        ret.append(self.format_last_line())
+        return ret
+
+
+@export
+class ProgressManager:
+    # Displays many tasks with one render thread, redraws are limited to fps
+    # If the output is not a terminal, only the final frame is printed
+    spinner = '⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏'
+
+    def __init__(self, file=None, fps=10, max_lines=None, enabled=None):
+        self.file = file
+        self.interval = 1 / fps
+        self.max_lines = max_lines
+        self.enabled = enabled
+        self.tasks = []
+        self.ticks = 0
+        self.screen = Screen(file)
+        self.thread = None
+        self.stopped = None
+        self.live = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add(self, text='', total=None, unit=''):
+        task = ProgressTask(text, total=total, unit=unit)
+        self.tasks.append(task)
+        return task
+
+    def attach(self, cmd, text=None):
+        # Attach before cmd.run() to see all of its output
+        task = CommandTask(cmd, text)
+        self.tasks.append(task)
+        return task
+
+    def format_task(self, task, now, text_width):
+        if task.status == 'done':
+            icon = paints.green('✓')
+        elif task.finished:
+            icon = paints.red('✗')
+        elif self.live:
+            icon = self.spinner[self.ticks % len(self.spinner)]
+        else:
+            icon = '-'
+
+        line = ColoredText(icon, ' ', ColoredText(str(task.text)).truncate(text_width, '…').ljust(text_width))
+        for field in task.columns(now):
+            line += '  ' + field
+        return line
+
+    def frame(self):
+        import time
+        import shutil
+
+        now = time.monotonic()
+        cols, lines = shutil.get_terminal_size()
+        max_lines = self.max_lines or max(lines - 2, 1)
+
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.poll()
+
+        finished = sum(task.finished for task in tasks)
+        failed = sum(task.status == 'failed' for task in tasks)
+
+        # Running tasks come first if not all tasks could be shown
+        # The summary line and the "more" line are counted in max_lines
+        shown = tasks
+        if len(tasks) > max_lines - 1:
+            shown = [t for t in tasks if not t.finished] + [t for t in tasks if t.finished]
+            shown = shown[:max(max_lines - 2, 0)]
+
+        text_width = min(max([strwidth(str(t.text)) for t in shown] + [1]), 40)
+
+        ret = [self.format_task(task, now, text_width).truncate(cols - 1) for task in shown]
+        if len(shown) < len(tasks):
+            ret.append('… {} more'.format(len(tasks) - len(shown)))
+
+        summary = '{}/{} done'.format(finished, len(tasks))
+        if failed:
+            summary += ', ' + paints.red('{} failed'.format(failed))
+        ret.append(summary)
+        return ret
+
+    def refresh(self):
+        self.ticks += 1
+        self.screen.render(self.frame())
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.refresh()
+
+    def start(self):
+        import threading
+
+        if self.thread:
+            return
+
+        enabled = self.enabled
+        if enabled is None:
+            file = self.file or sys.stdout
+            enabled = hasattr(file, 'isatty') and file.isatty()
+
+        self.stopped = threading.Event()
+        self.live = bool(enabled)
+        if enabled:
+            self.thread = threading.Thread(target=self.run)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def stop(self):
+        if self.stopped:
+            self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+        if self.live:
+            self.refresh()
+            self.screen.close()
+            return
+
+        # Plain lines for logs and pipes
+        file = self.file or sys.stdout
+        file.write(''.join(decolor(str(line)) + '\n' for line in self.frame()))
+        file.flush()
+
+
 def alt_if_none(A, B):
     if A is None:
         return B
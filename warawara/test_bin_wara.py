@@ -1,3 +1,4 @@
+import io
 import sys
 
 import unittest.mock
@@ -49,13 +50,50 @@ class TestBinWara(TestCase):
                 )
         self.eq(sorted(modules), sorted(files))
 
+    def run_rainbow(self, *args):
+        stdout = io.StringIO()
+        with unittest.mock.patch('sys.stdout', stdout):
+            sys.argv = ['warawara', 'rainbow'] + list(args)
+            wara.bin.wara.main()
+        return stdout.getvalue()
+
     def test_bin_wara_subcmd_rainbow(self):
-        with self.raises(SystemExit):
+        stdout = io.StringIO()
+        with unittest.mock.patch('sys.stdout', stdout), self.raises(SystemExit):
             sys.argv = ['warawara', 'rainbow']
             wara.bin.wara.main()
+        output = stdout.getvalue()
+        lines = wara.decolor(output).splitlines()
+        self.eq(lines[0], 'Format: ESC[30;48;5;{}m')
+        self.eq(lines[1].split(), [str(i) for i in range(8)])
+        self.true('\033[38;5;0;48;5;208m 208\033[m' in output)
+
+        self.eq(self.run_rainbow('murasaki'),
+                '135 \033[38;5;135;48;5;135mwarawara\033[m murasaki\n')
 
-        sys.argv = ['warawara', 'rainbow', 'murasaki']
-        wara.bin.wara.main()
+        # RRGGBB with only digits
+        self.eq(wara.bin.rainbow.parse_target('808080'), wara.ColorRGB(128, 128, 128))
+        self.eq(wara.decolor(self.run_rainbow('000000')), '(#) warawara 000000\n')
+
+        output = self.run_rainbow('--tile', '--lines=2', '--cols=8', 'murasaki/000000')
+        self.eq(wara.decolor(output), 'mura0000\nmura0000\n')
+
+        # Palettes that can't be loaded are reported
+        self.addCleanup(wara.bin.rainbow.errors.clear)
+        self.prints.clear()
+        with self.raises(SystemExit):
+            sys.argv = ['warawara', 'rainbow', '--palette', '/nonexistent/palette.json', 'orange']
+            wara.bin.wara.main()
+        self.eq(self.stdout, ['Cannot load palette "/nonexistent/palette.json": No such file or directory'])
+
+        # Suffixes that cannot be applied are reported
+        wara.bin.rainbow.errors.clear()
+        self.prints.clear()
+        with self.raises(SystemExit):
+            sys.argv = ['warawara', 'rainbow', 'wah.rgb']
+            wara.bin.wara.main()
+        self.eq(self.stdout[0], 'Error: Cannot transform color wah to rgb')
+        self.true(self.stdout[1].startswith('Unknown color name "wah.rgb"'))
 
     def test_bin_wara_subcmd_unknown(self):
         with self.raises(SystemExit):
@@ -70,3 +108,15 @@ class TestBinWara(TestCase):
             wara.bin.wara.main()
 
         self.true('RecursionError' in '\n'.join(self.stderr))
+
+    def test_bin_wara_subcmd_colorize(self):
+        self.addCleanup(wara.set_color_profile, 'truecolor')
+
+        stdin = io.TextIOWrapper(io.BytesIO(b'INFO x\nERROR y\n'))
+        stdout = io.TextIOWrapper(io.BytesIO())
+        with unittest.mock.patch('sys.stdin', stdin), unittest.mock.patch('sys.stdout', stdout):
+            sys.argv = ['warawara', 'colorize', '--color=16', '-e', 'x', 'red', '-e', 'ERROR', 'white/red']
+            wara.bin.wara.main()
+
+        self.eq(stdout.buffer.getvalue(),
+                b'INFO \033[91mx\033[m\n\033[97;101mERROR\033[m y\n')
@@ -1,3 +1,8 @@
+import os
+import re
+import tempfile
+import unittest.mock
+
 from .lib_test_utils import *
 
 from warawara import *
@@ -48,6 +53,33 @@ class TestColorFacade(TestCase):
         self.true(isinstance(lime, ColorHSV))
         self.true(isinstance(lime, Color))
 
+    def test_color_spec(self):
+        self.true(color('orange') is orange)
+        self.true(color('208') is color(208))
+        self.eq(color('C0FFEE'), ColorRGB(192, 255, 238))
+        self.eq(color('#c0ffee'), ColorRGB(192, 255, 238))
+        self.eq(color('#192,255,238'), ColorRGB(192, 255, 238))
+        self.eq(color('@300,100,50'), ColorHSV(300, 100, 50))
+
+        # RRGGBB with only digits is not an index
+        self.eq(color('000000'), ColorRGB(0, 0, 0))
+        self.eq(color('808080'), ColorRGB(128, 128, 128))
+        self.eq(color('000000.hsv'), ColorHSV(0, 0, 0))
+        self.true(color('000255') is not color(255))
+
+        # suffixes
+        self.true(isinstance(color('orange.rgb'), ColorRGB))
+        self.eq(color('orange.RGB'), orange.to_rgb())
+        self.eq(color('orange.hsv'), orange.to_hsv())
+        self.eq(color('orange.rgb.hsv'), orange.to_rgb().to_hsv())
+        self.eq(color('@300,100,50.rgb'), ColorHSV(300, 100, 50).to_rgb())
+
+        for spec in ('', 'wah', '.rgb', 'orange.rgbb', 'orange.', '256',
+                     '#C0FFEG', '#C0FFE', '0x0FFF', '+0FFEE', 'C0_FEE',
+                     '#256,0,0', '#1,2', '@1,101,1', '@1,1,1,1', '²'):
+            with self.raises(TypeError):
+                color(spec)
+
     def test_color_invalid_value(self):
         with self.raises(TypeError):
             color(True)
@@ -88,6 +120,18 @@ class TestColorTraits(TestCase):
         self.eq(self.coffee.bg('text'), '\033[48;2;192;255;238mtext\033[m')
         self.eq(self.purple.bg('text'), '\033[48;2;128;0;128mtext\033[m')
 
+    def test_fg_bg_args(self):
+        self.eq(self.orange(), '\033[38;5;214m\033[m')
+        self.eq(self.orange(1, 2), '\033[38;5;214m1 2\033[m')
+        self.eq(self.coffee.bg(3.5), '\033[48;2;192;255;238m3.5\033[m')
+        self.eq(nocolor.bg(1, 2), '1 2')
+
+    def test_apply(self):
+        self.eq(self.orange.apply('38', 'text'), self.orange('text'))
+        self.eq(self.orange.apply('48', 'text'), self.orange.bg('text'))
+        self.eq(self.orange.apply('58', 'text'), '\033[58;5;214mtext\033[m')
+        self.eq(nocolor.apply('38', 'text'), 'text')
+
     def test_str(self):
         self.eq(str(self.orange), '\033[38;5;214m')
         self.eq(str(self.coffee), '\033[38;2;192;255;238m')
@@ -125,6 +169,62 @@ class TestColorTraits(TestCase):
                 self.eq(A | B, B)
 
 
+class TestColorImmutable(TestCase):
+    def test_immutable(self):
+        for c in (color(214), color('#C0FFEE'), color('@300,100,50')):
+            self.false(hasattr(c, '__dict__'))
+            with self.raises(AttributeError):
+                c.seq = ''
+            with self.raises(AttributeError):
+                del c.seq
+
+        with self.raises(AttributeError):
+            color(214).index = 208
+        with self.raises(AttributeError):
+            color('#C0FFEE').r = 0
+        with self.raises(AttributeError):
+            color('@300,100,50').h = 0
+
+    def test_interned(self):
+        for i in range(256):
+            self.true(color(i) is Color256(i))
+        self.true(color() is nocolor)
+        self.true(Color256(orange) is orange)
+
+        self.true(ColorRGB(192, 255, 238) is color('#C0FFEE'))
+        self.true(ColorRGB(color('#C0FFEE')) is color('#C0FFEE'))
+        self.true(ColorHSV(300, 100, 50) is color('@300,100,50'))
+        self.true(ColorHSV(660, 100, 50) is color('@300,100,50'))
+        self.true(ColorRGB() is ColorRGB())
+
+        # int and float are interned separately
+        self.false(ColorRGB(1.0, 2, 3) is ColorRGB(1, 2, 3))
+        self.eq(ColorRGB(1.0, 2, 3), ColorRGB(1, 2, 3))
+
+    def test_hashable(self):
+        self.eq(len({color(214), orange, color(208)}), 2)
+        self.eq(hash(ColorRGB(160.2, 90, 0)), hash(ColorRGB(160, 90, 0)))
+        d = {color('#C0FFEE'): 'coffee'}
+        self.eq(d[ColorRGB(192, 255, 238)], 'coffee')
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+        for c in (color(214), color('#C0FFEE'), color('@300,100,50'), nocolor, ColorRGB()):
+            self.true(copy.copy(c) is c)
+            self.true(copy.deepcopy(c) is c)
+            self.true(pickle.loads(pickle.dumps(c)) is c)
+
+    def test_subclass(self):
+        class MyColor(Color256):
+            __slots__ = tuple()
+
+        c = MyColor(214)
+        self.true(isinstance(c, MyColor))
+        self.eq(c.index, 214)
+        self.eq(c('text'), orange('text'))
+
+
 class TestColor256(TestCase):
     def test_color256_code(self):
         for i in range(256):
@@ -173,6 +273,26 @@ class TestColor256(TestCase):
         self.eq(color(237).to_hsv(), color(237).to_rgb().to_hsv())
 
 
+class TestColorTable(TestCase):
+    def test_in_sync(self):
+        # The generated table must be in sync with its generator
+        import importlib.util
+        from . import internal_color_table
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'scripts', 'gen_color_table.py')
+        spec = importlib.util.spec_from_file_location('gen_color_table', path)
+        gen_color_table = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(gen_color_table)
+
+        with open(internal_color_table.__file__, encoding='utf-8') as f:
+            self.eq(f.read(), gen_color_table.generate())
+
+        self.eq(color(208).fg('text'), '\033[38;5;208mtext\033[m')
+        self.eq(color(208).bg('text'), '\033[48;5;208mtext\033[m')
+        self.eq(color(208).to_hsv(), ColorRGB(0xFF, 0x87, 0x00).to_hsv())
+        self.eq(names.index('black'), 0)
+
+
 class TestColorRGB(TestCase):
     def test_rgb_empty(self):
         self.eq(ColorRGB().seq, '')
@@ -333,6 +453,84 @@ class TestColorHSV(TestCase):
             '{:d}'.format(lime)
 
 
+class TestBatchConversion(TestCase):
+    def test_rgb_to_hsv_array(self):
+        import array
+        rgbs = [Color256(i).to_rgb() for i in range(256)]
+        res = rgb_to_hsv_array([c.RGB for c in rgbs])
+        self.true(isinstance(res, array.array))
+        self.eq(len(res), 256 * 3)
+        for i, c in enumerate(rgbs):
+            self.eq(tuple(res[i*3:i*3+3]), c.to_hsv().hsv)
+
+        # Flat sequence and buffer protocol
+        self.eq(rgb_to_hsv_array([255, 0, 0, 0, 0, 255]).tolist(), [0, 100, 100, 240, 100, 100])
+        self.eq(rgb_to_hsv_array(bytes([255, 0, 0])).tolist(), [0, 100, 100])
+        self.eq(rgb_to_hsv_array(array.array('d', [255, 0, 0])).tolist(), [0, 100, 100])
+        self.eq(rgb_to_hsv_array([]).tolist(), [])
+
+        with self.raises(ValueError):
+            rgb_to_hsv_array([255, 0])
+
+    def test_hsv_to_rgb_array(self):
+        import array
+        hsvs = [ColorHSV(h, s, v) for h in range(0, 360, 15) for s in (0, 50, 100) for v in (0, 50, 100)]
+        res = hsv_to_rgb_array([c.hsv for c in hsvs])
+        self.true(isinstance(res, array.array))
+        for i, c in enumerate(hsvs):
+            self.eq(tuple(res[i*3:i*3+3]), c.to_rgb().RGB)
+
+        self.eq(hsv_to_rgb_array(array.array('d', [480, 100, 100])).tolist(), [0, 255, 0])
+
+        # Round trip
+        rgb = bytes(range(255)) * 3
+        self.eq(hsv_to_rgb_array(rgb_to_hsv_array(rgb)).tobytes(), rgb)
+
+    def test_color256_to_rgb_array(self):
+        res = color256_to_rgb_array(range(256))
+        for i in range(256):
+            self.eq(tuple(res[i*3:i*3+3]), Color256(i).to_rgb().RGB)
+
+        self.eq(color256_to_rgb_array(bytes([208, 0])).tolist(), [255, 135, 0, 0, 0, 0])
+
+
+class TestColor256Quantization(TestCase):
+    def test_to_256(self):
+        # Exact matches are found
+        for i in range(16, 256):
+            self.true(Color256(i).to_rgb().to_256() is Color256(i))
+            self.true(Color256(i).to_hsv().to_256() is Color256(i))
+
+        self.true(orange.to_256() is orange)
+        self.eq(color('#FF0000').to_256(), color(196))
+        self.eq(color('#808080').to_256(), color(244))
+        self.eq(color('#C0FFEE').to_256(), color(159))
+        self.eq(ColorRGB(300, -5, 0, overflow=True).to_256(), color(196))
+
+    def test_to_256_is_nearest(self):
+        import random
+        from warawara.lib_colors import color_distance
+
+        rng = random.Random(2025)
+        palette = [Color256(i).to_rgb().RGB for i in range(16, 256)]
+        for perceptual in (False, True):
+            for _ in range(500):
+                rgb = tuple(rng.randrange(256) for i in range(3))
+                best = min(color_distance(rgb, p, perceptual) for p in palette)
+                res = ColorRGB(*rgb).to_256(perceptual=perceptual)
+                self.eq(color_distance(rgb, res.to_rgb().RGB, perceptual), best)
+
+    def test_rgb_to_256_array(self):
+        import array
+        res = rgb_to_256_array([(255, 0, 0), (128, 128, 128), (192, 255, 238)])
+        self.true(isinstance(res, array.array))
+        self.eq(res.tolist(), [196, 244, 159])
+
+        rgb = color256_to_rgb_array(range(16, 256))
+        self.eq(rgb_to_256_array(rgb).tolist(), list(range(16, 256)))
+        self.eq(rgb_to_256_array(rgb, perceptual=True).tolist(), list(range(16, 256)))
+
+
 class TestBuiltInColors(TestCase):
     def test_nocolor(self):
         self.eq(nocolor(), '')
@@ -427,6 +625,125 @@ class TestDecolor(TestCase):
         self.eq(decolor(orange('test')), 'test')
         self.eq(decolor('\033[1;31mred\033[m'), 'red')
 
+    def test_decolor_all_sequences(self):
+        s = 'plain text'
+        self.true(decolor(s) is s)
+
+        # Other CSI sequences
+        self.eq(decolor('\033[2K\033[10;5Hmoved\033[?25l'), 'moved')
+
+        # OSC sequences, terminated by BEL or ST
+        self.eq(decolor('\033]0;title\007text'), 'text')
+        self.eq(decolor('\033]8;;https://example.com\033\\link\033]8;;\033\\'), 'link')
+
+
+class TestColorizer(TestCase):
+    def setUp(self):
+        self.addCleanup(set_color_profile, 'truecolor')
+        self.colorizer = Colorizer([
+            (r'\bERROR\b', 'red'),
+            (r'\bWARN(?:ING)?\b', 'yellow/blue'),
+            (r'(\w+)=(\w+)', paint(fg=orange)),
+            ])
+
+    def test_colorize(self):
+        c = self.colorizer
+        self.eq(c('ERROR: a=1, WARNING'),
+                red('ERROR') + ': ' + orange('a=1') + ', ' + paint(yellow, blue)('WARNING'))
+        self.eq(c('ERRORS'), 'ERRORS')
+        self.eq(c(''), '')
+
+        # Bytes in, bytes out
+        self.eq(c(b'ERROR x=y'), (red('ERROR') + ' ' + orange('x=y')).encode())
+
+        # At the same position, the earlier rule wins
+        self.eq(Colorizer([('ab', 'red'), ('abc', 'blue')])('abc'), red('ab') + 'c')
+
+        # Rules from a dict
+        self.eq(Colorizer({'b+': '/red'})('abbc'), 'a' + (~red)('bb') + 'c')
+
+        # Global inline flags are not allowed, scoped ones are
+        with self.raises(re.error):
+            Colorizer([('(?i)error', 'red')])
+        self.eq(Colorizer([('(?i:error)', 'red')])('Error'), red('Error'))
+
+        with self.raises(TypeError):
+            Colorizer([('error', 'not_a_color')])
+
+    def test_backreference(self):
+        # Groups are renumbered in the combined regex
+        for pattern in (r'(a)\1', r'(a)(b)\2', r'(a)?(?(1)b|c)'):
+            with self.raises(ValueError):
+                Colorizer([(pattern, 'red')])
+
+        self.eq(Colorizer([(r'(?P<x>a)(?P=x)', 'red')])('aab'), red('aa') + 'b')
+        self.eq(Colorizer([(r'\\1', 'red')])('\\1'), red('\\1'))
+
+    def test_bytes(self):
+        # Bytes are matched as UTF-8 text, so characters are not cut into bytes
+        self.eq(Colorizer([('[é]', 'red')])('café'.encode()), ('caf' + red('é')).encode())
+        self.eq(Colorizer([('é+', 'red')])('éé'.encode()), red('éé').encode())
+        self.eq(Colorizer([(r'\w+', 'red')])('哇 wa'.encode()), (red('哇') + ' ' + red('wa')).encode())
+
+        # Invalid UTF-8 is passed through
+        self.eq(self.colorizer(b'\xff\xc3 ERROR'), b'\xff\xc3 ' + red('ERROR').encode())
+
+    def test_color_profile(self):
+        c = self.colorizer
+        set_color_profile('16')
+        self.eq(c('ERROR'), '\033[91mERROR\033[m')
+
+        set_color_profile('none')
+        text = 'ERROR: a=1'
+        self.true(c(text) is text)
+
+    def test_stream(self):
+        import io
+        data = b'INFO a=1\nERROR\n' * 100 + b'ERROR'
+        expected = self.colorizer(data)
+
+        outfile = io.BytesIO()
+        self.colorizer.stream(io.BytesIO(data), outfile, chunk_size=16)
+        self.eq(outfile.getvalue(), expected)
+
+        # Text files are accessed through their binary buffers
+        infile = io.TextIOWrapper(io.BytesIO(data))
+        outfile = io.TextIOWrapper(io.BytesIO())
+        self.colorizer.stream(infile, outfile)
+        self.eq(outfile.buffer.getvalue(), expected)
+
+        # Long lines are not cut inside a character
+        data = 'é'.encode() * 100
+        outfile = io.BytesIO()
+        Colorizer([('é', 'red')]).stream(io.BytesIO(data), outfile, chunk_size=15)
+        self.eq(outfile.getvalue(), red('é').encode() * 100)
+
+
+class TestRender(TestCase):
+    def test_render(self):
+        red = ColorRGB(255, 0, 0)
+        self.eq(render([]), '')
+        self.eq(render([(None, 'plain')]), 'plain')
+        self.eq(render([(orange, 'a')]), orange('a'))
+
+        # Same style, no escapes in between
+        self.eq(render([(orange, 'a'), (orange, 'b'), (orange, '')]), orange('ab'))
+        self.eq(render([(orange, 'a'), ('\033[38;5;214m', 'b')]), orange('ab'))
+
+        # Only the changed part is emitted
+        self.eq(render([(orange, 'a'), (orange / red, 'b')]),
+                '\033[38;5;214ma\033[48;2;255;0;0mb\033[m')
+        self.eq(render([(orange / red, 'a'), (orange, 'b')]),
+                '\033[38;5;214;48;2;255;0;0ma\033[49mb\033[m')
+        self.eq(render([('\033[1m', 'a'), ('\033[1;4m', 'b')]),
+                '\033[1ma\033[4mb\033[m')
+
+        # Attributes are turned off by a reset
+        self.eq(render([('\033[1;31m', 'a'), ('\033[31m', 'b')]),
+                '\033[1;31ma\033[0;31mb\033[m')
+        self.eq(render([(orange, 'a'), (None, 'b'), (orange, 'c')]),
+                orange('a') + 'b' + orange('c'))
+
 
 class TestGradient(TestCase):
     def test_invalid_values(self):
@@ -609,3 +926,416 @@ class TestGradient(TestCase):
         for a, b in zip(res, rev[::-1]):
             # Check if the colors are close enough
             self.le(abs(sum(a.hsv) - sum(b.hsv)), 2)
+
+    def test_matches_reference(self):
+        # The one pass gradients must match a plain per-step lerp
+        def ref_rgb(A, B, N):
+            return ((A,) +
+                    tuple(ColorRGB(*lerp(vector(A.rgb), vector(B.rgb), i / (N - 1)))
+                          for i in range(1, N - 1)) +
+                    (B,))
+
+        def ref_hsv(A, B, N, clockwise):
+            a, b = vector(A.hsv), vector(B.hsv)
+            if clockwise == True:
+                b[0] += 360 if (a[0] > b[0]) else 0
+            elif clockwise == False:
+                a[0] += 360 if (a[0] < b[0]) else 0
+            return ((A,) +
+                    tuple(ColorHSV(*lerp(a, b, i / (N - 1))) for i in range(1, N - 1)) +
+                    (B,))
+
+        pairs = [
+                (color(242, 5, 148), color(146, 219, 189)),
+                (color('#000000'), color('#FFFFFF')),
+                (color('#FF1100'), color('#FF0011')),
+                ]
+        for A, B in pairs:
+            for N in (3, 7, 64, 255):
+                self.eq(gradient(A, B, N), ref_rgb(A, B, N))
+
+        A = ColorHSV(350, 100, 100)
+        B = ColorHSV(20, 30, 60)
+        for clockwise in (None, True, False):
+            for N in (3, 10, 100):
+                res = gradient(A, B, N, clockwise=clockwise)
+                self.eq(res, ref_hsv(A, B, N, clockwise))
+                self.eq([c.seq for c in res], [c.to_rgb().seq for c in res])
+
+        # Longer than the intern cache
+        A, B = pairs[0]
+        self.eq(gradient(A, B, 5000), ref_rgb(A, B, 5000))
+        A, B = ColorHSV(350, 100, 100), ColorHSV(20, 30, 60)
+        self.eq(gradient(A, B, 5000), ref_hsv(A, B, 5000, None))
+
+    def test_lazy_steps(self):
+        # Steps of gradients longer than the intern cache are built lazily
+        for A, B in ((color(242, 5, 148), color(146, 219, 189)),
+                     (ColorHSV(0, 100, 100), ColorHSV(300, 50, 100))):
+            step = gradient(A, B, 5000)[1234]
+            with self.raises(AttributeError):
+                Color.seq.__get__(step)
+
+            interned = type(step)(*(step.rgb if isinstance(step, ColorRGB) else step.hsv))
+            self.false(step is interned)
+            self.eq(hash(step), hash(interned))
+            self.eq(step, interned)
+            self.eq(step('text'), interned('text'))
+            self.eq(step.bg('text'), interned.bg('text'))
+            self.eq(step.to_rgb(), interned.to_rgb())
+
+            with self.raises(AttributeError):
+                step.wah
+
+    def test_color256_rgb_path(self):
+        # Each channel walks one level per step until it arrives
+        self.eq(tuple(map(int, gradient(color(16), color(231)))),
+                (16, 59, 102, 145, 188, 231))
+        self.eq(tuple(map(int, gradient(color(21), color(196)))),
+                (21, 56, 91, 126, 161, 196))
+        self.eq(tuple(map(int, gradient(color(16), color(52)))),
+                (16, 52))
+        self.eq(tuple(map(int, gradient(color(17), color(160)))),
+                (17, 52, 88, 124, 160))
+
+
+class TestLabColors(TestCase):
+    def test_lab(self):
+        red = ColorRGB(255, 0, 0).to_lab()
+        self.true(isinstance(red, ColorLab))
+        self.true(isinstance(red, Color))
+        self.eq(tuple(round(x, 2) for x in red.lab), (53.24, 80.09, 67.2))
+        self.eq(red.to_rgb(), ColorRGB(255, 0, 0))
+        self.eq(red('text'), ColorRGB(255, 0, 0)('text'))
+        self.eq(int(red), 0xFF0000)
+
+        with self.raises(TypeError):
+            ColorLab(101, 0, 0)
+
+        with self.raises(TypeError):
+            ColorLab('red')
+
+        self.true(ColorLab(50, 10, -10) is ColorLab(50, 10, -10))
+        self.true(ColorLab(ColorLab(50, 10, -10)) is ColorLab(50, 10, -10))
+        self.eq(str(ColorLab()), '\033[m')
+
+    def test_oklab(self):
+        red = ColorRGB(255, 0, 0).to_oklab()
+        self.true(isinstance(red, ColorOKLab))
+        self.eq(tuple(round(x, 3) for x in red.lab), (0.628, 0.225, 0.126))
+        self.eq(red.to_rgb(), ColorRGB(255, 0, 0))
+
+        with self.raises(TypeError):
+            ColorOKLab(2, 0, 0)
+
+    def test_round_trip(self):
+        for c in (Color256(208), ColorRGB(12, 200, 77), ColorHSV(41, 100, 100)):
+            self.eq(c.to_lab().to_rgb(), c.to_rgb())
+            self.eq(c.to_oklab().to_rgb(), c.to_rgb())
+            self.eq(c.to_lab().to_oklab(), c.to_oklab())
+
+
+class TestGradientSpace(TestCase):
+    def test_gradient_space(self):
+        A = ColorRGB(255, 0, 0)
+        B = ColorRGB(0, 0, 255)
+
+        res = gradient(A, B, 5, space='rgb')
+        self.eq(res[0], A)
+        self.eq(res[-1], B)
+        self.eq(res[2], ColorRGB(127.5, 0, 127.5))
+
+        res = gradient(A, B, 5, space='oklab')
+        self.true(all(isinstance(c, ColorOKLab) for c in res))
+        self.eq(format(res[2].to_rgb(), '#'), '#8C53A2')
+
+        res = gradient(A, B, 5, space='lch')
+        self.true(all(isinstance(c, ColorLab) for c in res))
+        self.eq(res[0].to_rgb(), A)
+        self.eq(res[-1].to_rgb(), B)
+
+        # Shorter arc by default, the other way around if asked
+        res = gradient(A, B, 3, space='hsv')
+        self.eq(res[1], ColorHSV(300, 100, 100))
+        res = gradient(A, B, 3, space='hsv', clockwise=True)
+        self.eq(res[1], ColorHSV(120, 100, 100))
+
+        res = gradient(A, B, 4, space='oklch', reverse=True)
+        self.eq(res[0].to_rgb(), B)
+
+        with self.raises(ValueError):
+            gradient(A, B, 5, space='cmyk')
+
+    def test_gradient_array(self):
+        A = ColorRGB(255, 0, 0)
+        B = ColorHSV(240, 100, 100)
+        for space in ('rgb', 'hsv', 'lab', 'oklab', 'lch', 'oklch'):
+            res = gradient(A, B, 10, space=space)
+            arr = gradient_array(A, B, 10, space=space)
+            self.eq(arr.typecode, 'B')
+            self.eq(len(arr), 30)
+            self.eq(list(arr), [x for c in res for x in c.to_rgb().RGB])
+
+        self.eq(len(gradient_array(A, B, 1000, space='oklab')), 3000)
+
+
+class TestColormap(TestCase):
+    def test_colormap(self):
+        blue = ColorRGB(0, 0, 255)
+        yellow = ColorRGB(255, 255, 0)
+        red = ColorRGB(255, 0, 0)
+
+        cmap = colormap(blue, yellow, red, N=5)
+        self.eq(len(cmap), 5)
+        self.eq(cmap.lut, (blue, ColorRGB(127.5, 127.5, 127.5), yellow, ColorRGB(255, 127.5, 0), red))
+        self.eq(cmap(0), blue)
+        self.eq(cmap(0.5), yellow)
+        self.eq(cmap(1), red)
+
+        # Out of range values are clamped
+        self.eq(cmap(-1), blue)
+        self.eq(cmap(2), red)
+
+        self.eq(cmap.map([0, 0.25, 0.5, 0.75, 1, 5]), list(cmap.lut) + [red])
+        self.eq(cmap.fg(0.5), yellow('0.5'))
+        self.eq(cmap.fg(0.5, 'text'), yellow('text'))
+        self.eq(cmap.bg(1, 'text'), red.bg('text'))
+
+    def test_colormap_stops(self):
+        cmap = colormap([(1, 'red'), (0, '#000000'), (0.5, '#0000FF')], N=5, domain=(0, 100))
+        self.eq(cmap(0).to_rgb(), ColorRGB(0, 0, 0))
+        self.eq(cmap(50).to_rgb(), ColorRGB(0, 0, 255))
+        self.eq(cmap(100).to_rgb(), ColorRGB(255, 0, 0))
+        self.eq(cmap(75), ColorRGB(127.5, 0, 127.5))
+
+        cmap = colormap(ColorRGB(255, 0, 0), ColorRGB(0, 0, 255), N=5, space='oklab')
+        self.eq(cmap.lut, gradient(ColorRGB(255, 0, 0), ColorRGB(0, 0, 255), 5, space='oklab'))
+
+        with self.raises(ValueError):
+            colormap(ColorRGB(255, 0, 0))
+
+        with self.raises(ValueError):
+            colormap(ColorRGB(255, 0, 0), ColorRGB(0, 0, 255), N=1)
+
+
+class TestColorProfile(TestCase):
+    def setUp(self):
+        self.addCleanup(set_color_profile, 'truecolor')
+        self.addCleanup(detect_color_profile.cache_clear)
+        detect_color_profile.cache_clear()
+
+    def detect(self, env, isatty=True):
+        detect_color_profile.cache_clear()
+        with unittest.mock.patch.dict(os.environ, env, clear=True):
+            with unittest.mock.patch('sys.stdout') as stdout:
+                stdout.isatty.return_value = isatty
+                return detect_color_profile()
+
+    def test_detect(self):
+        self.eq(self.detect({'TERM': 'xterm-256color', 'COLORTERM': 'truecolor'}), 'truecolor')
+        self.eq(self.detect({'TERM': 'xterm-256color'}), '256')
+        self.eq(self.detect({'TERM': 'xterm'}), '16')
+        self.eq(self.detect({'TERM': 'dumb'}), 'none')
+        self.eq(self.detect({}), '16')
+        self.eq(self.detect({'TERM': 'xterm-256color'}, isatty=False), 'none')
+        self.eq(self.detect({'TERM': 'xterm-256color', 'NO_COLOR': '1'}), 'none')
+        self.eq(self.detect({'FORCE_COLOR': '2'}, isatty=False), '256')
+
+        # Cached
+        self.eq(self.detect({'TERM': 'xterm'}), '16')
+        with unittest.mock.patch.dict(os.environ, {'TERM': 'dumb'}):
+            self.eq(detect_color_profile(), '16')
+
+    def test_profile_256(self):
+        red = ColorRGB(255, 0, 0)
+        self.eq(set_color_profile('256'), '256')
+        self.eq(get_color_profile(), '256')
+        self.eq(red('text'), '\033[38;5;196mtext\033[m')
+        self.eq(red.bg('text'), '\033[48;5;196mtext\033[m')
+        self.eq(ColorHSV(0, 100, 100)('text'), '\033[38;5;196mtext\033[m')
+        self.eq(orange('text'), '\033[38;5;214mtext\033[m')
+        self.eq(paint(red, orange)('text'), '\033[38;5;196;48;5;214mtext\033[m')
+        self.eq(render([(red, 'a'), (orange, 'b')]), '\033[38;5;196ma\033[38;5;214mb\033[m')
+
+        cmap = colormap(red, ColorRGB(0, 0, 255), N=3)
+        self.eq(cmap.fg(0, 'text'), '\033[38;5;196mtext\033[m')
+        self.eq(cmap.bg(1, 'text'), '\033[48;5;21mtext\033[m')
+
+    def test_profile_16(self):
+        red = ColorRGB(255, 0, 0)
+        set_color_profile('16')
+        self.eq(red('text'), '\033[91mtext\033[m')
+        self.eq(red.bg('text'), '\033[101mtext\033[m')
+        self.eq(Color256(1)('text'), '\033[31mtext\033[m')
+        self.eq(str(ColorRGB(0, 0, 128)), '\033[34m')
+        self.eq(paint(red, Color256(4))('text'), '\033[91;44mtext\033[m')
+
+    def test_profile_none(self):
+        red = ColorRGB(255, 0, 0)
+        set_color_profile('none')
+        self.eq(red('text'), 'text')
+        self.eq(red.bg('text'), 'text')
+        self.eq(str(red), '')
+        self.eq(paint(red, orange)('text'), 'text')
+        self.eq(render([(red, 'a'), (orange, 'b')]), 'ab')
+        cmap = colormap(red, orange)
+        self.eq(cmap.fg(0.5), '0.5')
+        self.eq(cmap.bg(1, 'text'), 'text')
+
+        set_color_profile('truecolor')
+        self.eq(red('text'), '\033[38;2;255;0;0mtext\033[m')
+
+        with self.raises(ValueError):
+            set_color_profile('8')
+
+    def test_profile_is_not_patched_into_classes(self):
+        methods = dict(Color.__dict__)
+        set_color_profile('16')
+        self.eq(dict(Color.__dict__), methods)
+
+
+class TestColorRegistry(TestCase):
+    def test_builtin_names(self):
+        self.eq(len(color_registry), len(names))
+        self.eq(color_registry['orange'], orange)
+        self.true('beige' in color_registry)
+        self.eq(color_registry.names_of(8), ('gray', 'grey'))
+        self.eq(color_registry.names_of(Color256(8)), ('gray', 'grey'))
+        self.eq(color_registry.names_of(ColorRGB(1, 2, 3)), ())
+
+    def test_register(self):
+        registry = ColorRegistry()
+        registry.register('brand', '#C0FFEE')
+        registry.register('brand_dark', ColorRGB(0x20, 0x40, 0x60))
+        self.eq(registry['brand'], ColorRGB(0xC0, 0xFF, 0xEE))
+        self.eq(registry.names_of('#C0FFEE'), ('brand',))
+
+        registry.register('brand', 208)
+        self.eq(registry['brand'], Color256(208))
+        self.eq(registry.names_of('#C0FFEE'), ())
+
+        registry.unregister('brand')
+        self.false('brand' in registry)
+        self.eq(list(registry), ['brand_dark'])
+
+        with self.raises(ValueError):
+            registry.register('not a name', 208)
+
+        # RRGGBB specs are not shadowed
+        with self.raises(ValueError):
+            registry.register('abcdef', 208)
+        self.eq(color('abcdef'), ColorRGB(0xAB, 0xCD, 0xEF))
+
+    def test_register_global(self):
+        self.addCleanup(color_registry.unregister, 'warawara_test_color')
+        with self.raises(TypeError):
+            color('warawara_test_color')
+
+        color_registry.register('warawara_test_color', '#123456')
+        self.eq(color('warawara_test_color'), ColorRGB(0x12, 0x34, 0x56))
+        self.eq(color('warawara_test_color.hsv'), ColorRGB(0x12, 0x34, 0x56).to_hsv())
+
+    def test_suggest(self):
+        self.eq(color_registry.suggest('oragne'), ['orange', 'orangered', 'darkorange'])
+        self.eq(color_registry.suggest('grey', n=2), ['grey', 'gray'])
+        self.eq(len(color_registry.suggest('x')), 3)
+
+        registry = ColorRegistry()
+        for i in range(3000):
+            registry.register('custom{}'.format(i), i % 256)
+        registry.register('salmon', 209)
+        self.eq(registry.suggest('slamon', n=1), ['salmon'])
+
+        # Trigram index is kept up to date after it's built
+        registry.unregister('salmon')
+        registry.register('salomon', 209)
+        self.eq(registry.suggest('slamon', n=1), ['salomon'])
+
+
+class TestPalette(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+
+        patcher = unittest.mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.join(self.tmpdir, 'cache')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, filename, content):
+        path = os.path.join(self.tmpdir, filename)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_formats(self):
+        path = self.write('brand.json', '{"brand": "#C0FFEE", "ok": 2, "warn": [255, 170, 0]}')
+        registry = load_palette(path)
+        self.eq(registry['brand'], ColorRGB(0xC0, 0xFF, 0xEE))
+        self.eq(registry['ok'], Color256(2))
+        self.eq(registry['warn'], ColorRGB(255, 170, 0))
+
+        path = self.write('list.json', '[{"name": "brand", "color": "@41,100,100"}]')
+        self.eq(load_palette(path)['brand'], ColorHSV(41, 100, 100).to_rgb())
+
+        path = self.write('brand.csv', 'name,color\nbrand,#C0FFEE\nok,2\nwarn,255,170,0\n')
+        self.eq(list(load_palette(path)), ['brand', 'ok', 'warn'])
+        self.eq(load_palette(path)['warn'], ColorRGB(255, 170, 0))
+
+        path = self.write('rgb.txt', '! comment\n255 250 250\t\tsnow\n 72  61 139\t\tdark slate blue\n')
+        registry = load_palette(path)
+        self.eq(registry['darkslateblue'], ColorRGB(72, 61, 139))
+        self.eq(registry['snow'], ColorRGB(255, 250, 250))
+
+        path = self.write('bad.csv', 'brand,#C0FFEE\nbad,#GGGGGG\n')
+        with self.raises(ValueError):
+            load_palette(path)
+
+        with self.raises(ValueError):
+            load_palette(path, format='yaml')
+
+        path = self.write('bad.json', '[{"name": "brand"}]')
+        with self.raises(ValueError):
+            load_palette(path)
+
+    def test_cache(self):
+        path = self.write('brand.json', '{"brand": "#C0FFEE"}')
+        self.eq(load_palette(path)['brand'], ColorRGB(0xC0, 0xFF, 0xEE))
+
+        # Loaded from the cache file without parsing
+        colors.palette_memo.clear()
+        with unittest.mock.patch.dict(colors.palette_parsers, {'json': None}):
+            self.eq(load_palette(path)['brand'], ColorRGB(0xC0, 0xFF, 0xEE))
+
+        # Modified file is parsed again
+        path = self.write('brand.json', '{"brand": "#123456", "new": 3}')
+        os.utime(path, ns=(0, 10 ** 9))
+        self.eq(load_palette(path)['brand'], ColorRGB(0x12, 0x34, 0x56))
+
+    def test_register_palette(self):
+        path = self.write('brand.json', '{"brand": "#C0FFEE", "orange": "#FFAA00"}')
+        registry = ColorRegistry()
+        registry.register('orange', 214)
+        registry.register('brand', 1)
+
+        registry.register_palette(path)
+        self.eq(registry.pending, [(path, None)])
+        self.eq(registry['brand'], ColorRGB(0xC0, 0xFF, 0xEE))
+        self.eq(registry.pending, [])
+        self.eq(registry['orange'], ColorRGB(0xFF, 0xAA, 0x00))
+
+        # The color spec cache is cleared once per palette, not per name
+        registry = ColorRegistry()
+        registry.register('orange', 214)
+        palette = load_palette(path)
+        with unittest.mock.patch.object(colors.parse_color_spec, 'cache_clear') as cache_clear:
+            registry.merge(palette, override=False)
+        self.eq(cache_clear.call_count, 1)
+        self.eq(registry['orange'], Color256(214))
+        self.eq(registry['brand'], ColorRGB(0xC0, 0xFF, 0xEE))
+
+    def test_global_registry(self):
+        path = self.write('brand.json', '{"warawara_test_brand": "#C0FFEE"}')
+        self.addCleanup(color_registry.unregister, 'warawara_test_brand')
+        color_registry.register_palette(path)
+        self.eq(color('warawara_test_brand'), ColorRGB(0xC0, 0xFF, 0xEE))
@@ -20,3 +20,46 @@ class TestInternalUtils(TestCase):
 
         export()
         self.eq(uualluu, ['wara', 'test_func'])
+
+
+class TestLazyLoader(TestCase):
+    def test_tables(self):
+        import pkgutil
+        import importlib
+        import warawara
+        import warawara.bin
+
+        modules = [m.name for m in pkgutil.iter_modules(warawara.__path__)]
+        self.eq(sorted(warawara._libs), sorted(m[4:] for m in modules if m.startswith('lib_')))
+        self.eq(sorted(warawara.bin._names), sorted(m[4:] for m in modules if m.startswith('bin_')))
+        self.eq(sorted(warawara._exports), sorted(warawara._libs))
+
+        for lib, attrs in warawara._exports.items():
+            module = importlib.import_module('warawara.lib_' + lib)
+            self.eq([attr for attr in attrs if attr not in module.__all__], [])
+
+        # Named colors are found through the generated color table instead
+        colors = importlib.import_module('warawara.lib_colors')
+        for name in colors.names:
+            self.true(name in colors.__all__)
+            self.false(name in warawara._export_index)
+
+    def test_named_color(self):
+        import os
+        import sys
+        import warawara
+        path = os.path.dirname(os.path.dirname(os.path.abspath(warawara.__file__)))
+        p = warawara.run([sys.executable, '-c',
+                          'import sys; sys.path.insert(0, {!r}); '
+                          'import warawara; warawara.red; '
+                          'print(*sorted(warawara._loaded_libs))'.format(path)])
+        self.eq(p.returncode, 0)
+        self.eq(p.stdout.lines, ['colors'])
+
+    def test_unknown_attr(self):
+        import warawara
+        import warawara.bin
+        self.false(hasattr(warawara.bin, 'load_tests'))
+        self.false(hasattr(warawara, 'lib_nope'))
+        self.false(hasattr(warawara, 'nope'))
+        self.true(hasattr(warawara.bin, 'wara'))
@@ -1,3 +1,5 @@
+import re
+
 from .lib_test_utils import *
 
 from warawara import *
@@ -30,3 +32,23 @@ class TestRegex(TestCase):
         self.eq(rec.findall(r'\b\w+\b'), ['wara', 'wa', 'ra'])
 
         self.eq(rec.subn(r'wa', 'WA'), ('WAra WA ra', 2))
+
+    def test_first_chars(self):
+        self.eq(first_chars(r'\b(?:ERROR|WARN)\b|INFO'), {'E', 'W', 'I'})
+        self.eq(first_chars(r'(?:a|b)?c'), {'a', 'b', 'c'})
+        self.eq(first_chars(r'(?<=x)[yz]'), {'y', 'z'})
+        self.eq(first_chars(rb'\d+ms'), set(b'%d' % i for i in range(10)))
+        self.eq(first_chars(rb'info', re.IGNORECASE), {b'i', b'I'})
+        self.eq(first_chars(re.compile(rb'(?i:x)y')), {b'x', b'X'})
+
+        # Unknown or could be empty
+        self.eq(first_chars(r'a*'), None)
+        self.eq(first_chars(r'a|'), None)
+        self.eq(first_chars(r'.'), None)
+        self.eq(first_chars(r'[^a]'), None)
+        self.eq(first_chars(r'(a)\1'), {'a'})
+        self.eq(first_chars(r'(?i)x'), None)
+
+        # The private regex parser is only an optimization
+        self.patch('warawara.lib_regex.sre_modules', RuntimeError('changed'))
+        self.eq(first_chars(r'x'), None)
@@ -149,6 +149,163 @@ class TestStream(TestCase):
             s.writeline('line2', suppress=False)
 
 
+class TestStreamFilter(TestCase):
+    def test_grep(self):
+        s = stream()
+        s.welcome(grep(r'^w'))
+        s.writelines(['wah', 'hey', 'wow'])
+        self.eq(s.lines, ['wah', 'wow'])
+
+        s = stream()
+        s.welcome(grep(r'^w', invert=True))
+        s.writelines(['wah', 'hey', 'wow'])
+        self.eq(s.lines, ['hey'])
+
+    def test_fields(self):
+        s = stream()
+        s.welcome(fields())
+        s.writeline('a b  c')
+        self.eq(s.lines, [['a', 'b', 'c']])
+
+        s = stream()
+        s.welcome(fields(0, -1))
+        s.writeline('a b  c')
+        self.eq(s.lines, [('a', 'c')])
+
+        s = stream()
+        s.welcome(fields(2, sep=':'))
+        s.writelines(['a:b:c', 'a:b'])
+        self.eq(s.lines, ['c'])
+
+    def test_transform(self):
+        s = stream()
+        s.welcome(transform(str.upper))
+        s.writelines(['wah', 'wow'])
+        self.eq(s.lines, ['WAH', 'WOW'])
+
+    def test_head_tail(self):
+        s = stream()
+        s.welcome(head(2))
+        s.writelines(['1', '2', '3', '4'])
+        self.eq(s.lines, ['1', '2'])
+
+        s = stream()
+        s.welcome(tail(2))
+        s.writelines(['1', '2', '3', '4'])
+        self.eq(s.lines, [])
+        s.close()
+        self.eq(s.lines, ['3', '4'])
+
+        # close() twice does not flush twice
+        s.close()
+        self.eq(s.lines, ['3', '4'])
+
+    def test_dedup(self):
+        s = stream()
+        s.welcome(dedup())
+        s.writelines(['a', 'b', 'a', 'c', 'b'])
+        self.eq(s.lines, ['a', 'b', 'c'])
+
+        s = stream()
+        s.welcome(dedup(adjacent=True))
+        s.writelines(['a', 'a', 'b', 'a', 'a'])
+        self.eq(s.lines, ['a', 'b', 'a'])
+
+        s = stream()
+        s.welcome(dedup(key=str.lower))
+        s.writelines(['a', 'A', 'b'])
+        self.eq(s.lines, ['a', 'b'])
+
+    def test_compose(self):
+        stage = grep('error') | fields(1) | dedup() | tail(2) | transform(str.upper)
+        self.eq(len(stage.stages), 5)
+
+        data = []
+        s = stream()
+        s.welcome((stage, data.append))
+        s.writelines([
+            'error disk',
+            'info disk',
+            'error net',
+            'error disk',
+            'error cpu',
+            ])
+        s.close()
+        self.eq(s.lines, ['NET', 'CPU'])
+        self.eq(data, ['NET', 'CPU'])
+
+        with self.raises(TypeError):
+            grep('wah') | str.upper
+
+    def test_command_filter(self):
+        p = run(['seq', 20], stdout=grep('1') | head(3))
+        self.eq(p.stdout.lines, ['1', '10', '11'])
+
+        p = command(['seq', 20], stdout=True)
+        p.stdout.filter(tail(2))
+        p.run()
+        self.eq(p.stdout.lines, ['19', '20'])
+
+
+class TestStreamCapture(TestCase):
+    def test_head_capture(self):
+        data = []
+        s = stream()
+        s.welcome((keep_head(2), data.append))
+        s.writelines(['1', '2', '3', '4'])
+        self.eq(s.lines, ['1', '2'])
+        self.eq(data, ['1', '2', '3', '4'])
+        s.close()
+        self.eq(list(s), ['1', '2'])
+
+        s = stream()
+        s.welcome(keep_head(2))
+        s.writelines(['1', '2', '3'])
+        self.eq(s.readline(), '1')
+        self.eq(s.readline(), '2')
+        self.true(s.queue.empty())
+
+    def test_tail_capture(self):
+        data = []
+        s = stream()
+        s.welcome((keep_tail(2), data.append))
+        s.writelines(['1', '2', '3', '4'])
+
+        # Ring buffer is visible before the stream closes
+        self.eq(list(s.lines), ['3', '4'])
+        self.eq(len(s), 2)
+        self.true(s.queue.empty())
+        self.eq(data, ['1', '2', '3', '4'])
+
+        s.close()
+        self.eq(s.lines, ['3', '4'])
+        self.eq(s.readline(), '3')
+        self.eq(s.readline(), '4')
+        self.eq(s.readline(), None)
+
+        s.close()
+        self.eq(s.lines, ['3', '4'])
+
+    def test_command_capture(self):
+        p = run(['seq', 1000], stdout=keep_tail(3))
+        self.eq(p.stdout.lines, ['998', '999', '1000'])
+        self.eq(list(p.stdout), ['998', '999', '1000'])
+
+        p = run(['seq', 1000], stdout=keep_head(3))
+        self.eq(p.returncode, 0)
+        self.eq(p.stdout.lines, ['1', '2', '3'])
+
+        p = run(['sh', '-c', 'seq 1000 >&2; exit 1'], stderr=keep_tail(1))
+        self.eq(p.returncode, 1)
+        self.eq(p.stderr.lines, ['1000'])
+
+        # head() and tail() are filters, subscribers only see the filtered lines
+        data = []
+        p = run(['seq', 1000], stdout=(head(3), data.append))
+        self.eq(p.stdout.lines, ['1', '2', '3'])
+        self.eq(data, ['1', '2', '3'])
+
+
 class TestSubproc(TestCase):
     def test_default_properties(self):
         def prog(proc):
@@ -523,6 +680,126 @@ class TestSubproc(TestCase):
         self.eq(p.stdout.lines, [b'a lot of data\n'])
 
 
+class TestRunCache(TestCase):
+    def test_cache_hit(self):
+        cache = RunCache()
+        p1 = run(['sh', '-c', 'echo $$'], cache=cache)
+        p2 = run(['sh', '-c', 'echo $$'], cache=cache)
+        self.eq(p1.returncode, 0)
+        self.eq(p2.returncode, 0)
+        self.eq(p1.stdout.lines, p2.stdout.lines)
+        self.eq(p2.proc, None)
+        self.eq(len(cache), 1)
+
+        # Replayed results behave like finished commands
+        self.eq(p2.poll(), 0)
+        p2.wait()
+        with self.raises(AlreadyRunningError):
+            p2.run()
+
+        # Subscribers receive replayed lines
+        lines = []
+        run(['sh', '-c', 'echo $$'], stdout=lines.append, cache=cache)
+        self.eq(lines, p1.stdout.lines)
+
+    def test_cache_key(self):
+        cache = RunCache()
+        p1 = run(['sh', '-c', 'echo $$; cat'], stdin=['a'], cache=cache)
+        p2 = run(['sh', '-c', 'echo $$; cat'], stdin=['b'], cache=cache)
+        p3 = run(['sh', '-c', 'echo $$; cat'], stdin=['a'], cache=cache)
+        self.ne(p1.stdout.lines, p2.stdout.lines)
+        self.eq(p1.stdout.lines, p3.stdout.lines)
+        self.eq(p2.stdout.lines[1:], ['b'])
+
+        p4 = run(['sh', '-c', 'echo $$'], env={'PATH': '/bin:/usr/bin'}, cache=cache)
+        p5 = run(['sh', '-c', 'echo $$'], env={'PATH': '/usr/bin:/bin'}, cache=cache)
+        self.ne(p4.stdout.lines, p5.stdout.lines)
+
+        p6 = run(['sh', '-c', 'echo $$'], bufsize=0, cache=cache)
+        p7 = run(['sh', '-c', 'echo $$'], bufsize=1, cache=cache)
+        p8 = run(['sh', '-c', 'echo $$'], bufsize=0, cache=cache)
+        self.eq(p6.bufsize, 0)
+        self.ne(p6.stdout.lines, p7.stdout.lines)
+        self.eq(p6.stdout.lines, p8.stdout.lines)
+
+    def test_cache_uncacheable(self):
+        cache = RunCache()
+
+        def prog(proc):
+            proc.stdout.writeline('wah')
+
+        run(prog, cache=cache)
+        self.eq(len(cache), 0)
+
+        p = run('cat', stdin=True, wait=False, cache=cache)
+        p.stdin.writeline('wah')
+        p.stdin.close()
+        p.wait()
+        self.eq(p.stdout.lines, ['wah'])
+        self.eq(len(cache), 0)
+
+    def test_cache_filter(self):
+        # Filtered lines are not the output of the command
+        cache = RunCache()
+        p1 = run(['seq', 20], stdout=grep('1') | head(3), cache=cache)
+        p2 = run(['seq', 20], cache=cache)
+        self.eq(p1.stdout.lines, ['1', '10', '11'])
+        self.eq(p2.stdout.lines, [str(i) for i in range(1, 21)])
+        self.eq(len(cache), 1)
+
+        p3 = run(['seq', 20], stdout=grep('2'), cache=cache)
+        self.eq(p3.stdout.lines, ['2', '12', '20'])
+        self.ne(p3.proc, None)
+
+    def test_cache_lru(self):
+        cache = RunCache(maxsize=2)
+        run(['echo', 1], cache=cache)
+        run(['echo', 2], cache=cache)
+        run(['echo', 1], cache=cache)
+        run(['echo', 3], cache=cache)
+        self.eq(len(cache), 2)
+        self.eq([key[0] for key in cache.entries],
+                [('echo', '1'), ('echo', '3')])
+
+        with self.raises(ValueError):
+            RunCache(maxsize=0)
+
+    def test_cache_ttl(self):
+        import unittest.mock
+        cache = RunCache(ttl=10)
+        with unittest.mock.patch('time.monotonic', return_value=100):
+            p1 = run(['sh', '-c', 'echo $$'], cache=cache)
+            p2 = run(['sh', '-c', 'echo $$'], cache=cache)
+        with unittest.mock.patch('time.monotonic', return_value=110):
+            p3 = run(['sh', '-c', 'echo $$'], cache=cache)
+        self.eq(p1.stdout.lines, p2.stdout.lines)
+        self.ne(p1.stdout.lines, p3.stdout.lines)
+
+    def test_cache_watch(self):
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'watched')
+            cache = RunCache(watch=[path])
+            p1 = run(['sh', '-c', 'echo $$'], cache=cache)
+            p2 = run(['sh', '-c', 'echo $$'], cache=cache)
+            self.eq(p1.stdout.lines, p2.stdout.lines)
+
+            open(path, 'w').close()
+            p3 = run(['sh', '-c', 'echo $$'], cache=cache)
+            self.ne(p1.stdout.lines, p3.stdout.lines)
+
+        cache.invalidate()
+        self.eq(len(cache), 0)
+
+    def test_default_cache(self):
+        warawara.subproc.default_run_cache.clear()
+        p1 = run(['sh', '-c', 'echo $$'], cache=True)
+        p2 = run(['sh', '-c', 'echo $$'], cache=True)
+        self.eq(p1.stdout.lines, p2.stdout.lines)
+        warawara.subproc.default_run_cache.clear()
+
+
 class TestPipe(TestCase):
     def test_pipe(self):
         p1 = command('nl -w 1 -s :'.split(), stdin=['hello', 'world'])
@@ -17,6 +17,46 @@ class TestTypesettingUtils(TestCase):
         self.eq(strwidth(orange('test')), 4)
         self.eq(strwidth('哇嗚'), 4)
 
+    def test_strwidth_zero_width(self):
+        # Combining acute accent, zero width space, zero width joiner
+        self.eq(strwidth('e\u0301'), 1)
+        self.eq(strwidth('a\u200bb'), 2)
+        self.eq(strwidth('哇\u200d嗚'), 4)
+        self.eq(strwidth('\033]0;title\007哇'), 2)
+        self.eq(strwidth(''), 0)
+
+    def test_colored_text(self):
+        t = ColoredText('ab', (orange, '哇嗚cd'), '\033[1;31mxy\033[mz')
+        self.eq(t.width, 11)
+        self.eq(strwidth(t), 11)
+        self.eq(t.plain, 'ab哇嗚cdxyz')
+        self.eq(t.runs, [('', 'ab'), (str(orange), '哇嗚cd'), ('\033[1;31m', 'xy'), ('', 'z')])
+        self.eq(str(t), 'ab' + str(orange) + '哇嗚cd\033[1;31mxy\033[mz')
+        self.eq(ColoredText(str(t)), t)
+
+        # Adjacent runs with the same style are merged
+        self.eq(ColoredText((orange, 'a'), orange('b')).runs, [(str(orange), 'ab')])
+
+    def test_colored_text_slice(self):
+        t = ColoredText('ab', (orange, '哇嗚cd'), '\033[1;31mxy\033[mz')
+        self.eq(t[:2], 'ab')
+        self.eq(t[1:4], 'b' + orange('哇'))
+        self.eq(t[-2:], '\033[1;31my\033[mz')
+        self.eq(t[0], 'a')
+
+        # Wide characters cut in half are dropped
+        self.eq(t[3:7], orange('嗚c'))
+        self.eq(t[3:7].width, 3)
+
+        self.eq(t.truncate(5, '…'), 'ab' + orange('哇') + '…')
+        self.true(t.truncate(20) is t)
+        self.eq(t[:4].ljust(6, '.'), 'ab' + orange('哇') + '..')
+        self.eq(t[:4].rjust(6), '  ab' + orange('哇'))
+        self.eq(ljust([(t[:2], 'x'), ('abcd', 'y')]), [('ab  ', 'x'), ('abcd', 'y')])
+
+        with self.raises(TypeError):
+            t[::2]
+
     def test_ljust_str(self):
         self.eq(ljust('test', 10), 'test      ')
         self.eq(rjust('test', 10), '      test')
@@ -162,6 +202,235 @@ def queue_to_list(Q):
     return ret
 
 
+class TestTerminalWriter(TestCase):
+    def test_terminal_writer(self):
+        import io
+        file = io.StringIO()
+        file.write = unittest.mock.Mock(side_effect=file.write)
+
+        out = TerminalWriter(file)
+        out.print('wara', 1, sep=', ')
+        out.write(red('wa'), 'ra')
+        out.print(ColoredText((orange, 'wa')), end='')
+        self.eq(len(out), len(out.getvalue()))
+        self.eq(file.write.call_count, 0)
+
+        # Written in one call, with a reset for the active style
+        out.flush()
+        self.eq(file.write.call_count, 1)
+        self.eq(file.getvalue(), 'wara, 1\n' + red('wa') + 'ra' + orange('wa'))
+        self.eq(out.getvalue(), '')
+
+        # Active styles are reset at the end of a frame
+        with out:
+            out.write(str(red), 'wara', '\033[K')
+        self.true(file.getvalue().endswith(str(red) + 'wara\033[K\033[m'))
+
+        with out:
+            out.write(red('wara'), '\033[2J')
+        self.true(file.getvalue().endswith(red('wara') + '\033[2J'))
+
+
+class TestScreen(TestCase):
+    def setUp(self):
+        import io
+        self.file = io.StringIO()
+        self.pos = 0
+
+    def output(self):
+        ret = self.file.getvalue()[self.pos:]
+        self.pos = len(self.file.getvalue())
+        return ret
+
+    def test_diff(self):
+        screen = Screen(self.file)
+        screen.render(['wara', 'wa'])
+        self.eq(self.output(), 'wara\r\nwa')
+
+        # Only changed cells are drawn
+        screen.render(['wara', 'wo'])
+        self.eq(self.output(), '\033[2Go')
+
+        screen.render(['wara', 'wo'])
+        self.eq(self.output(), '')
+
+        screen.render([red('wa') + 'ra', 'wo'])
+        self.eq(self.output(), '\033[1A\r' + red('wa'))
+
+        # Shrinking rows are erased
+        screen.render(['wara'[:3]])
+        self.eq(self.output(), '\rwa\033[4G\033[K\033[1B\r\033[K')
+
+        # Growing rows are created by newlines
+        screen.render(['war', '', '', '世界'])
+        self.eq(self.output(), '\r\n\r\n世界')
+
+        # Wide characters are drawn entirely
+        screen.render(['war', '', '', '世介'])
+        self.eq(self.output(), '\033[3G介')
+
+        screen.close()
+        self.eq(self.output(), '\r\n')
+
+    def test_fps(self):
+        now = [0]
+        self.patch('time.monotonic', lambda: now[0])
+
+        screen = Screen(self.file, fps=10)
+        self.true(screen.render('wara'))
+        self.eq(self.output(), 'wara')
+
+        self.false(screen.render('wawa'))
+        self.false(screen.render('wowa'))
+        self.eq(self.output(), '')
+
+        now[0] = 0.1
+        self.true(screen.render('wowo'))
+        self.eq(self.output(), '\033[2Gowo')
+
+        # Pending frames are drawn on close
+        self.false(screen.render('wara\nwa'))
+        with screen:
+            pass
+        self.eq(self.output(), '\033[2Gara\r\nwa\r\n')
+
+
+class TestProgressManager(TestCase):
+    def setUp(self):
+        import io
+        import os
+        self.now = 0
+        self.patch('time.monotonic', lambda: self.now)
+        self.patch('shutil.get_terminal_size', lambda: os.terminal_size((80, 24)))
+        self.file = io.StringIO()
+
+    def test_task(self):
+        task = ProgressTask('wara', total=100)
+
+        def worker():
+            for i in range(1000):
+                task.advance()
+
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.eq(task.done, 4000)
+
+        task.update(text='wawa', done=10, total=20)
+        task.advance(2)
+        self.eq((task.text, task.done, task.total), ('wawa', 12, 20))
+
+        # Throughput of the samples in the window
+        self.eq(task.sample(0), (12, None))
+        self.now = 2
+        task.advance(8)
+        self.eq(task.sample(2), (20, 4))
+
+        self.false(task.finished)
+        self.now = 4
+        task.fail()
+        self.eq((task.finished, task.status), (True, 'failed'))
+        self.eq(task.sample(10), (20, 5))
+
+        # No rate for a task that finished instantly
+        task = ProgressTask('wara')
+        self.now = 4.01
+        task.advance(10000)
+        task.finish()
+        self.eq(task.sample(4.01), (10000, None))
+        self.eq(task.columns(4.01)[1].strip(), '')
+
+    def test_frame(self):
+        pm = ProgressManager(self.file, max_lines=4)
+        tasks = [pm.add('task{}'.format(i), total=10) for i in range(5)]
+        tasks[0].finish()
+        tasks[1].advance(2)
+        pm.frame()
+
+        self.now = 1
+        tasks[1].advance(3)
+        # The summary line and the "more" line are counted in max_lines
+        frame = [decolor(str(line)) for line in pm.frame()]
+        self.eq(len(frame), 4)
+        self.eq(frame[0], '- task1  [##########..........]           5/10   50%         3/s  ETA 00:01')
+        self.eq(frame[1][:7], '- task2')
+        self.eq(frame[2], '… 3 more')
+        self.eq(frame[3], '1/5 done')
+
+        tasks[2].fail()
+        self.eq(decolor(pm.frame()[-1]), '2/5 done, 1 failed')
+
+    def test_not_a_terminal(self):
+        import io
+        with ProgressManager(self.file) as pm:
+            self.eq(pm.thread, None)
+            task = pm.add('wara', unit='B')
+            task.advance(1500)
+            self.eq(self.file.getvalue(), '')
+
+        # Only the final frame is printed, in plain lines
+        self.eq(self.file.getvalue(),
+                '- wara     1.5kB              00:00\n0/1 done\n')
+
+        self.file = io.StringIO()
+        with ProgressManager(self.file) as pm:
+            pm.add('wara').finish()
+            pm.add('rara').fail()
+        self.eq(self.file.getvalue(),
+                '✓ wara         0              00:00\n'
+                '✗ rara         0              00:00\n'
+                '2/2 done, 1 failed\n')
+
+    def test_render_thread(self):
+        self.patch('time.monotonic', __import__('time').perf_counter)
+        with ProgressManager(self.file, fps=100, enabled=True) as pm:
+            self.ne(pm.thread, None)
+            task = pm.add('wara', total=3)
+            for i in range(3):
+                task.advance()
+            task.finish()
+        self.eq(pm.thread, None)
+        self.true('1/1 done' in self.file.getvalue())
+
+    def test_command(self):
+        def wara(proc):
+            for i in range(3):
+                proc.stdout.writeline('line {}'.format(i))
+            proc.stderr.writeline('\033[31m哇\033[m\rfailed')
+            return 1
+
+        pm = ProgressManager(self.file)
+        p = command(wara)
+        task = pm.attach(p)
+        self.eq(task.text, 'wara()')
+        self.eq(decolor(str(pm.frame()[0])), '- wara()      0 lines        0B  00:00            ')
+
+        # Lines only update counters, nothing is drawn until the next frame
+        p.run()
+        self.eq(self.file.getvalue(), '')
+        self.eq((task.lines, task.nbytes.value), (4, 21 + 19))
+
+        self.now = 3
+        frame = [decolor(str(line)) for line in pm.frame()]
+        self.eq(frame, [
+            '✗ wara()      4 lines       40B  00:03  exit 1    failed',
+            '1/1 done, 1 failed',
+            ])
+
+    def test_run_status(self):
+        import io
+        with unittest.mock.patch('sys.stderr', io.StringIO()) as stderr:
+            p = run(['seq', '5'], status=True)
+        self.eq(p.stdout.lines, ['1', '2', '3', '4', '5'])
+        self.eq(decolor(stderr.getvalue()),
+                '✓ seq 5      5 lines       10B  00:00  exit 0    5\n1/1 done\n')
+
+        with self.raises(ValueError):
+            run(['seq', '5'], wait=False, status=True)
+
+
 class TestThreadedSpinner(TestCase):
     Event = namedtuple('Event',
                        ('timestamp', 'tag', 'args', 'callback'),